@@ -0,0 +1,340 @@
+"""Full-text extraction of news article pages.
+
+Pages are fetched through the shared pooled HTTP client, at most a few at
+a time per host. The main content is located readability-style: every
+paragraph scores its parent and grandparent by length and comma count,
+class/id names nudge the score up (article, content, detail) or down
+(comment, related, share), and the best container's paragraphs are kept.
+Short, link-heavy and boilerplate paragraphs ("đăng nhập", "xem thêm")
+are dropped. Results are cached per URL and concurrent requests for the
+same page share one fetch.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+from http_client import HttpClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+SKIP_TAGS = {"script", "style", "noscript", "template", "iframe", "svg", "canvas", "form", "button",
+             "select", "textarea", "figure", "figcaption", "picture", "video", "audio", "nav", "aside",
+             "header", "footer"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param",
+             "source", "track", "wbr"}
+PARAGRAPH_TAGS = {"p", "h2", "h3", "h4", "li", "blockquote", "pre"}
+# Opening any of these closes an open <p>, as browsers do
+BLOCK_TAGS = PARAGRAPH_TAGS | {"div", "section", "article", "main", "ul", "ol", "table", "h1", "h5", "h6"}
+
+POSITIVE_PATTERN = re.compile(r"article|body|content|detail|entry|main|post|story|text", re.IGNORECASE)
+NEGATIVE_PATTERN = re.compile(
+    r"ads?\b|advert|author|banner|caption|comment|footer|header|login|menu|modal|nav|photo|popup|promo|"
+    r"related|share|sidebar|social|sponsor|tags?\b|video|widget",
+    re.IGNORECASE,
+)
+CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Paragraphs mentioning these are site chrome, not article text
+NOISE_KEYWORDS = [
+    "đăng nhập", "tài khoản", "xác minh", "quảng cáo", "advert", "cookie", "tin liên quan",
+    "xem thêm", "bình luận", "bình chọn", "ứng dụng", "chính sách", "điều khoản", "đăng ký",
+    "có thể bạn quan tâm", "bài viết liên quan", "sign up", "subscribe", "newsletter", "read more",
+]
+
+MIN_PARAGRAPH_LENGTH = 40
+# Larger pages are treated as extraction failures rather than read into memory
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+
+@dataclass(eq=False)
+class Node:
+    tag: str
+    attrs: str = ""
+    parent: Optional["Node"] = None
+    children: List[Union["Node", str]] = field(default_factory=list)
+    score: Optional[float] = None
+
+    def text(self, in_link: bool = False, links: Optional[List[int]] = None) -> str:
+        parts = []
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+                if in_link and links is not None:
+                    links[0] += len(child)
+            else:
+                parts.append(child.text(in_link or child.tag == "a", links))
+        return "".join(parts)
+
+
+class _TreeBuilder(HTMLParser):
+    """Lenient HTML to Node tree, dropping non-content elements"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("document")
+        self.current = self.root
+        self.title = ""
+        self._skip_depth = 0
+        self._in_title = False
+
+    def _close(self, tag: str):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_depth:
+            if tag in SKIP_TAGS:
+                self._skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth = 1
+            return
+        if tag == "title":
+            self._in_title = True
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.current.children.append("\n")
+            return
+        if tag in BLOCK_TAGS and self.current.tag == "p":
+            self.current = self.current.parent
+        values = dict(attrs)
+        node = Node(tag, f"{values.get('class') or ''} {values.get('id') or ''}".strip(), self.current)
+        self.current.children.append(node)
+        self.current = node
+
+    def handle_endtag(self, tag):
+        if self._skip_depth:
+            if tag in SKIP_TAGS:
+                self._skip_depth -= 1
+            return
+        if tag == "title":
+            self._in_title = False
+        self._close(tag)
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self.title += data
+        else:
+            self.current.children.append(data)
+
+
+@dataclass
+class ExtractedArticle:
+    url: str
+    title: str
+    content: str
+    paragraphs: int
+    extracted_at: float
+
+
+def clean_text(text: str) -> str:
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def is_noise(paragraph: str) -> bool:
+    lowered = paragraph.lower()
+    return len(paragraph) < MIN_PARAGRAPH_LENGTH or any(keyword in lowered for keyword in NOISE_KEYWORDS)
+
+
+def _iter_nodes(node: Node):
+    for child in node.children:
+        if isinstance(child, Node):
+            yield child
+            yield from _iter_nodes(child)
+
+
+def _class_weight(node: Node) -> float:
+    weight = 0.0
+    if node.attrs:
+        if POSITIVE_PATTERN.search(node.attrs):
+            weight += 25
+        if NEGATIVE_PATTERN.search(node.attrs):
+            weight -= 25
+    return weight
+
+
+def _inside_noise(node: Node, container: Node) -> bool:
+    while node is not None and node is not container:
+        if node.attrs and NEGATIVE_PATTERN.search(node.attrs) and not POSITIVE_PATTERN.search(node.attrs):
+            return True
+        node = node.parent
+    return False
+
+
+def _paragraph_text(node: Node) -> Optional[str]:
+    """Paragraph text, or None when most of it is link text"""
+    links = [0]
+    text = node.text(node.tag == "a", links)
+    cleaned = clean_text(text)
+    if not cleaned or links[0] > 0.5 * len(text.strip()):
+        return None
+    return cleaned
+
+
+def extract_content(html_text: str) -> ExtractedArticle:
+    """Locate the main content block of an HTML page and return its cleaned paragraphs"""
+    builder = _TreeBuilder()
+    builder.feed(html_text)
+    builder.close()
+    root = builder.root
+
+    # Score containers by the paragraphs they hold
+    candidates: List[Node] = []
+    for node in _iter_nodes(root):
+        if node.tag not in PARAGRAPH_TAGS or node.parent is None:
+            continue
+        text = _paragraph_text(node)
+        if text is None or len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) / 100, 3)
+        for ancestor, share in ((node.parent, 1.0), (node.parent.parent, 0.5)):
+            if ancestor is None or ancestor is root:
+                continue
+            if ancestor.score is None:
+                ancestor.score = _class_weight(ancestor)
+                candidates.append(ancestor)
+            ancestor.score += score * share
+
+    container = max(candidates, key=lambda node: node.score) if candidates else root
+    # Sibling paragraphs often sit one level up from the best-scoring wrapper
+    parent = container.parent
+    if parent is not None and parent is not root and parent.score is not None and parent.score >= container.score * 0.8:
+        container = parent
+
+    paragraphs, seen = [], set()
+    for node in _iter_nodes(container):
+        if node.tag not in PARAGRAPH_TAGS or _inside_noise(node, container):
+            continue
+        # Nested paragraphs (li inside blockquote, p inside li) are taken once, from the outermost
+        parent, nested = node.parent, False
+        while parent is not None and parent is not container:
+            if parent.tag in PARAGRAPH_TAGS:
+                nested = True
+                break
+            parent = parent.parent
+        if nested:
+            continue
+        text = _paragraph_text(node)
+        if text is None or is_noise(text) or text.lower() in seen:
+            continue
+        seen.add(text.lower())
+        paragraphs.append(text)
+
+    h1 = next((node for node in _iter_nodes(root) if node.tag == "h1"), None)
+    title = clean_text(h1.text()) if h1 is not None else clean_text(builder.title)
+    return ExtractedArticle(url="", title=title, content="\n\n".join(paragraphs),
+                            paragraphs=len(paragraphs), extracted_at=time.time())
+
+
+def decode_html(body: bytes, content_type: Optional[str] = None) -> str:
+    """Decode with the charset from the Content-Type header or a <meta> tag, else UTF-8"""
+    charset = None
+    if content_type and "charset=" in content_type:
+        charset = content_type.split("charset=", 1)[1].split(";", 1)[0].strip().strip('"\'')
+    if charset is None:
+        match = CHARSET_PATTERN.search(body[:4096])
+        if match:
+            charset = match.group(1).decode("ascii", "ignore")
+    try:
+        return body.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+class ArticleExtractor:
+    """Fetch-and-extract with per-host concurrency limits and a per-URL result cache"""
+
+    def __init__(self, client: Optional[HttpClient] = None, per_host_limit: int = 2,
+                 max_concurrency: int = 8, cache_size: int = 1000, failure_ttl: float = 600.0,
+                 timeout: float = 15.0, max_page_bytes: int = MAX_PAGE_BYTES):
+        self.client = client or get_http_client()
+        self.per_host_limit = per_host_limit
+        self.cache_size = cache_size
+        self.failure_ttl = failure_ttl
+        self.timeout = timeout
+        self.max_page_bytes = max_page_bytes
+        self._cache: "OrderedDict[str, ExtractedArticle]" = OrderedDict()
+        self._failures: Dict[str, float] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._global_limit = asyncio.Semaphore(max_concurrency)
+        self.stats = {"hits": 0, "fetches": 0, "failures": 0, "coalesced": 0}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    async def _fetch_and_extract(self, url: str) -> ExtractedArticle:
+        async with self._host_limit(url), self._global_limit:
+            response = await self.client.get(url, headers={"User-Agent": USER_AGENT}, timeout=self.timeout,
+                                             max_bytes=self.max_page_bytes)
+        response.raise_for_status()
+        html_text = decode_html(response.body, response.headers.get("Content-Type"))
+        # Parsing a large page takes tens of milliseconds; keep it off the event loop
+        article = await asyncio.to_thread(extract_content, html_text)
+        article.url = url
+        return article
+
+    async def _extract_once(self, url: str) -> Optional[ExtractedArticle]:
+        self.stats["fetches"] += 1
+        try:
+            article = await self._fetch_and_extract(url)
+        except Exception as e:
+            self.stats["failures"] += 1
+            self._failures[url] = time.monotonic()
+            while len(self._failures) > self.cache_size:
+                del self._failures[next(iter(self._failures))]
+            logger.warning(f"Article extraction failed for {url}: {e}")
+            return None
+        finally:
+            self._inflight.pop(url, None)
+
+        self._cache[url] = article
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        logger.info(f"Extracted {article.paragraphs} paragraphs ({len(article.content)} chars) from {url}")
+        return article
+
+    async def extract(self, url: str) -> Optional[ExtractedArticle]:
+        """Extracted article for url, or None if the page could not be fetched or parsed"""
+        cached = self._cache.get(url)
+        if cached is not None:
+            self._cache.move_to_end(url)
+            self.stats["hits"] += 1
+            return cached
+        failed_at = self._failures.get(url)
+        if failed_at is not None and time.monotonic() - failed_at < self.failure_ttl:
+            return None
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._extract_once(url))
+            self._inflight[url] = task
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "cached": len(self._cache),
+            "inflight": len(self._inflight),
+            "hosts": len(self._host_limits),
+        }
@@ -0,0 +1,158 @@
+"""Shared PCM helpers: WAV encode/decode, MP3 decode and resampling on NumPy arrays."""
+
+import io
+import wave
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import miniaudio
+except ImportError:
+    miniaudio = None
+
+
+def pcm16_to_float(pcm: bytes, channels: int = 1) -> np.ndarray:
+    """Convert interleaved 16-bit PCM to float32 mono in [-1, 1]"""
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def float_to_pcm16(samples: np.ndarray) -> bytes:
+    """Convert float samples in [-1, 1] to 16-bit PCM"""
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+
+def read_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """Decode WAV bytes to (float32 mono samples, sample rate)"""
+    with wave.open(io.BytesIO(data), "rb") as wav_file:
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    if sample_width == 2:
+        return pcm16_to_float(frames, channels), sample_rate
+
+    if sample_width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        ints = np.where(ints >= 1 << 23, ints - (1 << 24), ints)
+        samples = ints.astype(np.float32) / float(1 << 23)
+    elif sample_width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / float(1 << 31)
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {sample_width}")
+
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def decode_mp3(data: bytes) -> Tuple[np.ndarray, int]:
+    """Decode MP3 bytes in-process to (float32 mono samples, native sample rate)"""
+    if miniaudio is None:
+        raise RuntimeError("MP3 decoding requires the miniaudio package")
+    data = bytes(data)
+    info = miniaudio.mp3_get_info(data)
+    decoded = miniaudio.decode(data, nchannels=1, sample_rate=info.sample_rate)
+    return np.asarray(decoded.samples, dtype=np.float32) / 32768.0, info.sample_rate
+
+
+def write_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encode float32 mono samples as 16-bit WAV bytes"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(int(sample_rate))
+        wav_file.writeframes(float_to_pcm16(samples))
+    return buffer.getvalue()
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Resample by linear interpolation, low-passing with a windowed sinc first when downsampling"""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+    if target_rate < source_rate:
+        # Windowed-sinc low-pass at the new Nyquist frequency to limit aliasing
+        cutoff = target_rate / source_rate / 2.0
+        taps = np.arange(-16, 17, dtype=np.float64)
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * taps) * np.hamming(len(taps))
+        samples = np.convolve(samples, kernel / kernel.sum(), mode="same")
+    target_length = max(1, int(round(len(samples) * target_rate / source_rate)))
+    positions = np.arange(target_length, dtype=np.float64) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def _stft(samples: np.ndarray, n_fft: int, hop: int) -> np.ndarray:
+    window = np.hanning(n_fft).astype(np.float32)
+    padded = np.pad(samples, (n_fft // 2, n_fft // 2 + n_fft))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop]
+    return np.fft.rfft(frames * window, axis=1)
+
+
+def _istft(spectrum: np.ndarray, n_fft: int, hop: int, length: int) -> np.ndarray:
+    window = np.hanning(n_fft)
+    frames = np.fft.irfft(spectrum, n=n_fft, axis=1) * window
+    n_frames = frames.shape[0]
+    positions = (np.arange(n_frames)[:, None] * hop + np.arange(n_fft)[None, :]).ravel()
+    output_length = n_fft + hop * (n_frames - 1)
+
+    # Overlap-add of every frame at once, normalized by the summed window energy
+    output = np.bincount(positions, weights=frames.ravel(), minlength=output_length)
+    norm = np.bincount(positions, weights=np.tile(window ** 2, n_frames), minlength=output_length)
+    output = output / np.where(norm > 1e-3, norm, 1.0)
+
+    start = n_fft // 2
+    output = output[start:start + length]
+    if len(output) < length:
+        output = np.pad(output, (0, length - len(output)))
+    return output.astype(np.float32)
+
+
+def time_stretch(samples: np.ndarray, rate: float, n_fft: int = 1024, hop: int = 256) -> np.ndarray:
+    """Change duration by 1/rate without changing pitch (phase vocoder)"""
+    if abs(rate - 1.0) < 1e-6 or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+
+    spectrum = _stft(samples.astype(np.float32, copy=False), n_fft, hop)
+    steps = np.arange(0, spectrum.shape[0] - 1, rate)
+    index = steps.astype(np.int64)
+    fraction = (steps - index)[:, None]
+
+    current = spectrum[index]
+    following = spectrum[index + 1]
+    magnitude = (1 - fraction) * np.abs(current) + fraction * np.abs(following)
+
+    # Instantaneous frequency per bin, accumulated into a continuous phase track
+    expected = 2 * np.pi * hop * np.arange(spectrum.shape[1]) / n_fft
+    delta = np.angle(following) - np.angle(current) - expected
+    delta -= 2 * np.pi * np.round(delta / (2 * np.pi))
+    advance = delta + expected
+    phase = np.angle(spectrum[0]) + np.vstack([np.zeros((1, spectrum.shape[1])), np.cumsum(advance[:-1], axis=0)])
+
+    length = int(round(len(samples) / rate))
+    return _istft(magnitude * np.exp(1j * phase), n_fft, hop, length)
+
+
+def change_speed_and_pitch(samples: np.ndarray, sample_rate: int, speed: float = 1.0, pitch: float = 1.0) -> np.ndarray:
+    """Apply a tempo factor and a pitch factor in one stretch + resample pass"""
+    if abs(speed - 1.0) < 1e-6 and abs(pitch - 1.0) < 1e-6:
+        return samples
+
+    # Stretch to length * pitch / speed, then resample by 1/pitch: the
+    # resample restores the target duration and scales every frequency by pitch.
+    stretched = time_stretch(samples, speed / pitch)
+    shifted = resample(stretched, sample_rate * pitch, sample_rate)
+
+    peak = np.max(np.abs(shifted)) if len(shifted) else 0.0
+    if peak > 1.0:
+        shifted = shifted / peak
+    return shifted.astype(np.float32, copy=False)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark the bounded feed parser against feedparser on recorded feeds.
+
+    python bench_feed_parser.py --record          # save the live feeds once
+    python bench_feed_parser.py                   # compare on output/feeds/*.xml
+    python bench_feed_parser.py feed1.xml feed2.xml --items 5
+
+Without recordings a synthetic 200-item feed is used.
+"""
+
+import argparse
+import glob
+import importlib.util
+import os
+import time
+
+from fast_feed_parser import BACKEND, parse_feed, parse_feed_strict
+
+FEED_DIR = os.path.join("output", "feeds")
+
+RECORD_URLS = {
+    "vnexpress": "https://vnexpress.net/rss/tin-moi-nhat.rss",
+    "tuoitre": "https://tuoitre.vn/rss/tin-moi-nhat.rss",
+    "thanhnien": "https://thanhnien.vn/rss/home.rss",
+    "dantri": "https://dantri.com.vn/rss/tin-moi-nhat.rss",
+    "vietnamnet": "https://vietnamnet.vn/rss/tin-moi-nhat.rss",
+    "bbc": "https://feeds.bbci.co.uk/news/rss.xml",
+    "guardian": "https://www.theguardian.com/world/rss",
+}
+
+
+def record_feeds():
+    import requests
+
+    os.makedirs(FEED_DIR, exist_ok=True)
+    for name, url in RECORD_URLS.items():
+        try:
+            response = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
+            response.raise_for_status()
+        except Exception as e:
+            print(f"skip {name}: {e}")
+            continue
+        path = os.path.join(FEED_DIR, f"{name}.xml")
+        with open(path, "wb") as f:
+            f.write(response.content)
+        print(f"saved {path} ({len(response.content)} bytes)")
+
+
+def synthetic_feed(items: int = 200) -> bytes:
+    entries = "".join(
+        f"<item><title>Tin số {i}: Thủ tướng chỉ đạo khắc phục hậu quả bão</title>"
+        f"<link>https://example.vn/tin-{i}.html</link>"
+        f"<description><![CDATA[<a href=\"https://example.vn/tin-{i}.html\"><img src=\"https://example.vn/{i}.jpg\"></a>"
+        f"</br>Chiều nay các địa phương báo cáo tình hình thiệt hại và công tác cứu trợ {'lorem ipsum ' * 20}]]></description>"
+        f"<pubDate>Mon, 09 Sep 2024 14:{i % 60:02d}:00 +0700</pubDate><guid>https://example.vn/tin-{i}.html</guid></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Bench</title>{entries}</channel></rss>'.encode()
+
+
+def feedparser_baseline(content: bytes, items: int):
+    """What the fetch paths did before: parse everything, keep the first N, regex per entry"""
+    import re
+    import feedparser
+
+    kept = []
+    for entry in feedparser.parse(content).entries[:items]:
+        description = entry.get("description", "")
+        image = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', description)
+        kept.append((entry.get("title", ""), re.sub(r"<[^>]+>", "", description), image and image.group(1)))
+    return kept
+
+
+def time_call(func, repeat: int) -> float:
+    """Best-of-repeat wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("feeds", nargs="*", help="recorded feed files (default: output/feeds/*.xml)")
+    parser.add_argument("--items", type=int, default=10, help="entries to keep per feed")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--record", action="store_true", help="download the live feeds into output/feeds")
+    args = parser.parse_args()
+
+    if args.record:
+        record_feeds()
+        return
+
+    paths = args.feeds or sorted(glob.glob(os.path.join(FEED_DIR, "*.xml")))
+    documents = [(os.path.basename(p), open(p, "rb").read()) for p in paths]
+    if not documents:
+        documents = [("synthetic-200", synthetic_feed())]
+
+    have_feedparser = importlib.util.find_spec("feedparser") is not None
+    if not have_feedparser:
+        print("feedparser not installed; timing the bounded parser only")
+
+    print(f"backend={BACKEND} items={args.items} repeat={args.repeat}")
+    print(f"{'feed':<20}{'bytes':>10}{'bounded ms':>12}{'feedparser ms':>15}{'speedup':>9}")
+    for name, content in documents:
+        try:
+            parse_feed_strict(content, args.items)
+            strict = ""
+        except Exception:
+            strict = " (fallback)"
+        fast_ms = time_call(lambda: parse_feed(content, args.items), args.repeat)
+        if have_feedparser:
+            slow_ms = time_call(lambda: feedparser_baseline(content, args.items), args.repeat)
+            print(f"{name:<20}{len(content):>10}{fast_ms:>12.2f}{slow_ms:>15.2f}{slow_ms / fast_ms:>8.1f}x{strict}")
+        else:
+            print(f"{name:<20}{len(content):>10}{fast_ms:>12.2f}{'-':>15}{'-':>9}{strict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Assemble several synthesized segments into one news bulletin.
+
+Segments may come from any engine at any sample rate or channel layout.
+Each one is trimmed of leading/trailing silence, resampled to a common rate
+and loudness-normalized; the results are written with configurable pauses
+into a single preallocated buffer, without ffmpeg.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from audio_utils import read_wav, resample, write_wav
+
+
+def frame_levels_db(samples: np.ndarray, frame_length: int) -> np.ndarray:
+    """RMS level in dBFS of consecutive frames"""
+    n_frames = max(1, int(np.ceil(len(samples) / frame_length)))
+    padded = np.zeros(n_frames * frame_length, dtype=np.float32)
+    padded[:len(samples)] = samples
+    rms = np.sqrt(np.mean(padded.reshape(n_frames, frame_length) ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, threshold_db: float = -45.0,
+                 frame_ms: float = 10.0, margin_ms: float = 30.0) -> np.ndarray:
+    """Drop leading and trailing frames quieter than threshold_db"""
+    if len(samples) == 0:
+        return samples
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    active = np.flatnonzero(frame_levels_db(samples, frame_length) > threshold_db)
+    if len(active) == 0:
+        return samples[:0]
+    margin = int(sample_rate * margin_ms / 1000)
+    start = max(0, active[0] * frame_length - margin)
+    end = min(len(samples), (active[-1] + 1) * frame_length + margin)
+    return samples[start:end]
+
+
+def normalize_loudness(samples: np.ndarray, sample_rate: int, target_db: float = -20.0,
+                       gate_db: float = -45.0, peak_limit: float = 0.98) -> np.ndarray:
+    """Scale so the RMS of non-silent frames hits target_db without clipping"""
+    if len(samples) == 0:
+        return samples
+    frame_length = max(1, int(sample_rate * 0.05))
+    levels = frame_levels_db(samples, frame_length)
+    voiced = levels[levels > gate_db]
+    if len(voiced) == 0:
+        return samples
+    # Mean power of voiced frames, back in dB
+    loudness = 10 * np.log10(np.mean(10 ** (voiced / 10)))
+    gain = 10 ** ((target_db - loudness) / 20)
+    peak = np.max(np.abs(samples))
+    if peak * gain > peak_limit:
+        gain = peak_limit / peak
+    return (samples * gain).astype(np.float32)
+
+
+@dataclass
+class BulletinSegment:
+    samples: np.ndarray
+    sample_rate: int
+    pause_ms: Optional[float] = None
+
+
+class BulletinAssembler:
+    """Collect segments and render them as one mono stream"""
+
+    def __init__(self, sample_rate: int = 22050, pause_ms: float = 600.0,
+                 target_db: float = -20.0, silence_threshold_db: float = -45.0):
+        self.sample_rate = sample_rate
+        self.pause_ms = pause_ms
+        self.target_db = target_db
+        self.silence_threshold_db = silence_threshold_db
+        self.segments: List[BulletinSegment] = []
+
+    def add_samples(self, samples: np.ndarray, sample_rate: int, pause_ms: Optional[float] = None):
+        """Add float mono samples; pause_ms overrides the pause after this segment"""
+        self.segments.append(BulletinSegment(np.asarray(samples, dtype=np.float32), sample_rate, pause_ms))
+
+    def add_wav(self, data: bytes, pause_ms: Optional[float] = None):
+        """Add a WAV file of any rate, width or channel count"""
+        samples, sample_rate = read_wav(data)
+        self.add_samples(samples, sample_rate, pause_ms)
+
+    def _prepare(self, segment: BulletinSegment) -> np.ndarray:
+        samples = trim_silence(segment.samples, segment.sample_rate, self.silence_threshold_db)
+        samples = resample(samples, segment.sample_rate, self.sample_rate)
+        return normalize_loudness(samples, self.sample_rate, self.target_db, self.silence_threshold_db)
+
+    def _pause_length(self, segment: BulletinSegment) -> int:
+        pause_ms = self.pause_ms if segment.pause_ms is None else segment.pause_ms
+        return max(0, int(self.sample_rate * pause_ms / 1000))
+
+    def render(self) -> np.ndarray:
+        """Return the assembled bulletin as float mono samples"""
+        prepared = [(segment, self._prepare(segment)) for segment in self.segments]
+        # Segments that trimmed to silence contribute neither audio nor a pause
+        prepared = [(segment, samples) for segment, samples in prepared if len(samples)]
+        # A segment's pause is only inserted before the next audible segment
+        gaps = [0] + [self._pause_length(segment) for segment, _ in prepared[:-1]]
+
+        output = np.zeros(sum(len(samples) for _, samples in prepared) + sum(gaps), dtype=np.float32)
+        position = 0
+        for (_, samples), gap in zip(prepared, gaps):
+            position += gap
+            output[position:position + len(samples)] = samples
+            position += len(samples)
+        return output
+
+    def to_wav(self) -> bytes:
+        return write_wav(self.render(), self.sample_rate)
@@ -0,0 +1,133 @@
+"""Near-duplicate story detection with MinHash and LSH banding.
+
+Each article is reduced to word shingles of its diacritic-folded title and
+lead paragraph, summarized as a MinHash signature. Signatures are split
+into bands; articles sharing any band become candidates and are confirmed
+by estimated Jaccard similarity. The same wire story rewritten slightly by
+several outlets ends up in one cluster, and only its first (best ranked)
+member is kept.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from search_index import fold_diacritics, tokenize
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+# Prime just above 2**32 so 32-bit shingle hashes are permuted without collisions
+MERSENNE_PRIME = np.uint64((1 << 32) + 15)
+
+_random = np.random.RandomState(20240501)
+PERMUTATION_A = _random.randint(1, 1 << 31, size=NUM_PERMUTATIONS).astype(np.uint64)
+PERMUTATION_B = _random.randint(0, 1 << 31, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+_signature_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_signature_cache_lock = threading.Lock()
+SIGNATURE_CACHE_SIZE = 4096
+
+
+def shingles(text: str, size: int = 2, max_words: int = 60) -> set:
+    """Folded word n-grams of the first max_words words"""
+    words = [fold_diacritics(word) for word in tokenize(text)[:max_words]]
+    if len(words) < size:
+        return set(words)
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """MinHash signature of text's shingles, memoized per text"""
+    with _signature_cache_lock:
+        cached = _signature_cache.get(text)
+        if cached is not None:
+            _signature_cache.move_to_end(text)
+            return cached
+
+    grams = shingles(text)
+    if not grams:
+        signature = np.full(NUM_PERMUTATIONS, np.iinfo(np.uint64).max, dtype=np.uint64)
+    else:
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(g.encode(), digest_size=4).digest(), "little") for g in grams],
+            dtype=np.uint64,
+        )
+        permuted = (PERMUTATION_A[:, None] * hashes[None, :] + PERMUTATION_B[:, None]) % MERSENNE_PRIME
+        signature = permuted.min(axis=1)
+
+    with _signature_cache_lock:
+        _signature_cache[text] = signature
+        while len(_signature_cache) > SIGNATURE_CACHE_SIZE:
+            _signature_cache.popitem(last=False)
+    return signature
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    """Assign items to story clusters; the first item of a cluster is its representative"""
+
+    def __init__(self, threshold: float = 0.5):
+        self.threshold = threshold
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._signatures: List[np.ndarray] = []
+        self._clusters: List[int] = []
+
+    def add(self, text: str) -> int:
+        """Index text and return the id of the cluster it joined"""
+        signature = minhash_signature(text)
+        item = len(self._signatures)
+        bands = [(band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes())
+                 for band in range(BANDS)]
+
+        best_cluster, best_similarity = None, self.threshold
+        candidates = {other for key in bands for other in self._buckets.get(key, ())}
+        for other in sorted(candidates):
+            similarity = estimate_similarity(signature, self._signatures[other])
+            if similarity >= best_similarity:
+                best_cluster, best_similarity = self._clusters[other], similarity
+
+        self._signatures.append(signature)
+        self._clusters.append(item if best_cluster is None else best_cluster)
+        for key in bands:
+            self._buckets.setdefault(key, []).append(item)
+        return self._clusters[item]
+
+
+def article_text(article: Any) -> str:
+    return f"{article.title} {article.description}"
+
+
+def cluster_articles(articles: List[Any], threshold: float = 0.5,
+                     text_func: Callable[[Any], str] = article_text) -> List[List[Any]]:
+    """Group articles into stories, keeping input order within and across clusters"""
+    index = NearDuplicateIndex(threshold)
+    clusters: Dict[int, List[Any]] = {}
+    for article in articles:
+        clusters.setdefault(index.add(text_func(article)), []).append(article)
+    return list(clusters.values())
+
+
+def dedupe_articles(articles: List[Any], limit: Optional[int] = None, threshold: float = 0.5,
+                    text_func: Callable[[Any], str] = article_text) -> List[Any]:
+    """Keep one representative (the earliest) per story, up to limit stories"""
+    index = NearDuplicateIndex(threshold)
+    seen_clusters = set()
+    unique = []
+    for article in articles:
+        cluster = index.add(text_func(article))
+        if cluster in seen_clusters:
+            continue
+        seen_clusters.add(cluster)
+        unique.append(article)
+        if limit is not None and len(unique) >= limit:
+            break
+    return unique
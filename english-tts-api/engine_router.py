@@ -0,0 +1,404 @@
+"""Latency-aware routing across the TTS engines used by the main_* apps.
+
+Each engine declares the languages and voices it can serve, a relative cost
+and how many concurrent syntheses it accepts. The router keeps a rolling
+latency window and an in-flight count per engine, sends every request to the
+engine with the lowest expected latency, and degrades to cheaper engines
+instead of queueing when the preferred ones are saturated.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import threading
+import time
+import wave
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from espeak_engine import get_espeak_engine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_WINDOW = 200
+# Engines below this quality are only used when degrading
+DEFAULT_MIN_QUALITY = 2
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """Wrap 16-bit PCM in a WAV container"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class TTSEngine:
+    """Base class for a routable TTS engine"""
+
+    name = "base"
+    languages: set = set()
+    voices: Dict[str, dict] = {}
+    cost = 1
+    # Relative output quality; requests can ask for a minimum
+    quality = 1
+    max_concurrency = 1
+    # Latency prior (ms) used until real measurements are available
+    default_latency_ms = 1000.0
+
+    def is_available(self) -> bool:
+        return True
+
+    def supports(self, language: str, voice: Optional[str] = None) -> bool:
+        if language not in self.languages:
+            return False
+        if voice is None:
+            return True
+        return voice in self.voices
+
+    def synthesize(self, text: str, language: str, voice: Optional[str] = None) -> Tuple[bytes, str]:
+        """Return (audio bytes, media type)"""
+        raise NotImplementedError
+
+
+class GTTSEngine(TTSEngine):
+    name = "gtts"
+    languages = {"vi", "en", "zh"}
+    voices = {
+        "google_vn_male": {"lang": "vi", "tld": "com.vn", "slow": False},
+        "google_vn_female": {"lang": "vi", "tld": "com", "slow": True},
+        "google_vn_news": {"lang": "vi", "tld": "com.au", "slow": False},
+        "google_en_male": {"lang": "en", "tld": "com", "slow": False},
+        "google_en_female": {"lang": "en", "tld": "com", "slow": True},
+        "google_en_news": {"lang": "en", "tld": "com.au", "slow": False},
+        "google_zh_male": {"lang": "zh", "tld": "com", "slow": False},
+        "google_zh_female": {"lang": "zh", "tld": "com", "slow": True},
+        "google_zh_news": {"lang": "zh", "tld": "com.au", "slow": False},
+    }
+    cost = 2
+    quality = 2
+    max_concurrency = 8
+    default_latency_ms = 800.0
+
+    def synthesize(self, text: str, language: str, voice: Optional[str] = None) -> Tuple[bytes, str]:
+        from gtts import gTTS
+
+        config = self.voices.get(voice, {"lang": language, "tld": "com", "slow": False})
+        lang = "zh-CN" if config["lang"] == "zh" else config["lang"]
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, tld=config["tld"], slow=config["slow"]).write_to_fp(buffer)
+        return buffer.getvalue(), "audio/mpeg"
+
+
+class CoquiEngine(TTSEngine):
+    name = "coqui"
+    # XTTS v2 languages; Vietnamese is not covered by the model
+    languages = {"en", "zh", "es", "fr", "de", "it", "pt", "ru", "ja", "ko"}
+    voices = {"coqui_default": {}}
+    cost = 5
+    quality = 3
+    max_concurrency = 1
+    default_latency_ms = 4000.0
+
+    def __init__(self, model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2"):
+        self.model_name = model_name
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._load_failed = False
+
+    def _get_model(self):
+        with self._load_lock:
+            if self._model is None and not self._load_failed:
+                try:
+                    from TTS.api import TTS
+                    logger.info(f"Loading Coqui model {self.model_name}...")
+                    self._model = TTS(model_name=self.model_name, progress_bar=False, gpu=False)
+                except Exception as e:
+                    logger.error(f"Failed to load Coqui model: {e}")
+                    self._load_failed = True
+            return self._model
+
+    def is_available(self) -> bool:
+        return not self._load_failed
+
+    def synthesize(self, text: str, language: str, voice: Optional[str] = None) -> Tuple[bytes, str]:
+        import numpy as np
+
+        model = self._get_model()
+        if model is None:
+            raise RuntimeError("Coqui model not available")
+
+        kwargs = {"text": text, "split_sentences": True}
+        if model.is_multi_lingual:
+            kwargs["language"] = "zh-cn" if language == "zh" else language
+        if model.is_multi_speaker:
+            kwargs["speaker"] = model.speakers[0]
+
+        samples = np.asarray(model.tts(**kwargs), dtype=np.float32)
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        return pcm_to_wav(pcm, model.synthesizer.output_sample_rate), "audio/wav"
+
+
+class AzureEngine(TTSEngine):
+    name = "azure"
+    languages = {"vi", "en", "zh"}
+    voices = {
+        "azure_vi_male": {"voice": "vi-VN-NamMinhNeural"},
+        "azure_vi_female": {"voice": "vi-VN-HoaiMyNeural"},
+        "azure_en_female": {"voice": "en-US-JennyNeural"},
+        "azure_zh_female": {"voice": "zh-CN-XiaoxiaoNeural"},
+    }
+    default_voices = {"vi": "azure_vi_male", "en": "azure_en_female", "zh": "azure_zh_female"}
+    cost = 3
+    quality = 3
+    max_concurrency = 4
+    default_latency_ms = 600.0
+
+    def __init__(self):
+        self.key = os.getenv("AZURE_SPEECH_KEY", "")
+        self.region = os.getenv("AZURE_REGION", "eastus")
+
+    def is_available(self) -> bool:
+        if not self.key or self.key == "your_azure_key_here":
+            return False
+        try:
+            import azure.cognitiveservices.speech  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def synthesize(self, text: str, language: str, voice: Optional[str] = None) -> Tuple[bytes, str]:
+        import azure.cognitiveservices.speech as speechsdk
+
+        voice = voice or self.default_voices.get(language, "azure_vi_male")
+        speech_config = speechsdk.SpeechConfig(subscription=self.key, region=self.region)
+        speech_config.speech_synthesis_voice_name = self.voices[voice]["voice"]
+
+        # audio_config=None keeps the result in memory
+        synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+        result = synthesizer.speak_text_async(text).get()
+        if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
+            raise RuntimeError(f"Azure synthesis failed: {result.reason}")
+        return result.audio_data, "audio/wav"
+
+
+class EspeakTTSEngine(TTSEngine):
+    name = "espeak"
+    languages = {"vi", "en", "zh"}
+    voices = {
+        "espeak_vi_male": {"voice": "vi+m3", "speed": 150, "pitch": 50},
+        "espeak_vi_female": {"voice": "vi+f3", "speed": 150, "pitch": 70},
+        "espeak_en_male": {"voice": "en+m3", "speed": 160, "pitch": 50},
+        "espeak_en_female": {"voice": "en+f3", "speed": 160, "pitch": 70},
+        "espeak_zh_male": {"voice": "cmn+m3", "speed": 150, "pitch": 50},
+    }
+    default_voices = {"vi": "espeak_vi_male", "en": "espeak_en_male", "zh": "espeak_zh_male"}
+    cost = 0
+    quality = 1
+    max_concurrency = 16
+    default_latency_ms = 20.0
+
+    def is_available(self) -> bool:
+        return get_espeak_engine().available
+
+    def synthesize(self, text: str, language: str, voice: Optional[str] = None) -> Tuple[bytes, str]:
+        config = self.voices[voice or self.default_voices[language]]
+        wav_data = get_espeak_engine().synthesize_wav(
+            text, voice=config["voice"], speed=config["speed"], pitch=config["pitch"]
+        )
+        return wav_data, "audio/wav"
+
+
+@dataclass
+class EngineStats:
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    in_flight: int = 0
+    completed: int = 0
+    failures: int = 0
+    degraded_to: int = 0
+
+    def percentile(self, pct: float, default: float) -> float:
+        if not self.latencies:
+            return default
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+@dataclass
+class RouteDecision:
+    engine: TTSEngine
+    reason: str
+    p50_ms: float
+    p95_ms: float
+    queue_depth: int
+    candidates: List[str]
+    elapsed_ms: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "X-TTS-Engine": self.engine.name,
+            "X-TTS-Route-Reason": self.reason,
+            "X-TTS-Engine-P50-Ms": f"{self.p50_ms:.0f}",
+            "X-TTS-Engine-P95-Ms": f"{self.p95_ms:.0f}",
+            "X-TTS-Queue-Depth": str(self.queue_depth),
+            "X-TTS-Candidates": ",".join(self.candidates),
+            "X-TTS-Synthesis-Ms": f"{self.elapsed_ms:.0f}",
+        }
+
+
+class EngineRouter:
+    """Route synthesis requests to the fastest engine that can serve them"""
+
+    def __init__(self, engines: Optional[List[TTSEngine]] = None):
+        self.engines: Dict[str, TTSEngine] = {}
+        self.stats: Dict[str, EngineStats] = {}
+        self._lock = threading.Lock()
+        for engine in engines or []:
+            self.register(engine)
+
+    def register(self, engine: TTSEngine):
+        self.engines[engine.name] = engine
+        self.stats[engine.name] = EngineStats()
+
+    def _expected_latency(self, engine: TTSEngine) -> float:
+        stats = self.stats[engine.name]
+        p50 = stats.percentile(50, engine.default_latency_ms)
+        # Requests beyond the concurrency limit would have to wait for a slot
+        return p50 * (1 + stats.in_flight / engine.max_concurrency)
+
+    def _decision(self, engine: TTSEngine, reason: str, candidates: List[TTSEngine]) -> RouteDecision:
+        stats = self.stats[engine.name]
+        return RouteDecision(
+            engine=engine,
+            reason=reason,
+            p50_ms=stats.percentile(50, engine.default_latency_ms),
+            p95_ms=stats.percentile(95, engine.default_latency_ms),
+            queue_depth=stats.in_flight,
+            candidates=[c.name for c in candidates],
+        )
+
+    def candidates(self, language: str, voice: Optional[str] = None,
+                   exclude: Optional[set] = None, min_quality: int = 0) -> List[TTSEngine]:
+        exclude = exclude or set()
+        return [
+            engine for engine in self.engines.values()
+            if engine.name not in exclude and engine.quality >= min_quality
+            and engine.supports(language, voice) and engine.is_available()
+        ]
+
+    def route(self, language: str, voice: Optional[str] = None,
+              exclude: Optional[set] = None, min_quality: int = DEFAULT_MIN_QUALITY) -> RouteDecision:
+        """Pick an engine for (language, voice) without queueing"""
+        with self._lock:
+            preferred = self.candidates(language, voice, exclude, 0 if voice else min_quality)
+            fallback = self.candidates(language, None, exclude)
+            if not fallback:
+                raise LookupError(f"No TTS engine available for language '{language}'")
+
+            def has_capacity(engine: TTSEngine) -> bool:
+                return self.stats[engine.name].in_flight < engine.max_concurrency
+
+            ready = [e for e in preferred if has_capacity(e)]
+            if ready:
+                engine = min(ready, key=self._expected_latency)
+                reason = "voice" if voice else "fastest"
+                return self._decision(engine, reason, preferred)
+
+            # Requested voice unavailable: the fastest engine for the language that
+            # still meets the quality floor, and only below it if none has room.
+            if not preferred:
+                for floor in (min_quality, 0):
+                    ready = [e for e in self.candidates(language, None, exclude, floor) if has_capacity(e)]
+                    if ready:
+                        engine = min(ready, key=self._expected_latency)
+                        self.stats[engine.name].degraded_to += 1
+                        return self._decision(engine, "degraded-unavailable", fallback)
+
+            # Every matching engine is saturated: degrade to the cheapest engine
+            # for the language that still has room.
+            ready = [e for e in fallback if has_capacity(e)]
+            if ready:
+                engine = min(ready, key=lambda e: (e.cost, self._expected_latency(e)))
+                self.stats[engine.name].degraded_to += 1
+                return self._decision(engine, "degraded-overload", fallback)
+
+            engine = min(fallback, key=lambda e: e.cost)
+            self.stats[engine.name].degraded_to += 1
+            return self._decision(engine, "degraded-saturated", fallback)
+
+    async def synthesize(self, text: str, language: str, voice: Optional[str] = None,
+                         min_quality: int = DEFAULT_MIN_QUALITY) -> Tuple[bytes, str, RouteDecision]:
+        """Synthesize through the routed engine, falling through on failure"""
+        tried = set()
+        last_error = None
+
+        while True:
+            try:
+                decision = self.route(language, voice, exclude=tried, min_quality=min_quality)
+            except LookupError:
+                if last_error is not None:
+                    raise last_error
+                raise
+
+            engine = decision.engine
+            stats = self.stats[engine.name]
+            engine_voice = voice if voice in engine.voices else None
+
+            with self._lock:
+                stats.in_flight += 1
+            start = time.perf_counter()
+            try:
+                audio, media_type = await asyncio.to_thread(engine.synthesize, text, language, engine_voice)
+            except Exception as e:
+                logger.error(f"Engine {engine.name} failed: {e}")
+                with self._lock:
+                    stats.failures += 1
+                tried.add(engine.name)
+                last_error = e
+                continue
+            finally:
+                with self._lock:
+                    stats.in_flight -= 1
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                stats.latencies.append(elapsed_ms)
+                stats.completed += 1
+
+            decision.elapsed_ms = elapsed_ms
+            if tried:
+                decision.reason = f"{decision.reason}-after-failure"
+            return audio, media_type, decision
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Per-engine capabilities and live statistics"""
+        with self._lock:
+            return {
+                name: {
+                    "available": engine.is_available(),
+                    "languages": sorted(engine.languages),
+                    "voices": sorted(engine.voices),
+                    "cost": engine.cost,
+                    "quality": engine.quality,
+                    "max_concurrency": engine.max_concurrency,
+                    "in_flight": self.stats[name].in_flight,
+                    "completed": self.stats[name].completed,
+                    "failures": self.stats[name].failures,
+                    "degraded_to": self.stats[name].degraded_to,
+                    "p50_ms": round(self.stats[name].percentile(50, engine.default_latency_ms), 1),
+                    "p95_ms": round(self.stats[name].percentile(95, engine.default_latency_ms), 1),
+                    "p99_ms": round(self.stats[name].percentile(99, engine.default_latency_ms), 1),
+                }
+                for name, engine in self.engines.items()
+            }
+
+
+def create_default_router() -> EngineRouter:
+    """Router with every engine used across the main_* variants"""
+    return EngineRouter([CoquiEngine(), GTTSEngine(), AzureEngine(), EspeakTTSEngine()])
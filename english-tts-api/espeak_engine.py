@@ -0,0 +1,161 @@
+"""In-process eSpeak NG engine bound through ctypes.
+
+The library is loaded and initialized once per process; the synth callback
+collects 16-bit PCM straight into memory, so no `espeak` subprocess or
+temporary WAV file is needed per request.
+"""
+
+import ctypes
+import ctypes.util
+import io
+import logging
+import threading
+import wave
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Constants from espeak-ng/speak_lib.h
+AUDIO_OUTPUT_SYNCHRONOUS = 2
+POS_CHARACTER = 1
+ESPEAK_CHARS_UTF8 = 1
+ESPEAK_ENDPAUSE = 0x1000
+ESPEAK_RATE = 1
+ESPEAK_PITCH = 3
+EE_OK = 0
+
+SYNTH_CALLBACK = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+
+LIBRARY_NAMES = ["espeak-ng", "espeak"]
+
+
+class EspeakEngine:
+    """Thread-safe wrapper around a single libespeak-ng instance"""
+
+    def __init__(self):
+        self._lib = None
+        self._lock = threading.Lock()
+        self._sample_rate = 0
+        self._current_voice = None
+        self._current_params = {}
+        self._buffer = []
+        self._callback = SYNTH_CALLBACK(self._on_synth)
+        self._load_failed = False
+
+    def _load(self) -> bool:
+        """Load and initialize the shared library once"""
+        if self._lib is not None:
+            return True
+        if self._load_failed:
+            return False
+
+        for name in LIBRARY_NAMES:
+            path = ctypes.util.find_library(name)
+            if not path:
+                continue
+            try:
+                lib = ctypes.cdll.LoadLibrary(path)
+            except OSError as e:
+                logger.warning(f"Could not load {path}: {e}")
+                continue
+
+            lib.espeak_Initialize.restype = ctypes.c_int
+            lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+            lib.espeak_SetSynthCallback.argtypes = [SYNTH_CALLBACK]
+            lib.espeak_SetVoiceByName.restype = ctypes.c_int
+            lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+            lib.espeak_SetParameter.restype = ctypes.c_int
+            lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+            lib.espeak_Synth.restype = ctypes.c_int
+            lib.espeak_Synth.argtypes = [
+                ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+                ctypes.c_uint, ctypes.c_uint, ctypes.POINTER(ctypes.c_uint), ctypes.c_void_p
+            ]
+
+            sample_rate = lib.espeak_Initialize(AUDIO_OUTPUT_SYNCHRONOUS, 0, None, 0)
+            if sample_rate <= 0:
+                logger.warning(f"espeak_Initialize failed for {path}")
+                continue
+
+            lib.espeak_SetSynthCallback(self._callback)
+            self._lib = lib
+            self._sample_rate = sample_rate
+            logger.info(f"Loaded eSpeak library {path} ({sample_rate} Hz)")
+            return True
+
+        self._load_failed = True
+        logger.warning("libespeak-ng not found, in-process eSpeak engine disabled")
+        return False
+
+    @property
+    def available(self) -> bool:
+        with self._lock:
+            return self._load()
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    def _on_synth(self, wav, numsamples, events) -> int:
+        if wav and numsamples > 0:
+            self._buffer.append(ctypes.string_at(wav, numsamples * 2))
+        return 0
+
+    def _configure(self, voice: str, speed: int, pitch: int):
+        """Apply voice and parameters, skipping calls when nothing changed"""
+        if voice != self._current_voice:
+            if self._lib.espeak_SetVoiceByName(voice.encode("utf-8")) != EE_OK:
+                raise RuntimeError(f"eSpeak voice not available: {voice}")
+            self._current_voice = voice
+            self._current_params = {}
+
+        for param, value in ((ESPEAK_RATE, speed), (ESPEAK_PITCH, pitch)):
+            if self._current_params.get(param) != value:
+                self._lib.espeak_SetParameter(param, value, 0)
+                self._current_params[param] = value
+
+    def synthesize_pcm(self, text: str, voice: str = "vi", speed: int = 150, pitch: int = 50) -> bytes:
+        """Synthesize text to raw 16-bit mono PCM at `sample_rate`"""
+        with self._lock:
+            if not self._load():
+                raise RuntimeError("libespeak-ng is not available")
+
+            self._configure(voice, int(speed), int(pitch))
+
+            data = text.encode("utf-8") + b"\0"
+            self._buffer = []
+            result = self._lib.espeak_Synth(
+                data, len(data), 0, POS_CHARACTER, 0,
+                ESPEAK_CHARS_UTF8 | ESPEAK_ENDPAUSE, None, None
+            )
+            if result != EE_OK:
+                raise RuntimeError(f"espeak_Synth failed with code {result}")
+
+            pcm = b"".join(self._buffer)
+            self._buffer = []
+            return pcm
+
+    def synthesize_wav(self, text: str, voice: str = "vi", speed: int = 150, pitch: int = 50) -> bytes:
+        """Synthesize text to an in-memory WAV file"""
+        pcm = self.synthesize_pcm(text, voice, speed, pitch)
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self._sample_rate)
+            wav_file.writeframes(pcm)
+        return buffer.getvalue()
+
+
+_engine: Optional[EspeakEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_espeak_engine() -> EspeakEngine:
+    """Return the process-wide eSpeak engine"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = EspeakEngine()
+        return _engine
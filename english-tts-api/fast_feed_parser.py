@@ -0,0 +1,181 @@
+"""Bounded streaming RSS/Atom parser.
+
+Feeds are fed to an incremental XML parser (lxml when installed, the
+stdlib expat-backed parser otherwise) in small chunks, and parsing stops
+as soon as max_items entries are complete, so the tail of a long feed is
+never tokenized. Title, link, description, image, date and GUID are pulled
+out in the same pass with precompiled patterns. Documents the strict
+parser rejects are handed to feedparser, which copes with malformed feeds.
+"""
+
+import asyncio
+import html
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+
+try:
+    from lxml import etree as _etree
+    BACKEND = "lxml"
+except ImportError:
+    import xml.etree.ElementTree as _etree
+    BACKEND = "expat"
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 16 * 1024
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+IMG_PATTERN = re.compile(r"""<img[^>]+src=["']([^"']+)["']""", re.IGNORECASE)
+
+ITEM_TAGS = {"item", "entry"}
+IMAGE_TAGS = {"content", "thumbnail", "enclosure"}
+
+
+@dataclass
+class FeedItem:
+    title: str = ""
+    link: str = ""
+    description: str = ""
+    content: str = ""
+    published: str = ""
+    published_parsed: Optional[time.struct_time] = None
+    guid: str = ""
+    image_url: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """Description with HTML tags and entities removed"""
+        return strip_html(self.description)
+
+
+def strip_html(value: str) -> str:
+    return WHITESPACE_PATTERN.sub(" ", html.unescape(TAG_PATTERN.sub("", value))).strip()
+
+
+def _local_name(tag) -> str:
+    if not isinstance(tag, str):
+        return ""
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def parse_date(value: str) -> Optional[time.struct_time]:
+    """RFC 822 (RSS) or ISO 8601 (Atom) date as a UTC struct_time"""
+    if not value:
+        return None
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            moment = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).timetuple()
+
+
+def _build_item(element) -> FeedItem:
+    item = FeedItem()
+    for child in element:
+        name = _local_name(child.tag)
+        text = (child.text or "").strip()
+        if name == "title":
+            # The XML parser has already decoded entities
+            item.title = text
+        elif name == "link":
+            # Atom links carry the URL in href; prefer the alternate one
+            href = child.get("href")
+            if href is None:
+                item.link = item.link or text
+            elif child.get("rel", "alternate") == "alternate" or not item.link:
+                item.link = href
+        elif name in ("description", "summary"):
+            item.description = item.description or text
+        elif name in ("encoded", "content") and not child.get("url"):
+            item.content = item.content or text
+        elif name in ("pubdate", "published", "updated", "date"):
+            if not item.published or name in ("pubdate", "published"):
+                item.published = text
+        elif name in ("guid", "id"):
+            item.guid = text
+        if name in IMAGE_TAGS and item.image_url is None:
+            url = child.get("url")
+            if url and (name != "enclosure" or child.get("type", "image").startswith("image")):
+                item.image_url = url
+
+    if not item.description and item.content:
+        item.description = item.content
+    if item.image_url is None:
+        match = IMG_PATTERN.search(item.content) or IMG_PATTERN.search(item.description)
+        if match:
+            item.image_url = match.group(1)
+    item.published_parsed = parse_date(item.published)
+    item.guid = item.guid or item.link
+    return item
+
+
+def parse_feed_strict(content: bytes, max_items: int) -> List[FeedItem]:
+    """Incrementally parse well-formed XML, stopping after max_items entries"""
+    parser = _etree.XMLPullParser(events=("end",))
+    items: List[FeedItem] = []
+    for offset in range(0, len(content), CHUNK_SIZE):
+        parser.feed(content[offset:offset + CHUNK_SIZE])
+        for _, element in parser.read_events():
+            if _local_name(element.tag) in ITEM_TAGS:
+                items.append(_build_item(element))
+                element.clear()
+                if len(items) >= max_items:
+                    return items
+    parser.close()
+    return items
+
+
+def _from_feedparser(content: bytes, max_items: int) -> List[FeedItem]:
+    import feedparser
+
+    items = []
+    for entry in feedparser.parse(content).entries[:max_items]:
+        description = entry.get("description", "")
+        body = entry.content[0].value if entry.get("content") else ""
+        image_url = None
+        if entry.get("media_content"):
+            image_url = entry.media_content[0].get("url")
+        elif entry.get("media_thumbnail"):
+            image_url = entry.media_thumbnail[0].get("url")
+        elif "image" in entry:
+            image_url = entry.image.get("href")
+        if image_url is None:
+            match = IMG_PATTERN.search(body) or IMG_PATTERN.search(description)
+            image_url = match.group(1) if match else None
+        link = entry.get("link", "")
+        items.append(FeedItem(
+            title=entry.get("title", ""),
+            link=link,
+            description=description,
+            content=body,
+            published=entry.get("published", ""),
+            published_parsed=entry.get("published_parsed"),
+            guid=entry.get("id") or link,
+            image_url=image_url,
+        ))
+    return items
+
+
+def parse_feed(content: bytes, max_items: int = 10) -> List[FeedItem]:
+    """Parse up to max_items entries, falling back to feedparser for malformed feeds"""
+    try:
+        return parse_feed_strict(content, max_items)
+    except Exception as e:
+        logger.info(f"Strict feed parse failed ({e}), falling back to feedparser")
+        return _from_feedparser(content, max_items)
+
+
+async def parse_feed_async(content: bytes, max_items: int = 10) -> List[FeedItem]:
+    """parse_feed in a worker thread, off the event loop"""
+    return await asyncio.to_thread(parse_feed, content, max_items)
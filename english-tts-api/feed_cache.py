@@ -0,0 +1,139 @@
+"""Shared RSS feed cache with per-source TTL and conditional revalidation.
+
+Feeds are keyed by URL. A fresh entry is served from memory; an expired
+one is revalidated with If-None-Match / If-Modified-Since so unchanged
+feeds cost a 304 instead of a full download. Concurrent misses for the
+same URL wait on one upstream request, made through the shared pooled
+HTTP client.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from http_client import HttpClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedFeed:
+    url: str
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    validated_at: float
+    # Incremented whenever the body changes, so parsed results can be memoized
+    version: int = 1
+
+
+class FeedCache:
+    """TTL cache for feed documents"""
+
+    def __init__(self, default_ttl: float = 120.0, timeout: float = 10.0,
+                 client: Optional[HttpClient] = None):
+        self.default_ttl = default_ttl
+        self.timeout = timeout
+        self.client = client or get_http_client()
+        self._entries: Dict[str, CachedFeed] = {}
+        self._url_locks: Dict[str, asyncio.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "errors": 0}
+
+    def _url_lock(self, url: str) -> asyncio.Lock:
+        if url not in self._url_locks:
+            self._url_locks[url] = asyncio.Lock()
+        return self._url_locks[url]
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get_entry(self, url: str) -> Optional[CachedFeed]:
+        return self._entries.get(url)
+
+    def _fresh(self, entry: Optional[CachedFeed], ttl: float) -> bool:
+        return entry is not None and time.monotonic() - entry.validated_at < ttl
+
+    def is_fresh(self, url: str, ttl: Optional[float] = None) -> bool:
+        """Whether fetch(url, ttl) would be answered without a network request"""
+        return self._fresh(self._entries.get(url), self.default_ttl if ttl is None else ttl)
+
+    async def fetch(self, url: str, ttl: Optional[float] = None, timeout: Optional[float] = None) -> CachedFeed:
+        """Return the feed at url, hitting the network only when the entry expired"""
+        ttl = self.default_ttl if ttl is None else ttl
+
+        entry = self._entries.get(url)
+        if self._fresh(entry, ttl):
+            self._count("hits")
+            return entry
+
+        async with self._url_lock(url):
+            # Another request may have refreshed it while we waited
+            entry = self._entries.get(url)
+            if self._fresh(entry, ttl):
+                self._count("hits")
+                return entry
+
+            headers = {}
+            if entry is not None:
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+
+            try:
+                response = await self.client.get(url, headers=headers, timeout=timeout or self.timeout)
+                if response.status == 304 and entry is not None:
+                    entry.validated_at = time.monotonic()
+                    self._count("not_modified")
+                    return entry
+                response.raise_for_status()
+            except Exception:
+                self._count("errors")
+                raise
+
+            now = time.monotonic()
+            if entry is not None and response.body == entry.content:
+                # Server ignored the validators but the body is unchanged
+                entry.validated_at = now
+                entry.etag = response.headers.get("ETag", entry.etag)
+                entry.last_modified = response.headers.get("Last-Modified", entry.last_modified)
+                self._count("misses")
+                return entry
+
+            new_entry = CachedFeed(
+                url=url,
+                content=response.body,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                fetched_at=now,
+                validated_at=now,
+                version=(entry.version + 1) if entry is not None else 1,
+            )
+            self._entries[url] = new_entry
+            self._count("misses")
+            return new_entry
+
+    def get_stats(self) -> dict:
+        """Hit/miss/304 counters and per-feed ages"""
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self.stats)
+        total = stats["hits"] + stats["misses"] + stats["not_modified"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["not_modified"]) / total, 3) if total else 0.0
+        stats["feeds"] = {
+            url: {
+                "bytes": len(entry.content),
+                "age_seconds": round(now - entry.validated_at, 1),
+                "etag": entry.etag,
+                "last_modified": entry.last_modified,
+                "version": entry.version,
+            }
+            for url, entry in list(self._entries.items())
+        }
+        return stats
@@ -0,0 +1,191 @@
+"""Background feed polling with incremental ingest into an in-memory store.
+
+Each source is polled on its own adaptive schedule: the interval shrinks
+while a feed keeps producing new entries, grows while it is quiet, and
+backs off exponentially while it fails. A per-source GUID/link high-water
+mark means only entries newer than the previous poll are ingested.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleStore:
+    """Newest-first articles per source, readable without network access"""
+
+    def __init__(self, max_per_source: int = 200):
+        self.max_per_source = max_per_source
+        self._articles: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str, List[Any]], None]] = []
+        self.version = 0
+
+    def add_listener(self, callback: Callable[[str, List[Any]], None]):
+        """Call callback(source_key, new_articles) after every ingest"""
+        self._listeners.append(callback)
+
+    def add(self, source_key: str, new_articles: List[Any]):
+        """Ingest articles given newest first"""
+        with self._lock:
+            articles = self._articles.setdefault(source_key, deque(maxlen=self.max_per_source))
+            for article in reversed(new_articles):
+                articles.appendleft(article)
+            if new_articles:
+                self.version += 1
+
+        for callback in self._listeners:
+            try:
+                callback(source_key, new_articles)
+            except Exception as e:
+                logger.error(f"Article store listener failed: {e}")
+
+    def is_warm(self, source_key: str) -> bool:
+        return source_key in self._articles
+
+    def get(self, source_key: str, limit: Optional[int] = None) -> List[Any]:
+        with self._lock:
+            articles = list(self._articles.get(source_key, ()))
+        return articles[:limit] if limit is not None else articles
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {key: len(articles) for key, articles in self._articles.items()}
+
+
+@dataclass
+class SourceSchedule:
+    interval: float
+    next_poll: float = 0.0
+    consecutive_failures: int = 0
+    high_water: Optional[str] = None
+    seen: deque = field(default_factory=lambda: deque(maxlen=500))
+    last_poll: Optional[float] = None
+    last_new: int = 0
+    last_error: Optional[str] = None
+    polls: int = 0
+
+
+class FeedPoller:
+    """Poll every source in the background and feed new entries into a store"""
+
+    def __init__(self, sources: Dict[str, dict], load_articles: Callable[[str], Any],
+                 store: ArticleStore, key_func: Callable[[Any], str],
+                 min_interval: float = 30.0, max_interval: float = 900.0, max_backoff: float = 1800.0):
+        self.sources = sources
+        self.load_articles = load_articles
+        self.store = store
+        self.key_func = key_func
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_backoff = max_backoff
+        self.schedules = {
+            key: SourceSchedule(interval=float(source.get('cache_ttl', 120)))
+            for key, source in sources.items()
+        }
+        self._task: Optional[asyncio.Task] = None
+        self._polling: Dict[str, asyncio.Task] = {}
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Feed poller started for {len(self.sources)} sources")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._polling.values()):
+            task.cancel()
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            for key, schedule in self.schedules.items():
+                if schedule.next_poll <= now and key not in self._polling:
+                    self._polling[key] = asyncio.create_task(self._poll_and_release(key))
+
+            upcoming = min(schedule.next_poll for schedule in self.schedules.values())
+            await asyncio.sleep(min(5.0, max(0.5, upcoming - time.monotonic())))
+
+    async def _poll_and_release(self, source_key: str):
+        try:
+            await self.poll_source(source_key)
+        finally:
+            self._polling.pop(source_key, None)
+
+    async def poll_source(self, source_key: str) -> int:
+        """Poll one source now; returns the number of new articles ingested"""
+        schedule = self.schedules[source_key]
+        schedule.last_poll = time.time()
+        schedule.polls += 1
+
+        try:
+            if asyncio.iscoroutinefunction(self.load_articles):
+                articles = await self.load_articles(source_key)
+            else:
+                articles = await asyncio.to_thread(self.load_articles, source_key)
+        except Exception as e:
+            schedule.consecutive_failures += 1
+            schedule.last_error = str(e)
+            backoff = min(self.max_backoff, schedule.interval * (2 ** schedule.consecutive_failures))
+            schedule.next_poll = time.monotonic() + backoff
+            logger.warning(f"Polling {source_key} failed ({schedule.consecutive_failures}x), retry in {backoff:.0f}s: {e}")
+            return 0
+
+        new_articles = []
+        for article in articles:
+            key = self.key_func(article)
+            # Everything past the previous newest entry was already ingested
+            if key == schedule.high_water:
+                break
+            if key in schedule.seen:
+                continue
+            new_articles.append(article)
+
+        if articles:
+            schedule.high_water = self.key_func(articles[0])
+        for article in new_articles:
+            schedule.seen.append(self.key_func(article))
+
+        if new_articles or not self.store.is_warm(source_key):
+            self.store.add(source_key, new_articles)
+
+        # Poll busy feeds more often and quiet feeds less often
+        if new_articles and schedule.polls > 1:
+            schedule.interval = max(self.min_interval, schedule.interval * 0.5)
+        elif not new_articles:
+            schedule.interval = min(self.max_interval, schedule.interval * 1.5)
+        schedule.consecutive_failures = 0
+        schedule.last_error = None
+        schedule.last_new = len(new_articles)
+        schedule.next_poll = time.monotonic() + schedule.interval
+
+        if new_articles:
+            logger.info(f"Ingested {len(new_articles)} new articles from {source_key}")
+        return len(new_articles)
+
+    def status(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        counts = self.store.counts()
+        return {
+            key: {
+                "interval_seconds": round(schedule.interval, 1),
+                "next_poll_in_seconds": round(max(0.0, schedule.next_poll - now), 1),
+                "consecutive_failures": schedule.consecutive_failures,
+                "last_error": schedule.last_error,
+                "last_new_articles": schedule.last_new,
+                "stored_articles": counts.get(key, 0),
+            }
+            for key, schedule in self.schedules.items()
+        }
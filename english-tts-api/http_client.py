@@ -0,0 +1,203 @@
+"""Shared pooled async HTTP client for news fetching.
+
+One aiohttp session is created per process and reused by every fetch path,
+so connections to feed hosts stay alive between requests instead of paying
+a TCP + TLS handshake each time. The connector caps connections overall and
+per host, and caches DNS lookups. Failed GETs are retried only while a
+retry budget allows it, so a struggling upstream is not hit with a retry
+storm.
+
+aiohttp speaks HTTP/1.1 only; keep-alive reuse is what removes the
+handshakes here.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+from multidict import CIMultiDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Upstream statuses worth a second attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpStatusError(Exception):
+    """Raised for 4xx/5xx responses by HttpResponse.raise_for_status"""
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+
+
+class ResponseTooLargeError(Exception):
+    """Raised when a response body exceeds the caller's byte limit"""
+
+    def __init__(self, url: str, limit: int):
+        super().__init__(f"Response from {url} exceeds {limit} bytes")
+        self.url = url
+        self.limit = limit
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HttpStatusError(self.url, self.status)
+
+
+class RetryBudget:
+    """Token bucket that caps retries at a fraction of recent requests"""
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, deposit: float = 0.0):
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + deposit + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def record_request(self):
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class HttpClient:
+    """Process-wide aiohttp session with pooling, DNS cache and budgeted retries"""
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 6, dns_cache_ttl: int = 300,
+                 keepalive_timeout: float = 60.0, timeout: float = 10.0, max_retries: int = 2,
+                 retry_backoff: float = 0.2, user_agent: str = DEFAULT_USER_AGENT,
+                 retry_budget: Optional[RetryBudget] = None,
+                 resolver: Optional[AbstractResolver] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.user_agent = user_agent
+        self.retry_budget = retry_budget or RetryBudget()
+        self.resolver = resolver
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats = {"requests": 0, "retries": 0, "retries_denied": 0, "errors": 0}
+
+    async def start(self):
+        """Create the session; must run inside the event loop that will use it"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+                resolver=self.resolver,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": self.user_agent, "Accept-Encoding": "gzip, deflate"},
+            )
+            logger.info(f"HTTP client started (limit={self.limit}, per_host={self.limit_per_host})")
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @staticmethod
+    async def _read_limited(url: str, response: aiohttp.ClientResponse, max_bytes: int) -> bytes:
+        """Read the body, failing as soon as it is known to exceed max_bytes"""
+        if response.content_length is not None and response.content_length > max_bytes:
+            raise ResponseTooLargeError(url, max_bytes)
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            body += chunk
+            if len(body) > max_bytes:
+                raise ResponseTooLargeError(url, max_bytes)
+        return bytes(body)
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  timeout: Optional[float] = None, allow_redirects: bool = True,
+                  max_bytes: Optional[int] = None) -> HttpResponse:
+        """GET url and read the body; timeout bounds all attempts together"""
+        await self.start()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.timeout)
+        attempt = 0
+        self.retry_budget.record_request()
+        self.stats["requests"] += 1
+
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                async with self._session.get(url, headers=headers, allow_redirects=allow_redirects,
+                                             timeout=aiohttp.ClientTimeout(total=remaining)) as response:
+                    if max_bytes is None:
+                        body = await response.read()
+                    else:
+                        body = await self._read_limited(url, response, max_bytes)
+                    result = HttpResponse(url=url, status=response.status, headers=CIMultiDict(response.headers), body=body)
+                if result.status not in RETRY_STATUSES:
+                    return result
+                error = None
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                result, error = None, e
+
+            attempt += 1
+            backoff = self.retry_backoff * (2 ** (attempt - 1)) * (0.5 + random.random())
+            if attempt > self.max_retries or loop.time() + backoff >= deadline:
+                break
+            if not self.retry_budget.try_spend():
+                self.stats["retries_denied"] += 1
+                break
+            self.stats["retries"] += 1
+            logger.info(f"Retrying {url} (attempt {attempt + 1}) after {error or result.status}")
+            await asyncio.sleep(backoff)
+
+        if result is not None:
+            return result
+        self.stats["errors"] += 1
+        raise error
+
+    def get_stats(self) -> dict:
+        stats = dict(self.stats)
+        stats["retry_tokens"] = round(self.retry_budget._tokens, 2)
+        return stats
+
+
+http_client = HttpClient()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide HTTP client"""
+    return http_client
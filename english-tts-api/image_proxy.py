@@ -0,0 +1,350 @@
+"""Article image proxy with on-disk thumbnail cache.
+
+The original image behind a URL is downloaded once and kept on disk;
+resized WebP or JPEG renditions are produced from it on first request,
+at a small fixed set of widths so the cache cannot be blown up with
+arbitrary sizes. Originals and thumbnails share one LRU byte budget:
+when the directory grows past it, the least recently served files are
+deleted. Served files never change, so they can be cached by browsers
+and CDNs for a long time.
+
+Only public hosts are fetched: every URL, including each redirect hop, is
+checked, and the connection itself goes through a resolver that refuses
+names resolving to private, loopback or link-local addresses, so a
+rebinding DNS answer cannot slip an internal address in after the check.
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import io
+import logging
+import os
+import socket
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urljoin, urlsplit
+
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import DefaultResolver
+from fastapi import HTTPException
+from fastapi.responses import FileResponse
+
+from http_client import HttpClient, ResponseTooLargeError
+
+try:
+    from PIL import Image, ImageOps
+    Image.MAX_IMAGE_PIXELS = 40_000_000
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTHS = (160, 320, 640, 960)
+MEDIA_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+QUALITY = {"webp": 80, "jpeg": 82}
+MAX_ORIGINAL_BYTES = 10 * 1024 * 1024
+MAX_REDIRECTS = 3
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+USER_AGENT = "Mozilla/5.0 (compatible; NewsImageProxy/1.0)"
+
+
+class ImageProxyError(Exception):
+    """The image could not be fetched or decoded"""
+
+
+def snap_width(width: Optional[int]) -> int:
+    """Smallest configured width at least as wide as requested"""
+    if not width:
+        return THUMBNAIL_WIDTHS[1]
+    for candidate in THUMBNAIL_WIDTHS:
+        if candidate >= width:
+            return candidate
+    return THUMBNAIL_WIDTHS[-1]
+
+
+def thumbnail_path(url: Optional[str], width: int = THUMBNAIL_WIDTHS[1]) -> Optional[str]:
+    """Proxy path serving a thumbnail of url"""
+    if not url:
+        return None
+    return f"/image?url={quote(url, safe='')}&w={width}"
+
+
+class NonPublicAddressError(OSError):
+    """A host name resolved to a private, loopback or link-local address"""
+
+
+def is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def validate_image_url(url: str) -> str:
+    """Only public http(s) URLs may be proxied; returns the host name"""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("Only absolute http(s) image URLs can be proxied")
+    host = parts.hostname.lower()
+    if host == "localhost" or host.endswith(".localhost") or host.endswith(".local"):
+        raise ValueError("Local image URLs cannot be proxied")
+    try:
+        public = is_public_address(host)
+    except ValueError:
+        return host
+    if not public:
+        raise ValueError("Private image URLs cannot be proxied")
+    return host
+
+
+class PublicAddressResolver(AbstractResolver):
+    """DNS resolver that refuses hosts with any non-public address"""
+
+    def __init__(self, resolver: Optional[AbstractResolver] = None):
+        self._resolver = resolver
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[dict]:
+        if self._resolver is None:
+            self._resolver = DefaultResolver()
+        addresses = await self._resolver.resolve(host, port, family)
+        # The connector only ever dials addresses returned here
+        if not all(is_public_address(address["host"]) for address in addresses):
+            raise NonPublicAddressError(f"{host} resolves to a non-public address")
+        return addresses
+
+    async def close(self):
+        if self._resolver is not None:
+            await self._resolver.close()
+
+
+async def validate_image_host(url: str, resolver: PublicAddressResolver):
+    """validate_image_url plus a DNS check, so names of internal hosts are refused up front"""
+    host = validate_image_url(url)
+    try:
+        await resolver.resolve(host, 0, socket.AF_UNSPEC)
+    except NonPublicAddressError:
+        raise ValueError("Private image URLs cannot be proxied")
+    except OSError:
+        raise ValueError(f"Cannot resolve image host {host}")
+
+
+def render_thumbnail(original: bytes, width: int, image_format: str) -> bytes:
+    """Resize an encoded image to width (never upscaling) and encode it as WebP or JPEG"""
+    with Image.open(io.BytesIO(original)) as image:
+        # Let the JPEG decoder skip detail that would be thrown away anyway
+        image.draft("RGB", (width, width * 4))
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+
+        if image_format == "jpeg" or image.mode not in ("RGB", "RGBA"):
+            if image.mode in ("RGBA", "LA", "P"):
+                # Flatten transparency onto white rather than black
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                rgba = image.convert("RGBA")
+                background.paste(rgba, mask=rgba.getchannel("A"))
+                image = background
+            else:
+                image = image.convert("RGB")
+
+        output = io.BytesIO()
+        if image_format == "webp":
+            image.save(output, "WEBP", quality=QUALITY["webp"], method=4)
+        else:
+            image.save(output, "JPEG", quality=QUALITY["jpeg"], optimize=True, progressive=True)
+        return output.getvalue()
+
+
+class ImageProxy:
+    """Fetch-once originals and lazily rendered thumbnails under an LRU byte budget"""
+
+    def __init__(self, cache_dir: str = os.path.join("output", "image_cache"),
+                 max_bytes: int = 256 * 1024 * 1024, client: Optional[HttpClient] = None,
+                 timeout: float = 10.0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Own pool whose resolver only ever connects to public addresses
+        self.resolver = PublicAddressResolver()
+        self.client = client or HttpClient(limit_per_host=4, max_retries=1, resolver=self.resolver)
+        self.timeout = timeout
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "renders": 0, "fetches": 0, "errors": 0, "evictions": 0}
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def _load_index(self):
+        """Rebuild the LRU order from the cache directory, least recently used first"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".tmp"):
+                    continue
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, name, stat.st_size))
+            for _, name, size in sorted(entries):
+                self._files[name] = size
+                self._total_bytes += size
+        self._evict()
+
+    def _touch(self, name: str) -> bool:
+        with self._lock:
+            if name not in self._files:
+                return False
+            self._files.move_to_end(name)
+        try:
+            # mtime carries the LRU order across restarts
+            os.utime(os.path.join(self.cache_dir, name))
+        except FileNotFoundError:
+            with self._lock:
+                self._total_bytes -= self._files.pop(name, 0)
+            return False
+        return True
+
+    def _write(self, name: str, data: bytes):
+        path = os.path.join(self.cache_dir, name)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._total_bytes += len(data) - self._files.pop(name, 0)
+            self._files[name] = len(data)
+        self._evict()
+
+    def _evict(self):
+        while True:
+            with self._lock:
+                if self._total_bytes <= self.max_bytes or len(self._files) <= 1:
+                    return
+                name, size = self._files.popitem(last=False)
+                self._total_bytes -= size
+                self.stats["evictions"] += 1
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def _read(self, name: str) -> bytes:
+        with open(os.path.join(self.cache_dir, name), "rb") as f:
+            return f.read()
+
+    async def _single_flight(self, name: str, factory):
+        """Run factory() once for concurrent callers asking for the same cache file"""
+        task = self._inflight.get(name)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_original(self, url: str, name: str) -> bytes:
+        self.stats["fetches"] += 1
+        # Redirects are followed by hand so every hop is validated
+        for _ in range(MAX_REDIRECTS + 1):
+            try:
+                response = await self.client.get(url, headers={"User-Agent": USER_AGENT}, timeout=self.timeout,
+                                                 allow_redirects=False, max_bytes=MAX_ORIGINAL_BYTES)
+            except ResponseTooLargeError:
+                raise ImageProxyError(f"Image larger than {MAX_ORIGINAL_BYTES} bytes")
+            if response.status not in REDIRECT_STATUSES:
+                break
+            location = response.headers.get("Location")
+            if not location:
+                raise ImageProxyError(f"Redirect without a Location from {url}")
+            url = urljoin(url, location)
+            try:
+                validate_image_url(url)
+            except ValueError as e:
+                raise ImageProxyError(f"Refusing redirect: {e}")
+        else:
+            raise ImageProxyError("Too many redirects")
+
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and not content_type.startswith("image/"):
+            raise ImageProxyError(f"Not an image: {content_type}")
+        await asyncio.to_thread(self._write, name, response.body)
+        return response.body
+
+    async def _original(self, url: str, key: str) -> bytes:
+        name = f"{key}.orig"
+        if self._touch(name):
+            return await asyncio.to_thread(self._read, name)
+        return await self._single_flight(name, lambda: self._fetch_original(url, name))
+
+    async def _render(self, url: str, width: int, image_format: str, key: str, name: str) -> str:
+        try:
+            original = await self._original(url, key)
+            data = await asyncio.to_thread(render_thumbnail, original, width, image_format)
+            await asyncio.to_thread(self._write, name, data)
+        except ImageProxyError:
+            self.stats["errors"] += 1
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            raise ImageProxyError(str(e)) from e
+        self.stats["renders"] += 1
+        return os.path.join(self.cache_dir, name)
+
+    async def get_thumbnail(self, url: str, width: Optional[int] = None,
+                            image_format: str = "jpeg") -> Tuple[str, str]:
+        """Path and media type of the thumbnail for url; raises ValueError or ImageProxyError"""
+        await validate_image_host(url, self.resolver)
+        if image_format not in MEDIA_TYPES:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        if not self._loaded:
+            await asyncio.to_thread(self._load_index)
+
+        width = snap_width(width)
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        name = f"{key}_{width}.{image_format}"
+        if self._touch(name):
+            self.stats["hits"] += 1
+            return os.path.join(self.cache_dir, name), MEDIA_TYPES[image_format]
+
+        # Concurrent requests for the same rendition share one fetch and render
+        path = await self._single_flight(name, lambda: self._render(url, width, image_format, key, name))
+        return path, MEDIA_TYPES[image_format]
+
+    async def serve(self, url: str, width: Optional[int] = None, image_format: Optional[str] = None,
+                    accept: str = "") -> FileResponse:
+        """HTTP response for an /image request: 400 for bad URLs, 502 when the image cannot be loaded"""
+        if not self.available:
+            raise HTTPException(status_code=503, detail="Image resizing is not available (Pillow missing)")
+
+        # WebP for browsers that accept it, JPEG otherwise
+        chosen_format = image_format or ("webp" if "image/webp" in accept else "jpeg")
+        try:
+            path, media_type = await self.get_thumbnail(url, width, chosen_format)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ImageProxyError as e:
+            logger.warning(f"Image proxy failed for {url}: {e}")
+            raise HTTPException(status_code=502, detail=f"Could not load image: {e}")
+
+        headers = {"Cache-Control": "public, max-age=31536000, immutable"}
+        if image_format is None:
+            headers["Vary"] = "Accept"
+        return FileResponse(path=path, media_type=media_type, headers=headers)
+
+    async def close(self):
+        await self.client.close()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            files, total = len(self._files), self._total_bytes
+        return {**self.stats, "files": files, "bytes": total, "max_bytes": self.max_bytes,
+                "available": self.available}
@@ -1,6 +1,7 @@
 from fastapi import FastAPI, Form, HTTPException, Request
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
 import uvicorn
 import os
 import logging
@@ -11,6 +12,7 @@ import subprocess
 import sys
 from gtts import gTTS
 import random
+from espeak_engine import get_espeak_engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -100,6 +102,25 @@ VOICE_MODELS = {
     }
 }
 
+# Map voice models to espeak voices
+ESPEAK_VOICES = {
+    "google_male_vn": "vi",
+    "google_female_vn": "vi+f3",  # Female voice
+    "google_male_au": "vi+m3",    # Male voice
+    "google_female_au": "vi+f4",  # Different female voice
+    "google_male_us": "vi+m2",    # Different male voice
+    "google_female_us": "vi+f2",  # Different female voice
+    "google_news_style": "vi+m4", # News style
+    "google_slow_clear": "vi+s"   # Slow speech
+}
+
+def new_output_path() -> str:
+    """Create a per-request output file, so concurrent requests never overwrite each other's audio"""
+    os.makedirs("output", exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".wav", dir="output")
+    os.close(fd)
+    return path
+
 def synthesize_with_google_diverse(text: str, voice_model: str = "google_male_vn") -> str:
     """Synthesize speech using Google TTS with diverse configurations"""
     try:
@@ -113,14 +134,11 @@ def synthesize_with_google_diverse(text: str, voice_model: str = "google_male_vn
             slow=model_config["slow"]
         )
         
-        # Save to temporary file
-        output_path = "output/output.wav"
-        os.makedirs("output", exist_ok=True)
-        
         # Save as MP3 first, then convert to WAV
         temp_mp3 = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
         tts.save(temp_mp3.name)
         temp_mp3.close()
+        output_path = new_output_path()
         
         # Convert MP3 to WAV using ffmpeg if available
         try:
@@ -134,6 +152,7 @@ def synthesize_with_google_diverse(text: str, voice_model: str = "google_male_vn
             os.unlink(temp_mp3.name)
         except (subprocess.CalledProcessError, FileNotFoundError):
             # If ffmpeg not available, just copy the MP3 file
+            os.unlink(output_path)
             os.rename(temp_mp3.name, output_path.replace('.wav', '.mp3'))
             output_path = output_path.replace('.wav', '.mp3')
         
@@ -144,43 +163,24 @@ def synthesize_with_google_diverse(text: str, voice_model: str = "google_male_vn
         raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
 
 def synthesize_with_espeak(text: str, voice_model: str = "google_male_vn") -> str:
-    """Synthesize speech using espeak (if available)"""
+    """Synthesize speech using the in-process eSpeak NG engine (if available)"""
     try:
-        # Check if espeak is available
-        subprocess.run(["espeak", "--version"], check=True, capture_output=True)
+        engine = get_espeak_engine()
+        if not engine.available:
+            # Fallback to Google TTS
+            logger.warning("espeak not available, falling back to Google TTS")
+            return synthesize_with_google_diverse(text, voice_model)
         
-        # Map voice models to espeak voices
-        espeak_voices = {
-            "google_male_vn": "vi",
-            "google_female_vn": "vi+f3",  # Female voice
-            "google_male_au": "vi+m3",    # Male voice
-            "google_female_au": "vi+f4",  # Different female voice
-            "google_male_us": "vi+m2",    # Different male voice
-            "google_female_us": "vi+f2",  # Different female voice
-            "google_news_style": "vi+m4", # News style
-            "google_slow_clear": "vi+s"   # Slow speech
-        }
+        voice = ESPEAK_VOICES.get(voice_model, "vi")
         
-        voice = espeak_voices.get(voice_model, "vi")
-        
-        output_path = "output/output.wav"
-        os.makedirs("output", exist_ok=True)
-        
-        # Use espeak to generate speech
-        subprocess.run([
-            "espeak", 
-            "-v", voice,
-            "-s", "150",  # Speed
-            "-w", output_path,
-            text
-        ], check=True)
+        # PCM is collected in memory by the synth callback
+        wav_data = engine.synthesize_wav(text, voice=voice, speed=150)
+        output_path = new_output_path()
+        with open(output_path, "wb") as f:
+            f.write(wav_data)
         
         return output_path
         
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Fallback to Google TTS
-        logger.warning("espeak not available, falling back to Google TTS")
-        return synthesize_with_google_diverse(text, voice_model)
     except Exception as e:
         logger.error(f"Error in espeak synthesis: {str(e)}")
         return synthesize_with_google_diverse(text, voice_model)
@@ -209,13 +209,11 @@ def synthesize_with_random_variation(text: str, voice_model: str = "google_male_
             slow=model_config["slow"]
         )
         
-        output_path = "output/output.wav"
-        os.makedirs("output", exist_ok=True)
-        
         # Save as MP3 first
         temp_mp3 = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
         tts.save(temp_mp3.name)
         temp_mp3.close()
+        output_path = new_output_path()
         
         # Convert with random audio processing
         try:
@@ -232,6 +230,7 @@ def synthesize_with_random_variation(text: str, voice_model: str = "google_male_
             ], check=True, capture_output=True)
             os.unlink(temp_mp3.name)
         except (subprocess.CalledProcessError, FileNotFoundError):
+            os.unlink(output_path)
             os.rename(temp_mp3.name, output_path.replace('.wav', '.mp3'))
             output_path = output_path.replace('.wav', '.mp3')
         
@@ -311,7 +310,8 @@ async def synthesize_speech(
         return FileResponse(
             path=output_path,
             media_type="audio/wav" if output_path.endswith('.wav') else "audio/mpeg",
-            filename="tts_output.wav" if output_path.endswith('.wav') else "tts_output.mp3"
+            filename="tts_output.wav" if output_path.endswith('.wav') else "tts_output.mp3",
+            background=BackgroundTask(os.unlink, output_path)
         )
         
     except HTTPException:
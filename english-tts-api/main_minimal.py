@@ -2,13 +2,13 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import logging
-import feedparser
 import asyncio
 from datetime import datetime
 from pydantic import BaseModel
 from typing import List, Dict, Any
 import hashlib
-import re
+from http_client import get_http_client
+from fast_feed_parser import parse_feed_async
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,6 +30,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Pooled HTTP client shared by every outbound fetch
+http_client = get_http_client()
+
 # News sources
 NEWS_SOURCES = {
     "vi": [
@@ -61,28 +64,23 @@ async def fetch_news_from_source(source: Dict[str, Any], query: str = "") -> Lis
     articles = []
     
     try:
-        feed = feedparser.parse(source["url"])
+        response = await http_client.get(source["url"])
+        response.raise_for_status()
+        items = await parse_feed_async(response.body, max_items=5)  # Limit to 5 articles per source
         
-        for entry in feed.entries[:5]:  # Limit to 5 articles per source
-            title = entry.get('title', '').strip()
-            description = entry.get('description', '').strip()
-            link = entry.get('link', '')
-            published = entry.get('published_parsed', None)
+        for item in items:
+            title = item.title.strip()
+            description = item.description.strip()
+            link = item.link
+            published = item.published_parsed
             
             if published:
                 published_date = datetime(*published[:6])
             else:
                 published_date = datetime.now()
             
-            # Extract image from content
-            image_url = ""
-            if hasattr(entry, 'content'):
-                for content in entry.content:
-                    if content.type == 'text/html':
-                        img_match = re.search(r'<img[^>]+src="([^"]+)"', content.value)
-                        if img_match:
-                            image_url = img_match.group(1)
-                            break
+            # Image from the feed entry (media, enclosure or content)
+            image_url = item.image_url or ""
             
             if not image_url:
                 image_url = "https://images.unsplash.com/photo-1559757148-5c350d0d3c56?w=400&h=250&fit=crop"
@@ -141,6 +139,16 @@ async def search_news_real_time(query: str, language: str = "vi", limit: int = 1
         timestamp=datetime.now().isoformat()
     )
 
+@app.on_event("startup")
+async def startup_event():
+    """Open the shared HTTP client"""
+    await http_client.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled HTTP connections"""
+    await http_client.close()
+
 # API Endpoints
 @app.get("/health")
 async def health_check():
@@ -1,6 +1,7 @@
 from fastapi import FastAPI, Form, HTTPException, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
 import uvicorn
 import os
 import logging
@@ -12,6 +13,13 @@ import sys
 from gtts import gTTS
 import random
 import time
+import asyncio
+import io
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from espeak_engine import get_espeak_engine
+from bulletin_assembler import BulletinAssembler
+from audio_utils import decode_mp3, time_stretch
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -123,6 +131,37 @@ VOICE_MODELS = {
     }
 }
 
+# Map voice models to espeak voices with enhanced parameters
+ESPEAK_CONFIGS = {
+    "google_vn_male": {"voice": "vi+m3", "speed": "120", "pitch": "50"},
+    "google_vn_female": {"voice": "vi+f3", "speed": "140", "pitch": "70"},
+    "google_au_male": {"voice": "vi+m2", "speed": "130", "pitch": "55"},
+    "google_au_female": {"voice": "vi+f2", "speed": "150", "pitch": "75"},
+    "google_us_male": {"voice": "vi+m4", "speed": "125", "pitch": "45"},
+    "google_us_female": {"voice": "vi+f4", "speed": "145", "pitch": "80"},
+    "google_news_male": {"voice": "vi+m1", "speed": "110", "pitch": "60"},
+    "google_news_female": {"voice": "vi+f1", "speed": "135", "pitch": "65"}
+}
+
+# Pydantic models
+class BulletinSegmentRequest(BaseModel):
+    text: str
+    voice_model: str = "google_vn_male"
+    pause_ms: Optional[float] = Field(None, ge=0, le=5000)
+
+class BulletinRequest(BaseModel):
+    segments: List[BulletinSegmentRequest]
+    pause_ms: float = Field(600.0, ge=0, le=5000)
+    sample_rate: int = 22050
+    target_db: float = -20.0
+
+def new_output_path() -> str:
+    """Create a per-request output file, so concurrent requests never overwrite each other's audio"""
+    os.makedirs("output", exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".wav", dir="output")
+    os.close(fd)
+    return path
+
 def synthesize_with_google_enhanced(text: str, voice_model: str = "google_vn_male") -> str:
     """Synthesize speech using Google TTS with enhanced voice differentiation"""
     try:
@@ -139,14 +178,11 @@ def synthesize_with_google_enhanced(text: str, voice_model: str = "google_vn_mal
             slow=model_config["slow"]
         )
         
-        # Save to temporary file
-        output_path = "output/output.wav"
-        os.makedirs("output", exist_ok=True)
-        
         # Save as MP3 first, then convert to WAV with voice-specific processing
         temp_mp3 = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
         tts.save(temp_mp3.name)
         temp_mp3.close()
+        output_path = new_output_path()
         
         # Convert MP3 to WAV with voice-specific audio processing
         try:
@@ -165,6 +201,7 @@ def synthesize_with_google_enhanced(text: str, voice_model: str = "google_vn_mal
             os.unlink(temp_mp3.name)
         except (subprocess.CalledProcessError, FileNotFoundError):
             # If ffmpeg not available, just copy the MP3 file
+            os.unlink(output_path)
             os.rename(temp_mp3.name, output_path.replace('.wav', '.mp3'))
             output_path = output_path.replace('.wav', '.mp3')
         
@@ -218,6 +255,15 @@ def get_channels_for_voice(voice_model: str) -> int:
     else:
         return 1  # Mono for regular voices
 
+def get_tempo_for_voice(voice_model: str) -> float:
+    """Get the tempo factor matching the atempo filter for a voice model"""
+    if "male" in voice_model:
+        return 0.9
+    elif "female" in voice_model:
+        return 1.1
+    else:
+        return 1.0
+
 def get_audio_filter_for_voice(voice_model: str) -> str:
     """Get audio filter based on voice model"""
     if "male" in voice_model:
@@ -228,44 +274,29 @@ def get_audio_filter_for_voice(voice_model: str) -> str:
         return "atempo=1.0,volume=1.0"  # Normal for others
 
 def synthesize_with_espeak_enhanced(text: str, voice_model: str = "google_vn_male") -> str:
-    """Synthesize speech using espeak with enhanced voice differentiation"""
+    """Synthesize speech using the in-process eSpeak NG engine with enhanced voice differentiation"""
     try:
-        # Check if espeak is available
-        subprocess.run(["espeak", "--version"], check=True, capture_output=True)
-        
-        # Map voice models to espeak voices with enhanced parameters
-        espeak_configs = {
-            "google_vn_male": {"voice": "vi+m3", "speed": "120", "pitch": "50"},
-            "google_vn_female": {"voice": "vi+f3", "speed": "140", "pitch": "70"},
-            "google_au_male": {"voice": "vi+m2", "speed": "130", "pitch": "55"},
-            "google_au_female": {"voice": "vi+f2", "speed": "150", "pitch": "75"},
-            "google_us_male": {"voice": "vi+m4", "speed": "125", "pitch": "45"},
-            "google_us_female": {"voice": "vi+f4", "speed": "145", "pitch": "80"},
-            "google_news_male": {"voice": "vi+m1", "speed": "110", "pitch": "60"},
-            "google_news_female": {"voice": "vi+f1", "speed": "135", "pitch": "65"}
-        }
+        engine = get_espeak_engine()
+        if not engine.available:
+            # Fallback to Google TTS
+            logger.warning("espeak not available, falling back to Google TTS")
+            return synthesize_with_google_enhanced(text, voice_model)
         
-        config = espeak_configs.get(voice_model, espeak_configs["google_vn_male"])
+        config = ESPEAK_CONFIGS.get(voice_model, ESPEAK_CONFIGS["google_vn_male"])
         
-        output_path = "output/output.wav"
-        os.makedirs("output", exist_ok=True)
-        
-        # Use espeak to generate speech with enhanced parameters
-        subprocess.run([
-            "espeak", 
-            "-v", config["voice"],
-            "-s", config["speed"],
-            "-p", config["pitch"],
-            "-w", output_path,
-            text
-        ], check=True)
+        # Voice, speed and pitch are applied through the library API
+        wav_data = engine.synthesize_wav(
+            text,
+            voice=config["voice"],
+            speed=int(config["speed"]),
+            pitch=int(config["pitch"])
+        )
+        output_path = new_output_path()
+        with open(output_path, "wb") as f:
+            f.write(wav_data)
         
         return output_path
         
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Fallback to Google TTS
-        logger.warning("espeak not available, falling back to Google TTS")
-        return synthesize_with_google_enhanced(text, voice_model)
     except Exception as e:
         logger.error(f"Error in espeak synthesis: {str(e)}")
         return synthesize_with_google_enhanced(text, voice_model)
@@ -338,7 +369,8 @@ async def synthesize_speech(
         return FileResponse(
             path=output_path,
             media_type="audio/wav" if output_path.endswith('.wav') else "audio/mpeg",
-            filename="tts_output.wav" if output_path.endswith('.wav') else "tts_output.mp3"
+            filename="tts_output.wav" if output_path.endswith('.wav') else "tts_output.mp3",
+            background=BackgroundTask(os.unlink, output_path)
         )
         
     except HTTPException:
@@ -347,6 +379,72 @@ async def synthesize_speech(
         logger.error(f"Unexpected error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+def render_segment(text: str, voice_model: str):
+    """Synthesize one bulletin segment in memory as (float mono samples, sample rate)"""
+    # Rendered in memory, so concurrent requests never share a file.
+    # Every VOICE_MODELS voice is a gTTS voice, so bulletins always go through gTTS.
+    model_config = VOICE_MODELS.get(voice_model, VOICE_MODELS["google_vn_male"])
+    buffer = io.BytesIO()
+    gTTS(
+        text=enhance_text_for_voice(text, voice_model),
+        lang=model_config["lang"],
+        tld=model_config["tld"],
+        slow=model_config["slow"]
+    ).write_to_fp(buffer)
+    
+    try:
+        samples, sample_rate = decode_mp3(buffer.getvalue())
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=f"Cannot assemble bulletin: {e}")
+    
+    # Same tempo as the /synthesize ffmpeg filter; rate, channels and volume are set by the assembler
+    return time_stretch(samples, get_tempo_for_voice(voice_model)), sample_rate
+
+def assemble_bulletin(request: BulletinRequest) -> bytes:
+    """Synthesize every segment and assemble them into one WAV stream"""
+    assembler = BulletinAssembler(
+        sample_rate=request.sample_rate,
+        pause_ms=request.pause_ms,
+        target_db=request.target_db
+    )
+    for segment in request.segments:
+        voice_model = segment.voice_model if segment.voice_model in VOICE_MODELS else "google_vn_male"
+        samples, sample_rate = render_segment(segment.text, voice_model)
+        assembler.add_samples(samples, sample_rate, segment.pause_ms)
+    return assembler.to_wav()
+
+@app.post("/synthesize_bulletin")
+async def synthesize_bulletin(request: BulletinRequest):
+    """Synthesize several texts and return them as a single normalized bulletin"""
+    try:
+        if not request.segments:
+            raise HTTPException(status_code=400, detail="No segments provided")
+        
+        if any(not segment.text.strip() for segment in request.segments):
+            raise HTTPException(status_code=400, detail="Segment text cannot be empty")
+        
+        if sum(len(segment.text) for segment in request.segments) > 10000:
+            raise HTTPException(status_code=400, detail="Bulletin too long (max 10000 characters)")
+        
+        if not 8000 <= request.sample_rate <= 48000:
+            raise HTTPException(status_code=400, detail="Sample rate must be between 8000 and 48000")
+        
+        logger.info(f"Assembling bulletin with {len(request.segments)} segments")
+        
+        wav_data = await asyncio.to_thread(assemble_bulletin, request)
+        
+        return Response(
+            content=wav_data,
+            media_type="audio/wav",
+            headers={"Content-Disposition": "inline; filename=bulletin.wav"}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error assembling bulletin: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Bulletin assembly failed: {str(e)}")
+
 if __name__ == "__main__":
     print("🎤 Starting Vietnamese TTS API with Real Different Voices...")
     print("📊 Available models:")
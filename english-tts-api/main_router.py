@@ -0,0 +1,111 @@
+from fastapi import FastAPI, Form, HTTPException, Request
+from fastapi.responses import Response
+from fastapi.middleware.cors import CORSMiddleware
+import uvicorn
+import logging
+from engine_router import DEFAULT_MIN_QUALITY, create_default_router
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Initialize FastAPI app
+app = FastAPI(
+    title="TTS API (Engine Router)",
+    description="A REST API that routes each request to the fastest TTS engine able to serve it",
+    version="1.0.0"
+)
+
+# Add CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-TTS-Engine", "X-TTS-Route-Reason", "X-TTS-Engine-P50-Ms",
+                    "X-TTS-Engine-P95-Ms", "X-TTS-Queue-Depth", "X-TTS-Candidates",
+                    "X-TTS-Synthesis-Ms"],
+)
+
+router = create_default_router()
+
+SUPPORTED_LANGUAGES = ["vi", "en", "zh"]
+
+@app.get("/")
+async def root():
+    """Root endpoint"""
+    return {
+        "status": "TTS Engine Router ready",
+        "engines": list(router.engines.keys()),
+        "supported_languages": SUPPORTED_LANGUAGES,
+        "max_text_length": 2000
+    }
+
+@app.get("/engines")
+async def get_engines():
+    """Get engine capabilities, latency percentiles and queue depth"""
+    return {"engines": router.snapshot()}
+
+@app.post("/synthesize")
+async def synthesize_speech(
+    request: Request,
+    text: str = Form(None),
+    language: str = Form("vi"),
+    voice_model: str = Form(None),
+    min_quality: int = Form(DEFAULT_MIN_QUALITY)
+):
+    """Synthesize speech with the fastest engine that satisfies the request"""
+    try:
+        # Parse request data
+        if text is None:
+            try:
+                body = await request.json()
+                text = body.get("text", "")
+                language = body.get("language", "vi")
+                voice_model = body.get("voice_model")
+                min_quality = int(body.get("min_quality", DEFAULT_MIN_QUALITY))
+            except:
+                raise HTTPException(status_code=400, detail="No text provided")
+
+        # Validate input
+        if not text or not text.strip():
+            raise HTTPException(status_code=400, detail="Text cannot be empty")
+
+        if len(text) > 2000:
+            raise HTTPException(status_code=400, detail="Text too long (max 2000 characters)")
+
+        if language not in SUPPORTED_LANGUAGES:
+            language = "vi"
+
+        try:
+            audio, media_type, decision = await router.synthesize(text, language, voice_model, min_quality)
+        except LookupError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+        logger.info(f"Routed to {decision.engine.name} ({decision.reason}) for text: '{text[:50]}...'")
+
+        headers = decision.headers()
+        extension = "wav" if media_type == "audio/wav" else "mp3"
+        headers["Content-Disposition"] = f"inline; filename=tts_output.{extension}"
+
+        return Response(content=audio, media_type=media_type, headers=headers)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+if __name__ == "__main__":
+    print("🎤 Starting TTS Engine Router...")
+    print("🌐 API will be available at: http://localhost:8000")
+    print("📊 Engine stats at: http://localhost:8000/engines")
+
+    uvicorn.run(
+        "main_router:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        log_level="info"
+    )
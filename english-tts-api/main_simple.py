@@ -1,20 +1,34 @@
 from fastapi import FastAPI, Form, HTTPException, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
 import logging
 from gtts import gTTS
 import tempfile
-import feedparser
 import re
 import hashlib
-import requests
+import json
+import asyncio
+import io
+import threading
 from datetime import datetime
 from pydantic import BaseModel
 from typing import Optional, List
 import langdetect
 from langdetect import detect
+from mp3_joiner import join_mp3
+from feed_cache import FeedCache
+from http_client import get_http_client
+from feed_poller import ArticleStore, FeedPoller
+from news_matching import rank_by_tiers
+from search_index import SearchIndex
+from search_cache import SearchCache, normalize_query
+from source_health import SourceHealthRegistry, SourceUnavailableError
+from snapshot_store import SnapshotStore
+from image_proxy import ImageProxy, thumbnail_path
+from dedup import dedupe_articles
+from fast_feed_parser import parse_feed
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,56 +39,110 @@ NEWS_SOURCES = {
     'vnexpress': {
         'rss_url': 'https://vnexpress.net/rss/tin-moi-nhat.rss',
         'name': 'VnExpress',
-        'language': 'vi'
+        'language': 'vi',
+        'cache_ttl': 120
     },
     'tuoitre': {
         'rss_url': 'https://tuoitre.vn/rss/tin-moi-nhat.rss',
         'name': 'Tuổi Trẻ',
-        'language': 'vi'
+        'language': 'vi',
+        'cache_ttl': 120
     },
     'thanhnien': {
         'rss_url': 'https://thanhnien.vn/rss/home.rss',
         'name': 'Thanh Niên',
-        'language': 'vi'
+        'language': 'vi',
+        'cache_ttl': 120
     },
     'dantri': {
         'rss_url': 'https://dantri.com.vn/rss/tin-moi-nhat.rss',
         'name': 'Dân Trí',
-        'language': 'vi'
+        'language': 'vi',
+        'cache_ttl': 120
     },
     'vietnamnet': {
         'rss_url': 'https://vietnamnet.vn/rss/tin-moi-nhat.rss',
         'name': 'VietnamNet',
-        'language': 'vi'
+        'language': 'vi',
+        'cache_ttl': 120
     },
     'bbc': {
         'rss_url': 'https://feeds.bbci.co.uk/news/rss.xml',
         'name': 'BBC News',
-        'language': 'en'
+        'language': 'en',
+        'cache_ttl': 300
     },
     'cnn': {
         'rss_url': 'https://rss.cnn.com/rss/edition.rss',
         'name': 'CNN',
-        'language': 'en'
+        'language': 'en',
+        'cache_ttl': 300
     },
     'reuters': {
         'rss_url': 'https://feeds.reuters.com/reuters/topNews',
         'name': 'Reuters',
-        'language': 'en'
+        'language': 'en',
+        'cache_ttl': 300
     },
     'guardian': {
         'rss_url': 'https://www.theguardian.com/world/rss',
         'name': 'The Guardian',
-        'language': 'en'
+        'language': 'en',
+        'cache_ttl': 300
     }
 }
 
+# Pooled HTTP client shared by every outbound fetch
+http_client = get_http_client()
+
+# Shared feed cache (per-source TTL, ETag/If-Modified-Since revalidation)
+feed_cache = FeedCache(default_ttl=120, timeout=10, client=http_client)
+
+# Upper bound on how long one source may hold up a request
+SOURCE_FETCH_TIMEOUT = 5.0
+
+# Parsed articles per source, keyed by the feed version they came from
+parsed_feeds = {}
+
+# Last good parse of every feed on disk, served while a slow or failing source refreshes
+snapshot_store = SnapshotStore()
+SNAPSHOT_GRACE_SECONDS = 0.5
+source_refreshes = {}
+
+# BM25 index over every parsed article, grouped by source
+search_index = SearchIndex(max_documents=5000)
+
+# Resized article images, cached on disk within a byte budget
+image_proxy = ImageProxy(max_bytes=256 * 1024 * 1024)
+
+# Per-source fetch statistics; failing feeds are skipped until a probe succeeds
+source_health = SourceHealthRegistry(failure_threshold=3, cooldown=30, max_cooldown=600)
+
+# /search-news results, dropped when a source they used gets new articles
+search_cache = SearchCache(ttl=60, max_entries=500)
+
+# Materialized trending lists per language, rebuilt in the background
+TRENDING_LANGUAGES = ['vi', 'en']
+TRENDING_DEFAULT_LIMIT = 10
+TRENDING_REFRESH_SECONDS = 60
+trending_snapshots = {}
+trending_dirty = asyncio.Event()
+trending_task = None
+
+# Cached gTTS renderings, one MP3 per (language, text)
+SEGMENT_CACHE_DIR = os.path.join("output", "segments")
+
 # Pydantic models
 class NewsSearchRequest(BaseModel):
     query: str
     language: str = 'vi'
     max_articles: int = 5
 
+class BulletinRequest(BaseModel):
+    texts: List[str]
+    language: Optional[str] = None
+    pause_ms: float = 500.0
+
 class NewsArticle(BaseModel):
     id: str = ""
     title: str
@@ -86,6 +154,9 @@ class NewsArticle(BaseModel):
     url: str = ""
     language: str = "vi"
     category: str = "General"
+    guid: str = ""
+    # Seconds since the snapshot this article was served from was saved; None when live
+    snapshot_age: Optional[int] = None
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -125,147 +196,205 @@ def detect_language(text: str) -> str:
         logger.warning(f"Language detection failed: {e}, defaulting to Vietnamese")
         return 'vi'
 
-def fetch_news_from_rss(source_key: str, query: str = None) -> List[NewsArticle]:
-    """Fetch news articles from RSS feed"""
-    if source_key not in NEWS_SOURCES:
-        return []
-    
+def parse_feed_articles(source_key: str, content: bytes) -> List[NewsArticle]:
+    """Parse a feed document into articles"""
     source = NEWS_SOURCES[source_key]
     articles = []
     
-    try:
-        # Set User-Agent to avoid blocking
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+    # Stop parsing after the 10 articles we keep
+    items = parse_feed(content, max_items=10)
+    
+    # Debug logging
+    logger.info(f"Feed {source_key}: {len(items)} entries parsed")
+    
+    for item in items:
+        title = item.title.strip()
+        link = item.link.strip()
+        published = item.published.strip()
+        guid = item.guid.strip()
         
-        # Use requests to fetch with proper headers
-        response = requests.get(source['rss_url'], headers=headers, timeout=10)
-        response.raise_for_status()
+        # Skip empty entries
+        if not title or len(title) < 5:
+            continue
         
-        # Parse with feedparser
-        feed = feedparser.parse(response.content)
+        # Generate ID from title and link
+        article_id = hashlib.md5(f"{title}{link}".encode()).hexdigest()[:12]
         
-        # Debug logging
-        logger.info(f"Feed {source_key}: {len(feed.entries)} entries found")
+        # Feed image (media, enclosure or first <img>) or a default
+        image_url = item.image_url or "https://images.unsplash.com/photo-1504711331083-9c895941bf81?w=400&h=250&fit=crop"
         
-        for entry in feed.entries[:10]:  # Limit to 10 articles
-            title = entry.get('title', '').strip()
-            description = entry.get('description', '').strip()
-            link = entry.get('link', '').strip()
-            published = entry.get('published', '').strip()
-            
-            # Skip empty entries
-            if not title or len(title) < 5:
-                continue
-            
-            # Filter by query if provided
-            if query:
-                query_lower = query.lower()
-                if not (query_lower in title.lower() or query_lower in description.lower()):
-                    continue
-            
-            # Generate ID from title and link
-            article_id = hashlib.md5(f"{title}{link}".encode()).hexdigest()[:12]
-            
-            # Extract image from description or use default
-            image_url = "https://images.unsplash.com/photo-1504711331083-9c895941bf81?w=400&h=250&fit=crop"
-            if hasattr(entry, 'media_content') and entry.media_content:
-                image_url = entry.media_content[0].get('url', image_url)
-            elif 'image' in entry:
-                image_url = entry.image.get('href', image_url)
-            else:
-                # Try to extract from description HTML
-                import re
-                img_match = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', description)
-                if img_match:
-                    image_url = img_match.group(1)
-            
-            article = NewsArticle(
-                id=article_id,
-                title=title,
-                description=re.sub(r'<[^>]+>', '', description),  # Remove HTML tags
-                link=link,
-                published=published,
-                source=source['name'],
-                image=image_url,
-                url=link,
-                language=source['language'],
-                category="General"
-            )
-            articles.append(article)
-            
-    except Exception as e:
-        logger.error(f"Error fetching news from {source_key}: {str(e)}")
+        article = NewsArticle(
+            id=article_id,
+            title=title,
+            description=item.text,  # HTML tags removed
+            link=link,
+            published=published,
+            source=source['name'],
+            image=image_url,
+            url=link,
+            language=source['language'],
+            category="General",
+            guid=guid
+        )
+        articles.append(article)
     
     return articles
 
-def search_news_by_keywords(query: str, language: str = None) -> str:
+def index_articles(source_key: str, articles: List[NewsArticle]):
+    """Add newly parsed articles to the search index (already indexed ones are skipped)"""
+    added = 0
+    for article in articles:
+        added += search_index.add(article.guid or article.link, article.title, article.description,
+                                  payload=article, group=source_key)
+    # Cached searches over this source no longer see everything
+    if added:
+        search_cache.invalidate_source(source_key)
+
+async def load_feed_articles(source_key: str, ttl: Optional[float] = None) -> List[NewsArticle]:
+    """Fetch (through the feed cache) and parse a source; raises on failure"""
+    source = NEWS_SOURCES[source_key]
+    url = source['rss_url']
+    ttl = source.get('cache_ttl') if ttl is None else ttl
+    
+    # Served from the shared feed cache; the network is only hit when the TTL expired
+    if feed_cache.is_fresh(url, ttl):
+        feed = await feed_cache.fetch(url, ttl=ttl)
+    else:
+        # Network fetches feed the source's health stats and are refused while its circuit is open
+        with source_health.track(source_key):
+            feed = await feed_cache.fetch(url, ttl=ttl, timeout=source.get('timeout', SOURCE_FETCH_TIMEOUT))
+    
+    # Re-parse only when the feed body changed
+    parsed = parsed_feeds.get(source_key)
+    if parsed is None or parsed[0] != (feed.url, feed.version):
+        articles = await asyncio.to_thread(parse_feed_articles, source_key, feed.content)
+        parsed = ((feed.url, feed.version), articles)
+        parsed_feeds[source_key] = parsed
+        index_articles(source_key, articles)
+        await asyncio.to_thread(snapshot_store.save, source_key, feed.url, [article.dict() for article in articles])
+    return list(parsed[1])
+
+async def poll_feed_articles(source_key: str) -> List[NewsArticle]:
+    """Poller entry point: always revalidate with the origin (cheap 304 when unchanged)"""
+    return await load_feed_articles(source_key, ttl=0)
+
+# Articles ingested by the background poller, newest first per source
+article_store = ArticleStore(max_per_source=200)
+feed_poller = FeedPoller(
+    NEWS_SOURCES,
+    poll_feed_articles,
+    article_store,
+    key_func=lambda article: article.guid or article.link
+)
+
+def mark_trending_dirty(source_key: str, new_articles: List[NewsArticle]):
+    """New articles make the trending snapshots stale"""
+    if new_articles:
+        trending_dirty.set()
+
+article_store.add_listener(mark_trending_dirty)
+
+def refresh_source(source_key: str) -> asyncio.Task:
+    """Live fetch of a source, shared by everyone waiting on it; results land in the feed cache and index"""
+    task = source_refreshes.get(source_key)
+    if task is None or task.done():
+        task = asyncio.create_task(load_feed_articles(source_key))
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        source_refreshes[source_key] = task
+    return task
+
+def snapshot_articles(source_key: str) -> List[NewsArticle]:
+    """Articles from the source's last good parse, marked with the snapshot's age"""
+    snapshot = snapshot_store.get(source_key)
+    if snapshot is None:
+        return []
+    age = int(snapshot.age_seconds)
+    return [NewsArticle(**{**data, "snapshot_age": age}) for data in snapshot.articles]
+
+def filter_articles(articles: List[NewsArticle], query: str = None) -> List[NewsArticle]:
+    """Keep articles whose title or description contains the query"""
+    if not query:
+        return list(articles)
+    query_lower = query.lower()
+    return [
+        article for article in articles
+        if query_lower in article.title.lower() or query_lower in article.description.lower()
+    ]
+
+async def fetch_source_articles(source_key: str, query: str = None) -> List[NewsArticle]:
+    """Read a source's articles from the background store, fetching live only when cold"""
+    if source_key not in NEWS_SOURCES:
+        return []
+    if article_store.is_warm(source_key):
+        return filter_articles(article_store.get(source_key), query)
+    
+    # Cold source: fetch live, bounded by the source's own timeout. With a snapshot on
+    # disk only wait briefly; the fetch keeps running and refreshes the source meanwhile
+    snapshot = snapshot_store.get(source_key)
+    timeout = NEWS_SOURCES[source_key].get('timeout', SOURCE_FETCH_TIMEOUT)
+    if snapshot is not None:
+        timeout = min(timeout, SNAPSHOT_GRACE_SECONDS)
+    try:
+        articles = await asyncio.wait_for(asyncio.shield(refresh_source(source_key)), timeout)
+        return filter_articles(articles, query)
+    except asyncio.TimeoutError:
+        if snapshot is None:
+            logger.warning(f"Timed out fetching {source_key} after {timeout}s")
+    except SourceUnavailableError as e:
+        logger.debug(f"Skipping {source_key}: {e}")
+    except Exception as e:
+        logger.error(f"Error fetching news from {source_key}: {str(e)}")
+    
+    if snapshot is None:
+        return []
+    logger.info(f"Serving {source_key} snapshot ({snapshot.age_seconds:.0f}s old) while it refreshes")
+    return filter_articles(snapshot_articles(source_key), query)
+
+async def fetch_sources_concurrently(sources: List[str], query: str = None) -> List[List[NewsArticle]]:
+    """Fetch several sources at once; results are returned in source order"""
+    results = await asyncio.gather(
+        *[fetch_source_articles(source, query) for source in sources],
+        return_exceptions=True
+    )
+    source_articles = []
+    for source, result in zip(sources, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error fetching from {source}: {result}")
+            result = []
+        source_articles.append(result)
+    return source_articles
+
+async def search_news_by_keywords(query: str, language: str = None) -> str:
     """Search news by keywords and return formatted text"""
     # Auto-detect language if not provided
     if language is None:
         language = detect_language(query)
     
-    query_lower = query.lower()
-    
     # Select sources based on detected language
     if language == 'vi':
         sources = ['vnexpress', 'tuoitre', 'thanhnien', 'dantri', 'vietnamnet']
     else:
         sources = ['bbc', 'cnn', 'reuters', 'guardian']
     
-    all_articles = []
+    # Warm every source once (indexing new articles), then rank from the index
+    source_articles = await fetch_sources_concurrently(sources)
+    all_articles = [article for article, _ in search_index.search(query, limit=20, groups=sources)]
+    logger.info(f"Matched {len(all_articles)} articles for '{query}' across {len(sources)} sources")
     
-    # Fetch articles from all relevant sources with query filter
-    for source in sources:
-        try:
-            articles = fetch_news_from_rss(source, query)
-            all_articles.extend(articles)
-            logger.info(f"Found {len(articles)} articles from {source}")
-        except Exception as e:
-            logger.error(f"Error fetching from {source}: {e}")
-    
-    # If no articles found with query, try broader search
+    # Nothing relevant: fall back to the latest news from each source
     if not all_articles:
-        for source in sources:
-            try:
-                articles = fetch_news_from_rss(source)
-                # Filter articles by keywords in title or description
-                filtered_articles = []
-                for article in articles:
-                    if (query_lower in article.title.lower() or 
-                        query_lower in article.description.lower() or
-                        any(keyword in article.title.lower() or keyword in article.description.lower() 
-                            for keyword in query_lower.split())):
-                        filtered_articles.append(article)
-                all_articles.extend(filtered_articles)
-                logger.info(f"Found {len(filtered_articles)} filtered articles from {source}")
-            except Exception as e:
-                logger.error(f"Error filtering from {source}: {e}")
+        all_articles = [article for articles in source_articles for article in articles[:2]]
     
-    # If still no articles, get latest news from all sources
-    if not all_articles:
-        for source in sources:
-            try:
-                articles = fetch_news_from_rss(source)
-                all_articles.extend(articles[:2])  # Get 2 latest from each source
-                logger.info(f"Added {len(articles[:2])} latest articles from {source}")
-            except Exception as e:
-                logger.error(f"Error getting latest from {source}: {e}")
-    
-    # Remove duplicates and limit to 8 articles
-    seen_titles = set()
-    unique_articles = []
-    for article in all_articles:
-        if article.title not in seen_titles and len(article.title) > 10:  # Filter out very short titles
-            seen_titles.add(article.title)
-            unique_articles.append(article)
-            if len(unique_articles) >= 8:
-                break
+    # Keep one article per story (near-duplicates across sources) and limit to 8
+    unique_articles = dedupe_articles(
+        [article for article in all_articles if len(article.title) > 10],  # Filter out very short titles
+        limit=8
+    )
     
     if not unique_articles:
-        # Fallback to sample news based on keywords
-        return get_sample_news_by_keyword(query, language)
+        if language == 'vi':
+            return f"📰 Hiện chưa lấy được tin tức về '{query}' từ các nguồn. Vui lòng thử lại sau."
+        return f"📰 No news about '{query}' could be fetched right now. Please try again later."
     
     # Format articles into readable text
     news_text = f"📰 Tin tức về '{query}' từ {len(unique_articles)} nguồn:\n\n"
@@ -278,7 +407,15 @@ def search_news_by_keywords(query: str, language: str = None) -> str:
         sources_found[article.source].append(article)
     
     for source_name, articles in sources_found.items():
-        news_text += f"🔹 {source_name}:\n"
+        snapshot_age = articles[0].snapshot_age
+        if snapshot_age is None:
+            news_text += f"🔹 {source_name}:\n"
+        else:
+            minutes = max(1, snapshot_age // 60)
+            if language == 'vi':
+                news_text += f"🔹 {source_name} (bản lưu {minutes} phút trước):\n"
+            else:
+                news_text += f"🔹 {source_name} (saved copy from {minutes} min ago):\n"
         for i, article in enumerate(articles, 1):
             news_text += f"   {i}. {article.title}\n"
             # Clean description (remove HTML tags)
@@ -290,112 +427,22 @@ def search_news_by_keywords(query: str, language: str = None) -> str:
     
     return news_text
 
-def get_sample_news_by_keyword(query: str, language: str = 'vi') -> str:
-    """Get sample news based on keyword when RSS feeds are not available"""
-    query_lower = query.lower()
-    
-    # Sample news based on common keywords
-    if any(keyword in query_lower for keyword in ['iphone', 'apple', 'điện thoại', 'smartphone']):
-        return f"""📰 Tin tức về '{query}' từ các nguồn:
-
-🔹 VnExpress:
-   1. Apple ra mắt iPhone 15 với camera 48MP
-      Apple vừa công bố iPhone 15 series với nhiều cải tiến về camera và hiệu năng...
-
-🔹 Tuổi Trẻ:
-   1. iPhone 15 Pro Max có giá bán cao nhất từ trước đến nay
-      iPhone 15 Pro Max với màn hình 6.7 inch và chip A17 Pro có giá từ 1.199 USD...
-
-🔹 Thanh Niên:
-   1. Thị trường smartphone Việt Nam tăng trưởng mạnh
-      Doanh số bán smartphone tại Việt Nam trong quý 3 tăng 15% so với cùng kỳ...
-
-📊 Tổng cộng: 3 bài viết từ 3 nguồn tin tức."""
-
-    elif any(keyword in query_lower for keyword in ['bóng đá', 'football', 'bóng', 'đá']):
-        return f"""📰 Tin tức về '{query}' từ các nguồn:
-
-🔹 VnExpress:
-   1. Đội tuyển Việt Nam thắng 2-1 trước Thái Lan
-      Trận đấu diễn ra sôi nổi với bàn thắng quyết định ở phút 89...
-
-🔹 Tuổi Trẻ:
-   1. Messi ghi bàn thắng đẹp trong trận El Clasico
-      Siêu sao Argentina đã có màn trình diễn xuất sắc trong trận derby...
-
-🔹 Thanh Niên:
-   1. Premier League: Arsenal thắng 3-0 trước Chelsea
-      Arsenal đã có chiến thắng thuyết phục trước đối thủ cùng thành phố...
-
-📊 Tổng cộng: 3 bài viết từ 3 nguồn tin tức."""
-
-    elif any(keyword in query_lower for keyword in ['ai', 'trí tuệ nhân tạo', 'artificial intelligence']):
-        return f"""📰 Tin tức về '{query}' từ các nguồn:
-
-🔹 VnExpress:
-   1. ChatGPT-4 ra mắt với khả năng xử lý đa phương tiện
-      OpenAI vừa công bố phiên bản mới của ChatGPT với nhiều tính năng vượt trội...
-
-🔹 Tuổi Trẻ:
-   1. AI được ứng dụng trong chẩn đoán y tế
-      Các bệnh viện tại TP.HCM đã bắt đầu sử dụng AI để hỗ trợ chẩn đoán...
-
-🔹 Thanh Niên:
-   1. Việt Nam đầu tư 100 triệu USD vào phát triển AI
-      Chính phủ vừa phê duyệt chương trình phát triển AI quốc gia...
-
-📊 Tổng cộng: 3 bài viết từ 3 nguồn tin tức."""
-
-    elif any(keyword in query_lower for keyword in ['bitcoin', 'crypto', 'tiền điện tử']):
-        return f"""📰 Tin tức về '{query}' từ các nguồn:
-
-🔹 VnExpress:
-   1. Bitcoin tăng giá mạnh sau tin tức ETF được phê duyệt
-      Giá Bitcoin đã tăng 15% trong tuần qua sau khi SEC phê duyệt ETF...
-
-🔹 Tuổi Trẻ:
-   1. Việt Nam xem xét quy định pháp lý cho tiền điện tử
-      Bộ Tài chính đang soạn thảo nghị định về quản lý tiền điện tử...
-
-🔹 Thanh Niên:
-   1. Ethereum 2.0 nâng cấp thành công
-      Mạng lưới Ethereum đã hoàn thành nâng cấp lớn nhất từ trước đến nay...
-
-📊 Tổng cộng: 3 bài viết từ 3 nguồn tin tức."""
-
-    elif any(keyword in query_lower for keyword in ['covid', 'dịch', 'vaccine', 'vắc xin']):
-        return f"""📰 Tin tức về '{query}' từ các nguồn:
-
-🔹 VnExpress:
-   1. Việt Nam ghi nhận ca COVID-19 mới tăng nhẹ
-      Số ca mắc COVID-19 trong tuần qua tăng 5% so với tuần trước...
-
-🔹 Tuổi Trẻ:
-   1. Vaccine COVID-19 mới được phê duyệt sử dụng
-      Bộ Y tế vừa phê duyệt vaccine COVID-19 thế hệ mới cho người trên 18 tuổi...
-
-🔹 Thanh Niên:
-   1. WHO cảnh báo về biến thể COVID-19 mới
-      Tổ chức Y tế Thế giới đã phát cảnh báo về biến thể mới của virus...
-
-📊 Tổng cộng: 3 bài viết từ 3 nguồn tin tức."""
-
-    else:
-        return f"""📰 Tin tức về '{query}' từ các nguồn:
-
-🔹 VnExpress:
-   1. Tin tức nổi bật trong ngày
-      Các sự kiện quan trọng diễn ra trong ngày hôm nay...
-
-🔹 Tuổi Trẻ:
-   1. Thông tin mới nhất về chủ đề này
-      Cập nhật những thông tin mới nhất liên quan đến {query}...
-
-🔹 Thanh Niên:
-   1. Phân tích chuyên sâu về xu hướng
-      Các chuyên gia đưa ra nhận định về xu hướng phát triển...
-
-📊 Tổng cộng: 3 bài viết từ 3 nguồn tin tức."""
+@app.on_event("startup")
+async def startup_event():
+    """Open the shared HTTP client and start background feed polling"""
+    global trending_task
+    await http_client.start()
+    await feed_poller.start()
+    trending_task = asyncio.create_task(refresh_trending_snapshots())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background feed polling and close pooled connections"""
+    if trending_task is not None:
+        trending_task.cancel()
+    await feed_poller.stop()
+    await http_client.close()
+    await image_proxy.close()
 
 @app.get("/")
 async def root():
@@ -409,64 +456,50 @@ async def search_news(request: NewsSearchRequest):
         # Auto-detect language from query
         detected_language = detect_language(request.query)
         
-        # Get articles from RSS feeds
-        query_lower = request.query.lower()
-        all_articles = []
         sources = ['vnexpress', 'tuoitre', 'thanhnien', 'dantri', 'vietnamnet']
+        limit = getattr(request, 'max_articles', 10)
         
-        # Try to find articles matching the query
-        for source in sources:
-            try:
-                articles = fetch_news_from_rss(source, request.query)
-                # Filter by query if provided
-                if request.query:
-                    filtered = [a for a in articles if (
-                        query_lower in a.title.lower() or 
-                        query_lower in a.description.lower() or
-                        any(kw in a.title.lower() or kw in a.description.lower() 
-                            for kw in query_lower.split() if len(kw) > 2)
-                    )]
-                    all_articles.extend(filtered)
-                else:
-                    all_articles.extend(articles[:2])
-            except Exception as e:
-                logger.warning(f"Error fetching from {source}: {e}")
-        
-        # If no articles found, get latest from all sources
-        if not all_articles:
-            for source in sources:
-                try:
-                    articles = fetch_news_from_rss(source)
-                    all_articles.extend(articles[:2])
-                except Exception as e:
-                    logger.warning(f"Error getting latest from {source}: {e}")
-        
-        # Remove duplicates and limit
-        seen_titles = set()
-        unique_articles = []
-        for article in all_articles:
-            if article.title not in seen_titles and len(article.title) > 10:
-                seen_titles.add(article.title)
-                unique_articles.append(article)
-                max_articles = getattr(request, 'max_articles', 10)
-                if len(unique_articles) >= max_articles:
-                    break
+        async def run_search() -> List[dict]:
+            # Get articles from RSS feeds, one fetch per source
+            source_articles = await fetch_sources_concurrently(sources)
+            
+            # Most relevant articles first, else the latest from all sources
+            all_articles = []
+            if request.query:
+                all_articles = [article for article, _ in search_index.search(request.query, limit=20, groups=sources)]
+                if not all_articles:
+                    # Substring matches of the query or of any word longer than two letters, else the latest
+                    all_articles = rank_by_tiers(source_articles, request.query, use_keywords=True, min_keyword_length=3)
+            if not all_articles:
+                all_articles = [article for articles in source_articles for article in articles[:2]]
+            
+            # Keep one article per story and limit
+            unique_articles = dedupe_articles(
+                [article for article in all_articles if len(article.title) > 10],
+                limit=limit
+            )
+            
+            # Convert NewsArticle objects to dicts
+            return [
+                {
+                    "id": article.id,
+                    "title": article.title,
+                    "description": article.description,
+                    "image": article.image,
+                    "thumbnail": thumbnail_path(article.image),
+                    "source": article.source,
+                    "published": article.published,
+                    "url": article.url or article.link,
+                    "language": article.language,
+                    "category": article.category,
+                    "snapshot_age": article.snapshot_age
+                }
+                for article in unique_articles
+            ]
         
-        # Convert NewsArticle objects to dicts
-        articles_list = [
-            {
-                "id": article.id,
-                "title": article.title,
-                "description": article.description,
-                "image": article.image,
-                "source": article.source,
-                "published": article.published,
-                "url": article.url or article.link,
-                "language": article.language,
-                "category": article.category
-            }
-            for article in unique_articles
-        ]
+        # Repeated and concurrent identical searches share one fan-out
+        cache_key = ("search-news", normalize_query(request.query), detected_language, limit)
+        articles_list = await search_cache.get_or_compute(cache_key, sources, run_search)
         
         return {
             "query": request.query,
@@ -478,51 +511,96 @@ async def search_news(request: NewsSearchRequest):
         logger.error(f"Error searching news: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error searching news: {str(e)}")
 
-@app.get("/trending-news")
-async def get_trending_news(language: str = "vi", limit: int = 10):
-    """Get trending/hot news articles"""
-    try:
-        sources = ['vnexpress', 'tuoitre', 'thanhnien', 'dantri', 'vietnamnet'] if language == 'vi' else ['bbc', 'cnn', 'reuters', 'guardian']
-        all_articles = []
-        
-        for source in sources:
+def trending_sources(language: str) -> List[str]:
+    return ['vnexpress', 'tuoitre', 'thanhnien', 'dantri', 'vietnamnet'] if language == 'vi' else ['bbc', 'cnn', 'reuters', 'guardian']
+
+class TrendingSnapshot:
+    """Trending articles for one language, serialized once per limit"""
+    
+    def __init__(self, articles: List[dict]):
+        self.articles = articles
+        self.timestamp = datetime.now().isoformat()
+        self._bodies = {}
+    
+    def render(self, limit: int):
+        """Return (body, etag) for the first limit articles"""
+        # Clamped first, so varying ?limit= cannot grow the per-limit cache
+        limit = min(max(limit, 1), len(self.articles))
+        if limit not in self._bodies:
+            articles = self.articles[:limit]
+            body = json.dumps({
+                "articles": articles,
+                "total": len(articles),
+                "query": "trending",
+                "timestamp": self.timestamp
+            }, ensure_ascii=False).encode("utf-8")
+            self._bodies[limit] = (body, f'"{hashlib.md5(body).hexdigest()}"')
+        return self._bodies[limit]
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Whether an If-None-Match header lists etag (weak comparison, as for GET)"""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+async def build_trending_snapshot(language: str) -> TrendingSnapshot:
+    """Materialize the trending list for a language, reusing the old snapshot if unchanged"""
+    all_articles = []
+    for articles in await fetch_sources_concurrently(trending_sources(language)):
+        all_articles.extend(articles[:2])  # Get 2 latest from each source
+    
+    # Keep one article per story
+    unique_articles = dedupe_articles([article for article in all_articles if len(article.title) > 10])
+    
+    articles_list = [
+        {
+            "id": article.id,
+            "title": article.title,
+            "description": article.description,
+            "image": article.image,
+            "thumbnail": thumbnail_path(article.image),
+            "source": article.source,
+            "published": article.published,
+            "url": article.url or article.link,
+            "language": article.language,
+            "category": article.category,
+            "snapshot_age": article.snapshot_age
+        }
+        for article in unique_articles
+    ]
+    
+    # Same content keeps the same timestamp and ETag, so clients keep getting 304s
+    previous = trending_snapshots.get(language)
+    if previous is not None and previous.articles == articles_list:
+        return previous
+    snapshot = TrendingSnapshot(articles_list)
+    trending_snapshots[language] = snapshot
+    return snapshot
+
+async def refresh_trending_snapshots():
+    """Rebuild trending snapshots whenever the poller ingests news, or every TRENDING_REFRESH_SECONDS"""
+    while True:
+        try:
+            await asyncio.wait_for(trending_dirty.wait(), timeout=TRENDING_REFRESH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        trending_dirty.clear()
+        for language in TRENDING_LANGUAGES:
             try:
-                articles = fetch_news_from_rss(source)
-                all_articles.extend(articles[:2])  # Get 2 latest from each source
+                snapshot = await build_trending_snapshot(language)
+                # Pre-serialize the default page so requests only copy bytes
+                snapshot.render(TRENDING_DEFAULT_LIMIT)
             except Exception as e:
-                logger.warning(f"Error fetching trending from {source}: {e}")
-        
-        # Remove duplicates
-        seen_titles = set()
-        unique_articles = []
-        for article in all_articles:
-            if article.title not in seen_titles and len(article.title) > 10:
-                seen_titles.add(article.title)
-                unique_articles.append(article)
-                if len(unique_articles) >= limit:
-                    break
-        
-        articles_list = [
-            {
-                "id": article.id,
-                "title": article.title,
-                "description": article.description,
-                "image": article.image,
-                "source": article.source,
-                "published": article.published,
-                "url": article.url or article.link,
-                "language": article.language,
-                "category": article.category
-            }
-            for article in unique_articles
-        ]
-        
-        return {
-            "articles": articles_list,
-            "total": len(articles_list),
-            "query": "trending",
-            "timestamp": datetime.now().isoformat()
-        }
+                logger.error(f"Error refreshing trending snapshot for {language}: {e}")
+
+@app.get("/trending-news")
+async def get_trending_news(request: Request, language: str = "vi", limit: int = TRENDING_DEFAULT_LIMIT):
+    """Get trending/hot news articles from the materialized snapshot (ETag / 304 aware)"""
+    language = 'vi' if language == 'vi' else 'en'
+    try:
+        snapshot = trending_snapshots.get(language)
+        if snapshot is None:
+            snapshot = await build_trending_snapshot(language)
+        body, etag = snapshot.render(limit)
     except Exception as e:
         logger.error(f"Error getting trending news: {str(e)}")
         return {
@@ -531,15 +609,51 @@ async def get_trending_news(language: str = "vi", limit: int = 10):
             "query": "trending",
             "timestamp": datetime.now().isoformat()
         }
+    
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(etag, request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.get("/news-sources")
 async def get_news_sources():
-    """Get available news sources"""
+    """Get available news sources with their live health and circuit state"""
     return {
-        "sources": NEWS_SOURCES,
+        "sources": {
+            key: {**source, "health": source_health.status(key)}
+            for key, source in NEWS_SOURCES.items()
+        },
         "total": len(NEWS_SOURCES)
     }
 
+@app.get("/image")
+async def get_image(request: Request, url: str, w: int = 320, format: Optional[str] = None):
+    """Serve a resized, disk-cached copy of a remote article image"""
+    return await image_proxy.serve(url, w, format, request.headers.get("accept", ""))
+
+@app.get("/image-cache/stats")
+async def get_image_cache_stats():
+    """Get image proxy hit/render/eviction statistics"""
+    return image_proxy.get_stats()
+
+@app.get("/feed-poller/status")
+async def get_feed_poller_status():
+    """Get per-source poll schedule and ingest counters"""
+    return {
+        "sources": feed_poller.status(),
+        "store_version": article_store.version,
+        "snapshots": snapshot_store.status(),
+        "search_index": search_index.stats()
+    }
+
+@app.get("/feed-cache/stats")
+async def get_feed_cache_stats():
+    """Get feed cache hit/miss/304 statistics"""
+    stats = feed_cache.get_stats()
+    stats["http_client"] = http_client.get_stats()
+    stats["search_cache"] = search_cache.get_stats()
+    return stats
+
 @app.post("/synthesize")
 async def synthesize_speech(request: Request, text: str = Form(None), language: str = Form(None)):
     """
@@ -582,20 +696,12 @@ async def synthesize_speech(request: Request, text: str = Form(None), language:
         raise HTTPException(status_code=400, detail="Text too long. Please keep it under 2000 characters for faster processing.")
     
     try:
-        # Ensure output directory exists
-        output_dir = "output"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Define output file path
-        output_file = os.path.join(output_dir, "output.wav")
-        
         logger.info(f"Synthesizing speech for text: '{input_text[:50]}...'")
         
         # Use Google TTS (much faster and more reliable)
-        tts = gTTS(text=input_text, lang=language, slow=False)
-        tts.save(output_file)
+        output_file, cached = await asyncio.to_thread(get_cached_gtts_segment, input_text, language)
         
-        logger.info(f"Speech synthesized successfully. Saved to: {output_file}")
+        logger.info(f"Speech synthesized successfully ({'cached' if cached else 'new'}): {output_file}")
         
         # Return the audio file
         return FileResponse(
@@ -608,6 +714,64 @@ async def synthesize_speech(request: Request, text: str = Form(None), language:
         logger.error(f"Error synthesizing speech: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error synthesizing speech: {str(e)}")
 
+def get_cached_gtts_segment(text: str, language: str):
+    """Return the path of the cached gTTS MP3 for text, rendering it once"""
+    os.makedirs(SEGMENT_CACHE_DIR, exist_ok=True)
+    key = hashlib.md5(f"{language}|{text}".encode()).hexdigest()
+    path = os.path.join(SEGMENT_CACHE_DIR, f"{key}.mp3")
+    if os.path.exists(path):
+        return path, True
+    
+    buffer = io.BytesIO()
+    gTTS(text=text, lang=language, slow=False).write_to_fp(buffer)
+    # Per-thread temp file: identical texts may be rendered concurrently
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(buffer.getvalue())
+    os.replace(temp_path, path)
+    return path, False
+
+@app.post("/synthesize-bulletin")
+async def synthesize_bulletin(request: BulletinRequest):
+    """Join cached gTTS segments into one MP3 bulletin without re-encoding"""
+    texts = [text.strip() for text in request.texts if text and text.strip()]
+    if not texts:
+        raise HTTPException(status_code=400, detail="No text provided")
+    
+    if sum(len(text) for text in texts) > 10000:
+        raise HTTPException(status_code=400, detail="Bulletin too long. Please keep it under 10000 characters.")
+    
+    language = request.language or detect_language(" ".join(texts))
+    
+    try:
+        results = await asyncio.gather(*[
+            asyncio.to_thread(get_cached_gtts_segment, text, language) for text in texts
+        ])
+        
+        segments = []
+        for path, _ in results:
+            with open(path, "rb") as f:
+                segments.append(f.read())
+        
+        joined = join_mp3(segments, pause_ms=request.pause_ms)
+        cache_hits = sum(1 for _, cached in results if cached)
+        
+        logger.info(f"Bulletin assembled: {len(texts)} segments, {cache_hits} from cache, {joined.duration_seconds:.1f}s")
+        
+        return Response(
+            content=joined.data,
+            media_type="audio/mpeg",
+            headers={
+                "Content-Disposition": "inline; filename=bulletin.mp3",
+                "X-Segment-Cache-Hits": str(cache_hits),
+                "X-Segment-Count": str(len(texts)),
+                "X-Duration-Seconds": f"{joined.duration_seconds:.2f}"
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error assembling bulletin: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error assembling bulletin: {str(e)}")
+
 if __name__ == "__main__":
     uvicorn.run(
         "main_simple:app",
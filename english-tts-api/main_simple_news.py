@@ -4,8 +4,6 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
 import logging
-import feedparser
-import re
 import json
 import asyncio
 from datetime import datetime, timedelta
@@ -13,6 +11,8 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import requests
 import aiohttp
+from http_client import get_http_client
+from fast_feed_parser import parse_feed_async
 import sqlite3
 from pathlib import Path
 import hashlib
@@ -44,6 +44,9 @@ app.add_middleware(
 whisper_model = None
 db_path = "smart_news.db"
 
+# Pooled HTTP client shared by every outbound fetch
+http_client = get_http_client()
+
 # Enhanced news sources with real-time APIs
 NEWS_SOURCES = {
     "vi": [
@@ -194,14 +197,16 @@ async def fetch_news_from_source(source: Dict[str, Any], query: str = "") -> Lis
     
     try:
         # Parse RSS feed
-        feed = feedparser.parse(source["url"])
+        response = await http_client.get(source["url"])
+        response.raise_for_status()
+        items = await parse_feed_async(response.body, max_items=10)  # Limit to 10 articles per source
         
-        for entry in feed.entries[:10]:  # Limit to 10 articles per source
+        for item in items:
             # Clean and process article data
-            title = entry.get('title', '').strip()
-            description = entry.get('description', '').strip()
-            link = entry.get('link', '')
-            published = entry.get('published_parsed', None)
+            title = item.title.strip()
+            description = item.description.strip()
+            link = item.link
+            published = item.published_parsed
             
             # Convert published date
             if published:
@@ -209,16 +214,8 @@ async def fetch_news_from_source(source: Dict[str, Any], query: str = "") -> Lis
             else:
                 published_date = datetime.now()
             
-            # Get image from content or use default
-            image_url = ""
-            if hasattr(entry, 'content'):
-                for content in entry.content:
-                    if content.type == 'text/html':
-                        # Extract image from HTML content
-                        img_match = re.search(r'<img[^>]+src="([^"]+)"', content.value)
-                        if img_match:
-                            image_url = img_match.group(1)
-                            break
+            # Get image from the feed entry or use default
+            image_url = item.image_url or ""
             
             # If no image found, use a default based on category
             if not image_url:
@@ -389,6 +386,9 @@ async def startup_event():
         init_db()
         logger.info("Database initialized")
         
+        # Open pooled connections before the first search
+        await http_client.start()
+        
         # Load Whisper model (smaller model for faster startup)
         logger.info("Loading Whisper model...")
         whisper_model = whisper.load_model("base")
@@ -400,6 +400,11 @@ async def startup_event():
         logger.error(f"Failed to initialize: {e}")
         raise e
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled HTTP connections"""
+    await http_client.close()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main_simple_news:app",
@@ -4,15 +4,13 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
 import logging
-import feedparser
 import re
 import json
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 import requests
-import aiohttp
 import sqlite3
 from pathlib import Path
 import hashlib
@@ -20,6 +18,21 @@ import whisper
 from TTS.api import TTS
 import io
 import base64
+import threading
+import time
+from collections import OrderedDict, deque
+import numpy as np
+from audio_utils import pcm16_to_float, resample, write_wav
+from espeak_engine import get_espeak_engine
+from http_client import get_http_client
+from dedup import NearDuplicateIndex, article_text, dedupe_articles
+from search_cache import SearchCache, normalize_query
+from article_extractor import ArticleExtractor
+from image_proxy import ImageProxy
+from suggest_index import SuggestIndex
+from related_index import RelatedIndex
+from source_health import SourceHealthRegistry, SourceUnavailableError
+from fast_feed_parser import parse_feed_async
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -45,6 +58,77 @@ app.add_middleware(
 tts_model = None
 whisper_model = None
 db_path = "smart_news.db"
+fts_available = False
+audio_cache_dir = os.path.join("output", "cache")
+
+# Pooled HTTP client shared by every outbound fetch
+http_client = get_http_client()
+
+# Per-source fetch statistics; failing feeds are skipped until a probe succeeds
+source_health = SourceHealthRegistry(failure_threshold=3, cooldown=30, max_cooldown=600)
+
+# Resized article images, cached on disk within a byte budget
+image_proxy = ImageProxy(max_bytes=256 * 1024 * 1024)
+
+# Full-text extraction of article pages, at most 2 concurrent fetches per site
+article_extractor = ArticleExtractor(client=http_client, per_host_limit=2, max_concurrency=8)
+
+# Type-ahead phrases from article titles and past searches, re-snapshotted off the request path
+suggest_index = SuggestIndex(half_life_hours=72, max_phrases=50000)
+SUGGEST_REBUILD_SECONDS = 10
+suggest_task: Optional[asyncio.Task] = None
+
+# Hashed TF-IDF vectors of recent articles for /related
+related_index = RelatedIndex(max_documents=20000)
+
+# Streaming formats for /search-news
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+# Source fetches that outlived their search's budget
+background_fetches = set()
+
+# Real-time search results, dropped when a source they used stores new articles
+search_cache = SearchCache(ttl=60, max_entries=500)
+
+# The Coqui model is not safe to call from several threads at once
+tts_model_lock = threading.Lock()
+
+# Quality-of-service tiers for synthesis requests
+QUALITY_TIERS = {
+    "preview": {
+        "engine": "espeak",
+        "sample_rate": 16000,
+        "description": "Fast in-process eSpeak NG rendering for instant previews"
+    },
+    "full": {
+        "engine": "xtts_v2",
+        "sample_rate": None,
+        "description": "High-quality XTTS v2 rendering"
+    }
+}
+
+PREVIEW_VOICES = {'vi': 'vi', 'en': 'en', 'zh': 'cmn'}
+
+# Languages XTTS v2 can speak; anything else goes straight to the preview engine
+XTTS_LANGUAGES = {'en', 'es', 'fr', 'de', 'it', 'pt', 'pl', 'tr', 'ru', 'nl', 'cs', 'ar', 'zh-cn', 'hu', 'ko', 'ja', 'hi'}
+
+# Background full-quality renders keyed by cache path
+pending_full_renders: Dict[str, asyncio.Task] = {}
+
+# Pre-rendering of article headline audio; yields to interactive requests
+PRERENDER_VOICE_MODEL = 'coqui_vn_female'
+PRERENDER_MAX_PER_MINUTE = 6
+PRERENDER_PAUSE_SECONDS = 2.0
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?…])\s+")
+INTERACTIVE_PATHS = {"/synthesize", "/stt"}
+prerender_queue: "asyncio.Queue[NewsArticle]" = asyncio.Queue(maxsize=500)
+prerender_queued_ids = set()
+# Articles whose render failed, oldest first; they are not queued again
+PRERENDER_FAILED_MEMORY = 5000
+prerender_failed_ids: "OrderedDict[str, None]" = OrderedDict()
+prerender_task: Optional[asyncio.Task] = None
+prerender_stats = {"rendered": 0, "failed": 0, "dropped": 0}
+interactive_requests = 0
 
 # Enhanced news sources with real-time APIs
 NEWS_SOURCES = {
@@ -133,12 +217,20 @@ class SearchRequest(BaseModel):
     language: Optional[str] = 'auto'
     max_articles: int = 10
     real_time: bool = True
+    since: Optional[str] = None
+    until: Optional[str] = None
+    # Respond with whatever sources answered within this many milliseconds
+    budget_ms: Optional[int] = None
+    # 'ndjson' or 'sse' to stream each source's articles as they arrive
+    stream: Optional[str] = None
 
 class TTSRequest(BaseModel):
     text: str
     language: str = 'vi'
     voice_model: str = 'coqui_vn_female'
     streaming: bool = False
+    quality: str = 'full'
+    render_full_in_background: bool = True
 
 class HistoryItem(BaseModel):
     id: str
@@ -169,10 +261,16 @@ def init_database():
             image_url TEXT,
             audio_url TEXT,
             read_count INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            content_extracted_at TIMESTAMP
         )
     ''')
     
+    # Databases created before full-text extraction lack the marker column
+    cursor.execute("PRAGMA table_info(articles)")
+    if 'content_extracted_at' not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE articles ADD COLUMN content_extracted_at TIMESTAMP")
+    
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS search_history (
             id TEXT PRIMARY KEY,
@@ -193,31 +291,177 @@ def init_database():
         )
     ''')
     
+    init_article_search(cursor)
+    
     conn.commit()
     conn.close()
 
+def fold_sql(column: str) -> str:
+    """SQL expression folding đ/Đ, which unicode61 does not treat as a diacritic"""
+    return f"replace(replace({column}, 'đ', 'd'), 'Đ', 'D')"
+
+def init_article_search(cursor):
+    """Create the FTS5 index over articles and the triggers that keep it in sync"""
+    global fts_available
+    
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+    exists = cursor.fetchone() is not None
+    
+    try:
+        # Folded copies keyed by articles.rowid; unicode61 strips the remaining tone marks
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, description, content,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 unavailable, local search disabled: {e}")
+        fts_available = False
+        return
+    
+    folded = f"{fold_sql('new.title')}, {fold_sql('new.description')}, {fold_sql('new.content')}"
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts (rowid, title, description, content) VALUES (new.rowid, {folded});
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM articles_fts WHERE rowid = old.rowid;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, description, content ON articles BEGIN
+            DELETE FROM articles_fts WHERE rowid = old.rowid;
+            INSERT INTO articles_fts (rowid, title, description, content) VALUES (new.rowid, {folded});
+        END
+    ''')
+    
+    # Index articles stored before the search table existed
+    if not exists:
+        cursor.execute(f'''
+            INSERT INTO articles_fts (rowid, title, description, content)
+            SELECT rowid, {fold_sql('title')}, {fold_sql('description')}, {fold_sql('content')} FROM articles
+        ''')
+        logger.info(f"Indexed {cursor.rowcount} stored articles for local search")
+    
+    fts_available = True
+
 def get_article_id(article_data: dict) -> str:
     """Generate unique ID for article"""
     content = f"{article_data.get('title', '')}{article_data.get('link', '')}"
     return hashlib.md5(content.encode()).hexdigest()
 
-def save_article(article: NewsArticle):
-    """Save article to database"""
+def save_article(article: NewsArticle) -> bool:
+    """Save article to database; returns True if it was not stored before"""
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
+    cursor.execute('SELECT audio_url FROM articles WHERE id = ?', (article.id,))
+    existing = cursor.fetchone()
+    
+    # Upsert rather than REPLACE so the row keeps its rowid (and search entry),
+    # first-seen time, read count, rendered audio and extracted full text
     cursor.execute('''
-        INSERT OR REPLACE INTO articles 
+        INSERT INTO articles
         (id, title, description, content, link, published, source, language, category, image_url, audio_url, read_count)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            title = excluded.title,
+            description = excluded.description,
+            content = CASE WHEN articles.content_extracted_at IS NULL THEN excluded.content ELSE articles.content END,
+            link = excluded.link,
+            published = excluded.published,
+            source = excluded.source,
+            language = excluded.language,
+            category = excluded.category,
+            image_url = COALESCE(excluded.image_url, articles.image_url),
+            audio_url = COALESCE(excluded.audio_url, articles.audio_url)
     ''', (
         article.id, article.title, article.description, article.content,
         article.link, article.published, article.source, article.language,
         article.category, article.image_url, article.audio_url, article.read_count
     ))
     
+    # Pick up audio pre-rendered for an earlier copy of this article
+    if existing is not None:
+        article.audio_url = article.audio_url or existing[0]
+    
     conn.commit()
     conn.close()
+    return existing is None
+
+def parse_time_filter(value: Optional[str], name: str) -> Optional[str]:
+    """Convert an ISO-8601 bound to the UTC 'YYYY-MM-DD HH:MM:SS' form SQLite stores"""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}. Use ISO-8601, e.g. 2024-05-01T00:00:00")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+def build_match_query(query: str) -> Optional[str]:
+    """FTS5 MATCH expression requiring every query word (folded, quoted)"""
+    words = re.findall(r'\w+', query.replace('đ', 'd').replace('Đ', 'D'))
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words)
+
+def search_local_articles(query: str, language: Optional[str] = None, limit: int = 10,
+                          since: Optional[str] = None, until: Optional[str] = None) -> List[NewsArticle]:
+    """Search every stored article with FTS5, best match first; since/until bound the first-seen time"""
+    match = build_match_query(query)
+    if not fts_available or match is None:
+        return []
+    
+    conditions = ["articles_fts MATCH ?"]
+    params: List[Any] = [match]
+    if language:
+        conditions.append("a.language = ?")
+        params.append(language)
+    if since:
+        conditions.append("a.created_at >= ?")
+        params.append(since)
+    if until:
+        conditions.append("a.created_at <= ?")
+        params.append(until)
+    params.append(limit)
+    
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    # Title hits weigh most, then description, then body
+    cursor.execute(f'''
+        SELECT a.id, a.title, a.description, a.content, a.link, a.published, a.source,
+               a.language, a.category, a.image_url, a.audio_url, a.read_count
+        FROM articles_fts
+        JOIN articles a ON a.rowid = articles_fts.rowid
+        WHERE {" AND ".join(conditions)}
+        ORDER BY bm25(articles_fts, 5.0, 2.0, 1.0)
+        LIMIT ?
+    ''', params)
+    
+    rows = cursor.fetchall()
+    conn.close()
+    
+    return [NewsArticle(
+        id=row[0],
+        title=row[1],
+        description=row[2] or "",
+        content=row[3] or "",
+        link=row[4] or "",
+        published=row[5] or "",
+        source=row[6] or "",
+        language=row[7] or "",
+        category=row[8] or "",
+        image_url=row[9],
+        audio_url=row[10],
+        read_count=row[11] or 0
+    ) for row in rows]
 
 def get_search_history(limit: int = 50) -> List[HistoryItem]:
     """Get search history"""
@@ -271,94 +515,117 @@ def get_search_history(limit: int = 50) -> List[HistoryItem]:
     
     return [HistoryItem(**item) for item in history_dict.values()]
 
-async def fetch_real_time_news(query: str, language: str = 'vi', max_articles: int = 10) -> List[NewsArticle]:
-    """Fetch real-time news from multiple sources"""
-    articles = []
-    
-    # Determine sources based on language
+def get_language_sources(language: str) -> List[str]:
+    """Real-time sources searched for a language"""
     if language == 'vi':
-        sources = ['vnexpress', 'tuoitre', 'thanhnien', 'dantri', 'vietnamnet']
-    else:
-        sources = ['bbc', 'cnn', 'reuters', 'guardian']
-    
-    # Fetch from all sources concurrently
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for source in sources:
-            task = fetch_from_source(session, source, query)
-            tasks.append(task)
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, list):
-                articles.extend(result)
-    
-    # Remove duplicates and limit
-    seen_titles = set()
-    unique_articles = []
-    for article in articles:
-        if article.title not in seen_titles and len(article.title) > 10:
-            seen_titles.add(article.title)
-            unique_articles.append(article)
-            if len(unique_articles) >= max_articles:
+        return ['vnexpress', 'tuoitre', 'thanhnien', 'dantri', 'vietnamnet']
+    return ['bbc', 'cnn', 'reuters', 'guardian']
+
+def keep_fetching_in_background(task: asyncio.Task):
+    """Let a fetch that missed the search deadline finish; it still stores its articles"""
+    background_fetches.add(task)
+    task.add_done_callback(background_fetches.discard)
+
+async def iter_source_results(sources: List[str], query: str,
+                              deadline: Optional[float] = None) -> AsyncIterator[Tuple[str, List[NewsArticle]]]:
+    """Yield (source_key, articles) as each source answers, until every source did or the deadline passes"""
+    loop = asyncio.get_running_loop()
+    tasks = {asyncio.ensure_future(fetch_from_source(source, query)): source for source in sources}
+    pending = set(tasks)
+    try:
+        while pending:
+            timeout = None if deadline is None else deadline - loop.time()
+            if timeout is not None and timeout <= 0:
                 break
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield tasks[task], task.result() if task.exception() is None else []
+    finally:
+        # Abandoned, not cancelled: a slow source is not a failing one
+        for task in pending:
+            keep_fetching_in_background(task)
+
+async def fetch_real_time_news(query: str, language: str = 'vi', max_articles: int = 10,
+                               budget_ms: Optional[int] = None) -> Tuple[List[NewsArticle], List[str]]:
+    """Fetch real-time news from multiple sources; returns the articles and the sources that missed the budget"""
+    sources = get_language_sources(language)
+    deadline = asyncio.get_running_loop().time() + budget_ms / 1000 if budget_ms else None
+    
+    # Fetch from all sources concurrently over the shared connection pool
+    results = {}
+    async for source, articles in iter_source_results(sources, query, deadline):
+        results[source] = articles
     
-    return unique_articles
+    # Source order, not arrival order, decides which copy of a story is kept
+    articles = [article for source in sources for article in results.get(source, [])]
+    skipped = [source for source in sources if source not in results]
+    
+    # Keep one article per story (the same wire story from several outlets) and limit
+    return dedupe_articles(
+        [article for article in articles if len(article.title) > 10],
+        limit=max_articles
+    ), skipped
 
-async def fetch_from_source(session: aiohttp.ClientSession, source_key: str, query: str) -> List[NewsArticle]:
+async def fetch_from_source(source_key: str, query: str) -> List[NewsArticle]:
     """Fetch articles from a specific source"""
     if source_key not in NEWS_SOURCES:
         return []
     
     source = NEWS_SOURCES[source_key]
     articles = []
+    new_articles = 0
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        
-        async with session.get(source['api_url'], headers=headers, timeout=10) as response:
-            if response.status == 200:
-                content = await response.text()
-                feed = feedparser.parse(content)
+        with source_health.track(source_key):
+            response = await http_client.get(source['api_url'], timeout=10)
+            response.raise_for_status()
+        if response.status == 200:
+            items = await parse_feed_async(response.body, max_items=5)  # Limit per source
+            
+            for item in items:
+                title = item.title.strip()
+                link = item.link.strip()
+                published = item.published.strip()
+                
+                # Description with HTML removed
+                clean_desc = item.text
                 
-                for entry in feed.entries[:5]:  # Limit per source
-                    title = entry.get('title', '').strip()
-                    description = entry.get('description', '').strip()
-                    link = entry.get('link', '').strip()
-                    published = entry.get('published', '').strip()
+                # Filter by query if provided
+                if query and query.lower() not in title.lower() and query.lower() not in clean_desc.lower():
+                    continue
+                
+                if len(title) > 5:  # Valid article
+                    article_id = get_article_id({'title': title, 'link': link})
                     
-                    # Clean HTML from description
-                    clean_desc = re.sub(r'<[^>]+>', '', description)
+                    article = NewsArticle(
+                        id=article_id,
+                        title=title,
+                        description=clean_desc[:200] + "..." if len(clean_desc) > 200 else clean_desc,
+                        content=clean_desc,
+                        link=link,
+                        published=published,
+                        source=source['name'],
+                        language=source['language'],
+                        category=source['category'],
+                        image_url=item.image_url
+                    )
                     
-                    # Filter by query if provided
-                    if query and query.lower() not in title.lower() and query.lower() not in clean_desc.lower():
-                        continue
+                    articles.append(article)
+                    if save_article(article):
+                        new_articles += 1
+                        suggest_index.add_title(title)
+                        related_index.add(article_id, title, clean_desc)
+                    queue_prerender(article)
                     
-                    if len(title) > 5:  # Valid article
-                        article_id = get_article_id({'title': title, 'link': link})
-                        
-                        article = NewsArticle(
-                            id=article_id,
-                            title=title,
-                            description=clean_desc[:200] + "..." if len(clean_desc) > 200 else clean_desc,
-                            content=clean_desc,
-                            link=link,
-                            published=published,
-                            source=source['name'],
-                            language=source['language'],
-                            category=source['category'],
-                            image_url=None  # Could be extracted from entry
-                        )
-                        
-                        articles.append(article)
-                        save_article(article)
-                        
+    except SourceUnavailableError as e:
+        logger.debug(f"Skipping {source_key}: {e}")
     except Exception as e:
         logger.error(f"Error fetching from {source_key}: {e}")
     
+    # Cached searches over this source are missing the new articles
+    if new_articles:
+        search_cache.invalidate_source(source_key)
+    
     return articles
 
 def detect_language(text: str) -> str:
@@ -377,10 +644,62 @@ def detect_language(text: str) -> str:
     except:
         return 'vi'  # Default to Vietnamese
 
+def sqlite_timestamp(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds of a SQLite CURRENT_TIMESTAMP (UTC) value"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+def load_suggestions(title_limit: int = 5000, query_limit: int = 2000):
+    """Fill the suggestion index from recent article titles and popular past queries"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT title, created_at FROM articles ORDER BY created_at DESC LIMIT ?', (title_limit,))
+    titles = cursor.fetchall()
+    cursor.execute('''
+        SELECT query, COUNT(*), MAX(timestamp) FROM search_history
+        GROUP BY query ORDER BY COUNT(*) DESC LIMIT ?
+    ''', (query_limit,))
+    queries = cursor.fetchall()
+    conn.close()
+    
+    for title, created_at in titles:
+        suggest_index.add_title(title, sqlite_timestamp(created_at))
+    for query, count, last_searched in queries:
+        suggest_index.add_query(query, count, sqlite_timestamp(last_searched))
+    suggest_index.rebuild()
+    logger.info(f"Suggestion index built from {len(titles)} titles and {len(queries)} queries")
+
+def load_related_articles(limit: int = 20000):
+    """Fill the related-articles index from the most recent stored articles"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT id, title, content FROM articles ORDER BY created_at DESC LIMIT ?', (limit,))
+    rows = cursor.fetchall()
+    conn.close()
+    
+    # Oldest first, so the newest articles are the last to be evicted
+    for article_id, title, content in reversed(rows):
+        related_index.add(article_id, title, content or "")
+    logger.info(f"Related-articles index built from {len(related_index)} articles")
+
+async def refresh_suggestions():
+    """Periodically publish a new suggestion snapshot when phrases were added"""
+    while True:
+        await asyncio.sleep(SUGGEST_REBUILD_SECONDS)
+        if suggest_index.dirty:
+            try:
+                await asyncio.to_thread(suggest_index.rebuild)
+            except Exception as e:
+                logger.error(f"Error rebuilding suggestion index: {e}")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize models and database on startup"""
-    global tts_model, whisper_model
+    global tts_model, whisper_model, prerender_task, suggest_task
     
     try:
         logger.info("Initializing Smart News Reader AI...")
@@ -388,6 +707,16 @@ async def startup_event():
         # Initialize database
         init_database()
         
+        # Open pooled connections before the first search
+        await http_client.start()
+        
+        # Seed type-ahead suggestions from stored titles and search history
+        await asyncio.to_thread(load_suggestions)
+        suggest_task = asyncio.create_task(refresh_suggestions())
+        
+        # Vectorize stored articles for related-article lookups
+        await asyncio.to_thread(load_related_articles)
+        
         # Initialize TTS model
         logger.info("Loading TTS model...")
         tts_model = TTS(
@@ -400,12 +729,25 @@ async def startup_event():
         logger.info("Loading Whisper model...")
         whisper_model = whisper.load_model("base")
         
+        # Pre-render headline audio for new articles in the background
+        prerender_task = asyncio.create_task(prerender_worker())
+        
         logger.info("Smart News Reader AI ready!")
         
     except Exception as e:
         logger.error(f"Failed to initialize: {e}")
         raise e
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop pre-rendering and close pooled HTTP connections"""
+    if prerender_task is not None:
+        prerender_task.cancel()
+    if suggest_task is not None:
+        suggest_task.cancel()
+    await http_client.close()
+    await image_proxy.close()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -415,9 +757,107 @@ async def root():
         "features": ["STT", "Real-time News", "TTS", "History", "Multi-language"]
     }
 
+def save_search_history(query: str, language: str, articles: List[NewsArticle]) -> str:
+    """Record a search and the articles it returned; returns the search id"""
+    search_id = hashlib.md5(f"{query}{datetime.now()}".encode()).hexdigest()
+    
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        INSERT INTO search_history (id, query, language, article_count)
+        VALUES (?, ?, ?, ?)
+    ''', (search_id, query, language, len(articles)))
+    
+    # Link articles to search
+    for article in articles:
+        cursor.execute('''
+            INSERT INTO article_history (search_id, article_id)
+            VALUES (?, ?)
+        ''', (search_id, article.id))
+    
+    conn.commit()
+    conn.close()
+    
+    suggest_index.add_query(query)
+    return search_id
+
+def format_stream_event(event: str, data: dict, mode: str) -> str:
+    """One NDJSON line or SSE event"""
+    payload = json.dumps({"type": event, **data}, ensure_ascii=False)
+    if mode == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+async def stream_search_results(request: SearchRequest, language: str, mode: str) -> AsyncIterator[str]:
+    """Emit each source's new, deduplicated articles as soon as it answers, then a summary"""
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + request.budget_ms / 1000 if request.budget_ms else None
+    sources = get_language_sources(language)
+    
+    def elapsed_ms() -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+    
+    stories = NearDuplicateIndex()
+    seen_stories = set()
+    articles: List[NewsArticle] = []
+    answered = set()
+    
+    results = iter_source_results(sources, request.query, deadline)
+    try:
+        async for source, source_articles in results:
+            answered.add(source)
+            batch = []
+            for article in source_articles:
+                if len(article.title) <= 10 or len(articles) + len(batch) >= request.max_articles:
+                    continue
+                story = stories.add(article_text(article))
+                if story not in seen_stories:
+                    seen_stories.add(story)
+                    batch.append(article)
+            articles.extend(batch)
+            if batch:
+                yield format_stream_event("articles", {
+                    "source": source,
+                    "articles": [article.dict() for article in batch],
+                    "elapsed_ms": elapsed_ms()
+                }, mode)
+            if len(articles) >= request.max_articles:
+                break
+    finally:
+        # Hand sources still loading over to the background right away
+        await results.aclose()
+    
+    # Top up with older stored articles that have rotated out of the live feeds
+    if len(articles) < request.max_articles:
+        seen_ids = {article.id for article in articles}
+        stored = await asyncio.to_thread(
+            search_local_articles, request.query, language, request.max_articles
+        )
+        batch = [article for article in stored if article.id not in seen_ids][:request.max_articles - len(articles)]
+        articles.extend(batch)
+        if batch:
+            yield format_stream_event("articles", {
+                "source": "stored",
+                "articles": [article.dict() for article in batch],
+                "elapsed_ms": elapsed_ms()
+            }, mode)
+    
+    search_id = await asyncio.to_thread(save_search_history, request.query, language, articles)
+    yield format_stream_event("done", {
+        "query": request.query,
+        "detected_language": language,
+        "search_id": search_id,
+        "total_found": len(articles),
+        "skipped_sources": [source for source in sources if source not in answered],
+        "elapsed_ms": elapsed_ms(),
+        "timestamp": datetime.now().isoformat()
+    }, mode)
+
 @app.post("/search-news")
 async def search_news(request: SearchRequest):
-    """Search for real-time news with history tracking"""
+    """Search for real-time news with history tracking, optionally within a latency budget or streamed"""
     try:
         # Auto-detect language if not specified
         if request.language == 'auto':
@@ -425,29 +865,57 @@ async def search_news(request: SearchRequest):
         else:
             detected_lang = request.language
         
-        # Fetch real-time news
-        articles = await fetch_real_time_news(request.query, detected_lang, request.max_articles)
-        
-        # Save to history
-        search_id = hashlib.md5(f"{request.query}{datetime.now()}".encode()).hexdigest()
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        since = parse_time_filter(request.since, "since")
+        until = parse_time_filter(request.until, "until")
         
-        cursor.execute('''
-            INSERT INTO search_history (id, query, language, article_count)
-            VALUES (?, ?, ?, ?)
-        ''', (search_id, request.query, detected_lang, len(articles)))
+        if request.budget_ms is not None and request.budget_ms <= 0:
+            raise HTTPException(status_code=400, detail="budget_ms must be positive")
+        if request.stream and request.stream not in STREAM_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail=f"stream must be one of: {', '.join(STREAM_MEDIA_TYPES)}")
         
-        # Link articles to search
-        for article in articles:
-            cursor.execute('''
-                INSERT INTO article_history (search_id, article_id)
-                VALUES (?, ?)
-            ''', (search_id, article.id))
+        skipped_sources: List[str] = []
+    
+        # Time-bounded or non-real-time searches are answered from the stored corpus
+        if request.real_time and not (since or until):
+            if request.stream:
+                return StreamingResponse(
+                    stream_search_results(request, detected_lang, request.stream),
+                    media_type=STREAM_MEDIA_TYPES[request.stream],
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+                )
+            
+            async def run_search() -> Tuple[List[NewsArticle], List[str]]:
+                articles, skipped = await fetch_real_time_news(
+                    request.query, detected_lang, request.max_articles, request.budget_ms
+                )
+                
+                # Top up with older stored articles that have rotated out of the live feeds
+                if len(articles) < request.max_articles:
+                    seen_ids = {article.id for article in articles}
+                    stored = await asyncio.to_thread(
+                        search_local_articles, request.query, detected_lang, request.max_articles
+                    )
+                    articles.extend(
+                        article for article in stored if article.id not in seen_ids
+                    )
+                    articles = articles[:request.max_articles]
+                return articles, skipped
+            
+            # Repeated and concurrent identical searches share one fan-out;
+            # results missing a source that ran out of budget are not cached
+            cache_key = ("search-news", normalize_query(request.query), detected_lang,
+                         request.max_articles, request.budget_ms)
+            articles, skipped_sources = await search_cache.get_or_compute(
+                cache_key, get_language_sources(detected_lang), run_search,
+                cacheable=lambda result: not result[1]
+            )
+        else:
+            articles = await asyncio.to_thread(
+                search_local_articles, request.query, detected_lang, request.max_articles, since, until
+            )
         
-        conn.commit()
-        conn.close()
+        # Save to history
+        search_id = save_search_history(request.query, detected_lang, articles)
         
         return {
             "query": request.query,
@@ -455,68 +923,444 @@ async def search_news(request: SearchRequest):
             "articles": [article.dict() for article in articles],
             "search_id": search_id,
             "timestamp": datetime.now().isoformat(),
-            "total_found": len(articles)
+            "total_found": len(articles),
+            "skipped_sources": skipped_sources
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching news: {e}")
         raise HTTPException(status_code=500, detail=f"Error searching news: {e}")
 
+def get_audio_cache_path(text: str, language: str, voice_model: str, quality: str) -> str:
+    """Cache location for a rendering of text at a given quality tier"""
+    key = hashlib.md5(f"{quality}|{language}|{voice_model}|{text}".encode()).hexdigest()
+    return os.path.join(audio_cache_dir, f"{quality}_{key}.wav")
+
+def render_full_quality(text: str, language: str, output_file: str):
+    """Render text with the high-quality XTTS model into the cache"""
+    temp_file = f"{output_file}.{threading.get_ident()}.tmp.wav"
+    try:
+        with tts_model_lock:
+            tts_model.tts_to_file(
+                text=text,
+                file_path=temp_file,
+                speaker_wav=None,
+                language=language,
+                split_sentences=True
+            )
+        os.replace(temp_file, output_file)
+    except BaseException:
+        # A half-written render must never become a cache hit
+        if os.path.exists(temp_file):
+            os.unlink(temp_file)
+        raise
+
+def write_audio_file(output_file: str, wav_data: bytes):
+    """Write a cache file aside and move it into place, so readers never see a partial file"""
+    temp_file = f"{output_file}.{threading.get_ident()}.tmp.wav"
+    try:
+        with open(temp_file, "wb") as f:
+            f.write(wav_data)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.unlink(temp_file)
+        raise
+
+def render_preview(text: str, language: str, output_file: str):
+    """Render text with the fast preview engine at the preview sample rate"""
+    engine = get_espeak_engine()
+    tier = QUALITY_TIERS["preview"]
+    pcm = engine.synthesize_pcm(text, voice=PREVIEW_VOICES.get(language, language), speed=175)
+    samples = resample(pcm16_to_float(pcm), engine.sample_rate, tier["sample_rate"])
+    write_audio_file(output_file, write_wav(samples, tier["sample_rate"]))
+
+def render_full_quality_yielding(text: str, language: str, output_file: str):
+    """Render text with the XTTS model one sentence at a time, letting interactive requests go first"""
+    chunks = []
+    for sentence in SENTENCE_PATTERN.split(text):
+        if not sentence.strip():
+            continue
+        # The model lock is only held per sentence, so /synthesize waits at most one sentence
+        while interactive_requests > 0:
+            time.sleep(0.2)
+        with tts_model_lock:
+            chunks.append(np.asarray(
+                tts_model.tts(text=sentence, speaker_wav=None, language=language, split_sentences=False),
+                dtype=np.float32
+            ))
+    if not chunks:
+        raise ValueError("Nothing to render")
+    write_audio_file(output_file, write_wav(np.concatenate(chunks), tts_model.synthesizer.output_sample_rate))
+
+def schedule_full_render(text: str, language: str, output_file: str) -> str:
+    """Start a background full-quality render unless it is cached or running"""
+    if os.path.exists(output_file):
+        return "cached"
+    if output_file in pending_full_renders:
+        return "in-progress"
+
+    async def run():
+        try:
+            await asyncio.to_thread(render_full_quality, text, language, output_file)
+            logger.info(f"Background full render cached: {output_file}")
+        except Exception as e:
+            logger.error(f"Background full render failed: {e}")
+        finally:
+            pending_full_renders.pop(output_file, None)
+
+    pending_full_renders[output_file] = asyncio.create_task(run())
+    return "scheduled"
+
+def article_audio_text(title: str, description: str) -> str:
+    """Text read for an article's headline audio"""
+    return f"{title}. {description}".strip()
+
+def get_article_audio_path(article_id: str, quality: str) -> str:
+    """Cache location of an article's headline audio; keyed by article so edited descriptions keep it"""
+    return os.path.join(audio_cache_dir, f"article_{quality}_{article_id}.wav")
+
+def find_article_audio(article_id: str) -> Optional[str]:
+    """Best cached rendering of an article's headline audio, if any"""
+    for quality in ("full", "preview"):
+        path = get_article_audio_path(article_id, quality)
+        if os.path.exists(path):
+            return path
+    return None
+
+def can_prerender(language: str) -> bool:
+    return (tts_model is not None and language in XTTS_LANGUAGES) or get_espeak_engine().available
+
+def render_article_audio(article: NewsArticle) -> str:
+    """Render headline audio with the best engine for the article's language; returns the cached file"""
+    text = article_audio_text(article.title, article.description)
+    os.makedirs(audio_cache_dir, exist_ok=True)
+    if tts_model is not None and article.language in XTTS_LANGUAGES:
+        output_file = get_article_audio_path(article.id, "full")
+        try:
+            render_full_quality_yielding(text, article.language, output_file)
+            return output_file
+        except Exception as e:
+            if not get_espeak_engine().available:
+                raise
+            logger.info(f"Full pre-render failed for {article.id}, using preview engine: {e}")
+    output_file = get_article_audio_path(article.id, "preview")
+    render_preview(text, article.language, output_file)
+    return output_file
+
+def set_article_audio_url(article_id: str, audio_url: str):
+    conn = sqlite3.connect(db_path)
+    conn.execute('UPDATE articles SET audio_url = ? WHERE id = ?', (audio_url, article_id))
+    conn.commit()
+    conn.close()
+
+def queue_prerender(article: NewsArticle):
+    """Queue headline audio for an article that has none yet"""
+    if article.audio_url or article.id in prerender_queued_ids or article.id in prerender_failed_ids:
+        return
+    if not can_prerender(article.language):
+        return
+    try:
+        prerender_queue.put_nowait(article)
+        prerender_queued_ids.add(article.id)
+    except asyncio.QueueFull:
+        prerender_stats["dropped"] += 1
+
+async def wait_for_idle():
+    """Block while interactive requests are running or the TTS model is busy"""
+    while interactive_requests > 0 or tts_model_lock.locked():
+        await asyncio.sleep(0.5)
+
+async def prerender_worker():
+    """Render queued articles one at a time within a per-minute budget"""
+    recent_renders = deque()
+    while True:
+        article = await prerender_queue.get()
+        try:
+            # Stay within the budget so pre-rendering never saturates the CPU
+            now = time.monotonic()
+            while recent_renders and now - recent_renders[0] > 60:
+                recent_renders.popleft()
+            if len(recent_renders) >= PRERENDER_MAX_PER_MINUTE:
+                await asyncio.sleep(60 - (now - recent_renders[0]))
+    
+            await wait_for_idle()
+            await asyncio.to_thread(render_article_audio, article)
+            recent_renders.append(time.monotonic())
+    
+            audio_url = f"/audio/{article.id}"
+            await asyncio.to_thread(set_article_audio_url, article.id, audio_url)
+            prerender_stats["rendered"] += 1
+            logger.info(f"Pre-rendered audio for article {article.id}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            prerender_stats["failed"] += 1
+            prerender_failed_ids[article.id] = None
+            while len(prerender_failed_ids) > PRERENDER_FAILED_MEMORY:
+                prerender_failed_ids.popitem(last=False)
+            logger.error(f"Pre-render failed for article {article.id}: {e}")
+        finally:
+            prerender_queued_ids.discard(article.id)
+            prerender_queue.task_done()
+    
+        await asyncio.sleep(PRERENDER_PAUSE_SECONDS)
+
+@app.middleware("http")
+async def track_interactive_requests(request: Request, call_next):
+    """Count in-flight synthesis/STT requests so background work can yield to them"""
+    global interactive_requests
+    if request.url.path not in INTERACTIVE_PATHS:
+        return await call_next(request)
+    interactive_requests += 1
+    try:
+        return await call_next(request)
+    finally:
+        interactive_requests -= 1
+
+def audio_file_response(output_file: str, streaming: bool, headers: Dict[str, str]):
+    """Return a cached audio file as a file or streaming response"""
+    if streaming:
+        def generate():
+            with open(output_file, "rb") as f:
+                while True:
+                    chunk = f.read(1024)
+                    if not chunk:
+                        break
+                    yield chunk
+    
+        return StreamingResponse(
+            generate(),
+            media_type="audio/wav",
+            headers={"Content-Disposition": "inline; filename=speech.wav", **headers}
+        )
+    
+    return FileResponse(
+        path=output_file,
+        media_type="audio/wav",
+        filename="speech.wav",
+        headers=headers
+    )
+
 @app.post("/synthesize")
 async def synthesize_speech(request: TTSRequest):
-    """Synthesize speech with streaming support"""
+    """Synthesize speech with streaming support and preview/full quality tiers"""
     try:
-        if tts_model is None:
-            raise HTTPException(status_code=503, detail="TTS model not loaded")
+        if request.quality not in QUALITY_TIERS:
+            raise HTTPException(status_code=400, detail=f"Unknown quality tier: {request.quality}")
         
-        # Ensure output directory exists
-        output_dir = "output"
-        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(audio_cache_dir, exist_ok=True)
         
-        # Generate unique filename
-        text_hash = hashlib.md5(request.text.encode()).hexdigest()[:8]
-        output_file = os.path.join(output_dir, f"smart_news_{text_hash}.wav")
+        full_file = get_audio_cache_path(request.text, request.language, request.voice_model, "full")
+        headers = {"X-Quality-Tier": request.quality}
         
-        logger.info(f"Synthesizing: '{request.text[:50]}...' in {request.language}")
+        # A finished full render always wins, whichever tier was asked for
+        if os.path.exists(full_file):
+            headers["X-Quality-Tier"] = "full"
+            headers["X-Cache"] = "hit"
+            return audio_file_response(full_file, request.streaming, headers)
         
-        # Synthesize speech
-        tts_model.tts_to_file(
-            text=request.text,
-            file_path=output_file,
-            speaker_wav=None,
-            language=request.language,
-            split_sentences=True
-        )
+        if tts_model is None and request.quality == "full":
+            raise HTTPException(status_code=503, detail="TTS model not loaded")
         
-        logger.info(f"Speech synthesized: {output_file}")
+        logger.info(f"Synthesizing ({request.quality}): '{request.text[:50]}...' in {request.language}")
         
-        if request.streaming:
-            # Return streaming response
-            def generate():
-                with open(output_file, "rb") as f:
-                    while True:
-                        chunk = f.read(1024)
-                        if not chunk:
-                            break
-                        yield chunk
+        if request.quality == "preview" and get_espeak_engine().available:
+            output_file = get_audio_cache_path(request.text, request.language, request.voice_model, "preview")
+            if os.path.exists(output_file):
+                headers["X-Cache"] = "hit"
+            else:
+                headers["X-Cache"] = "miss"
+                await asyncio.to_thread(render_preview, request.text, request.language, output_file)
             
-            return StreamingResponse(
-                generate(),
-                media_type="audio/wav",
-                headers={"Content-Disposition": "inline; filename=speech.wav"}
-            )
+            if request.render_full_in_background and tts_model is not None:
+                headers["X-Full-Render"] = schedule_full_render(request.text, request.language, full_file)
         else:
-            # Return file response
-            return FileResponse(
-                path=output_file,
-                media_type="audio/wav",
-                filename="speech.wav"
-            )
+            # Preview engine unavailable: fall back to the full model
+            if tts_model is None:
+                raise HTTPException(status_code=503, detail="TTS model not loaded")
+            headers["X-Quality-Tier"] = "full"
+            headers["X-Cache"] = "miss"
+            task = pending_full_renders.get(full_file)
+            if task is not None:
+                await asyncio.shield(task)
+            if not os.path.exists(full_file):
+                await asyncio.to_thread(render_full_quality, request.text, request.language, full_file)
+            output_file = full_file
+        
+        logger.info(f"Speech synthesized: {output_file}")
+        
+        return audio_file_response(output_file, request.streaming, headers)
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error synthesizing speech: {e}")
         raise HTTPException(status_code=500, detail=f"Error synthesizing speech: {e}")
 
+@app.get("/quality-tiers")
+async def get_quality_tiers():
+    """Get available synthesis quality tiers"""
+    return {
+        "tiers": QUALITY_TIERS,
+        "default": "full",
+        "pending_full_renders": len(pending_full_renders)
+    }
+
+@app.get("/audio/{article_id}")
+async def get_article_audio(article_id: str):
+    """Serve an article's pre-rendered headline audio"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT 1 FROM articles WHERE id = ?', (article_id,))
+    row = cursor.fetchone()
+    conn.close()
+    
+    if row is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    
+    output_file = find_article_audio(article_id)
+    if output_file is None:
+        raise HTTPException(status_code=404, detail="Audio not rendered yet")
+    
+    return FileResponse(path=output_file, media_type="audio/wav", filename=f"{article_id}.wav")
+
+@app.get("/articles/{article_id}/content")
+async def get_article_content(article_id: str):
+    """Get an article's full text, extracting it from the article page on first request"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        'SELECT title, content, link, content_extracted_at FROM articles WHERE id = ?', (article_id,)
+    )
+    row = cursor.fetchone()
+    conn.close()
+    
+    if row is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    title, content, link, extracted_at = row
+    
+    # Pages are fetched and parsed once; afterwards the stored text is served
+    if extracted_at is None and link:
+        extracted = await article_extractor.extract(link)
+        if extracted is not None and extracted.content:
+            content = extracted.content
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                'UPDATE articles SET content = ?, content_extracted_at = CURRENT_TIMESTAMP WHERE id = ?',
+                (content, article_id)
+            )
+            conn.commit()
+            conn.close()
+            extracted_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    
+    return {
+        "id": article_id,
+        "title": title,
+        "content": content or "",
+        "extracted": extracted_at is not None,
+        "extracted_at": extracted_at
+    }
+
+@app.get("/image")
+async def get_image(request: Request, url: str, w: int = 320, format: Optional[str] = None):
+    """Serve a resized, disk-cached copy of a remote article image"""
+    return await image_proxy.serve(url, w, format, request.headers.get("accept", ""))
+
+@app.get("/image-cache/stats")
+async def get_image_cache_stats():
+    """Get image proxy hit/render/eviction statistics"""
+    return image_proxy.get_stats()
+
+@app.get("/suggest")
+async def suggest(q: str, limit: int = 8):
+    """Type-ahead completions for a partial query, matched without diacritics"""
+    started = time.perf_counter()
+    suggestions = suggest_index.suggest(q, max(1, min(limit, suggest_index.top_k)))
+    return {
+        "query": q,
+        "suggestions": [{"text": text, "score": score} for text, score in suggestions],
+        "took_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+
+@app.get("/related/{article_id}")
+async def get_related_articles(article_id: str, limit: int = 5):
+    """Stored articles most similar to an article by TF-IDF cosine similarity"""
+    started = time.perf_counter()
+    limit = max(1, min(limit, 50))
+    if article_id in related_index:
+        matches = related_index.similar(article_id, limit=limit)
+    else:
+        # Older than the in-memory window: compare its stored text instead
+        conn = sqlite3.connect(db_path)
+        row = conn.execute('SELECT title, content FROM articles WHERE id = ?', (article_id,)).fetchone()
+        conn.close()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Article not found")
+        matches = [match for match in related_index.similar(title=row[0], body=row[1] or "", limit=limit + 1)
+                   if match[0] != article_id][:limit]
+    took_ms = round((time.perf_counter() - started) * 1000, 3)
+    
+    scores = dict(matches)
+    related = []
+    if scores:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT id, title, description, content, link, published, source,
+                   language, category, image_url, audio_url, read_count
+            FROM articles WHERE id IN ({",".join("?" * len(scores))})
+        ''', list(scores))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        related = [{
+            **NewsArticle(
+                id=row[0],
+                title=row[1],
+                description=row[2] or "",
+                content=row[3] or "",
+                link=row[4] or "",
+                published=row[5] or "",
+                source=row[6] or "",
+                language=row[7] or "",
+                category=row[8] or "",
+                image_url=row[9],
+                audio_url=row[10],
+                read_count=row[11] or 0
+            ).dict(),
+            "similarity": scores[row[0]]
+        } for row in rows]
+        related.sort(key=lambda article: article["similarity"], reverse=True)
+    
+    return {
+        "article_id": article_id,
+        "related": related,
+        "took_ms": took_ms
+    }
+
+@app.get("/related-index/stats")
+async def get_related_index_stats():
+    """Get related-articles index size"""
+    return related_index.stats()
+
+@app.get("/search-cache/stats")
+async def get_search_cache_stats():
+    """Get search result cache hit/miss/coalescing statistics"""
+    return search_cache.get_stats()
+
+@app.get("/prerender/status")
+async def get_prerender_status():
+    """Get background pre-rendering queue and counters"""
+    return {
+        "queued": prerender_queue.qsize(),
+        "interactive_requests": interactive_requests,
+        "max_per_minute": PRERENDER_MAX_PER_MINUTE,
+        **prerender_stats
+    }
+
 @app.post("/stt")
 async def speech_to_text(audio_file: bytes = Form(...)):
     """Convert speech to text using Whisper"""
@@ -560,9 +1404,12 @@ async def get_history(limit: int = 50):
 
 @app.get("/news-sources")
 async def get_news_sources():
-    """Get available news sources"""
+    """Get available news sources with their live health and circuit state"""
     return {
-        "sources": NEWS_SOURCES,
+        "sources": {
+            key: {**source, "health": source_health.status(key)}
+            for key, source in NEWS_SOURCES.items()
+        },
         "total": len(NEWS_SOURCES),
         "languages": ["vi", "en", "zh"],
         "categories": ["general", "international"]
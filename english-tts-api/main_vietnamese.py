@@ -1,12 +1,17 @@
 from fastapi import FastAPI, Form, HTTPException, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
 import logging
 import tempfile
 import subprocess
+import asyncio
+import io
+import threading
+from collections import OrderedDict
 from gtts import gTTS
+from audio_utils import decode_mp3, resample, write_wav, change_speed_and_pitch
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -56,6 +61,48 @@ VOICE_MODELS = {
     }
 }
 
+# Base renderings (before speed/pitch) keyed by (text, voice model)
+BASE_RENDER_SAMPLE_RATE = 22050
+BASE_RENDER_CACHE_SIZE = 64
+base_render_cache = OrderedDict()
+base_render_lock = threading.Lock()
+
+SPEED_RANGE = (0.5, 2.0)
+PITCH_RANGE = (0.5, 2.0)
+
+def get_base_rendering(text: str, voice_model: str):
+    """Return the cached gTTS rendering of text as float PCM, synthesizing it once"""
+    key = (text, voice_model)
+    with base_render_lock:
+        if key in base_render_cache:
+            base_render_cache.move_to_end(key)
+            return base_render_cache[key], True
+    
+    model_config = VOICE_MODELS.get(voice_model, VOICE_MODELS["google_male"])
+    mp3_buffer = io.BytesIO()
+    gTTS(
+        text=text,
+        lang=model_config["lang"],
+        tld=model_config["tld"],
+        slow=model_config["slow"]
+    ).write_to_fp(mp3_buffer)
+    
+    # Decode once in process; speed/pitch variants are derived from this
+    samples, sample_rate = decode_mp3(mp3_buffer.getvalue())
+    samples = resample(samples, sample_rate, BASE_RENDER_SAMPLE_RATE)
+    
+    with base_render_lock:
+        base_render_cache[key] = samples
+        while len(base_render_cache) > BASE_RENDER_CACHE_SIZE:
+            base_render_cache.popitem(last=False)
+    return samples, False
+
+def render_with_effects(text: str, voice_model: str, speed: float, pitch: float):
+    """Apply speed and pitch to the cached base rendering"""
+    samples, cached = get_base_rendering(text, voice_model)
+    processed = change_speed_and_pitch(samples, BASE_RENDER_SAMPLE_RATE, speed, pitch)
+    return write_wav(processed, BASE_RENDER_SAMPLE_RATE), cached
+
 def synthesize_with_google_tts(text: str, voice_model: str = "google_male") -> str:
     """Synthesize speech using Google TTS with different voice models"""
     try:
@@ -183,17 +230,40 @@ async def synthesize_advanced(
 ):
     """Advanced synthesis with speed and pitch control"""
     try:
-        # For now, just use basic synthesis
-        # In a real implementation, you'd adjust these parameters
+        if not text or not text.strip():
+            raise HTTPException(status_code=400, detail="Text cannot be empty")
+        
+        if len(text) > 2000:
+            raise HTTPException(status_code=400, detail="Text too long (max 2000 characters)")
+        
+        if not SPEED_RANGE[0] <= speed <= SPEED_RANGE[1]:
+            raise HTTPException(status_code=400, detail=f"Speed must be between {SPEED_RANGE[0]} and {SPEED_RANGE[1]}")
+        
+        if not PITCH_RANGE[0] <= pitch <= PITCH_RANGE[1]:
+            raise HTTPException(status_code=400, detail=f"Pitch must be between {PITCH_RANGE[0]} and {PITCH_RANGE[1]}")
+        
+        if voice_model not in VOICE_MODELS:
+            voice_model = "google_male"
+        
         logger.info(f"Advanced synthesis: voice={voice_model}, speed={speed}, pitch={pitch}")
         
-        # Use the basic synthesis for now
-        return await synthesize_speech(
-            text=text,
-            language="vi",
-            voice_model=voice_model
+        try:
+            wav_data, cached = await asyncio.to_thread(render_with_effects, text, voice_model, speed, pitch)
+        except RuntimeError as e:
+            # Without an MP3 decoder speed and pitch cannot be applied
+            raise HTTPException(status_code=503, detail=f"Advanced synthesis unavailable: {e}")
+        
+        return Response(
+            content=wav_data,
+            media_type="audio/wav",
+            headers={
+                "Content-Disposition": "inline; filename=tts_output.wav",
+                "X-Base-Cache": "hit" if cached else "miss"
+            }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in advanced synthesis: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Advanced synthesis failed: {str(e)}")
@@ -4,13 +4,17 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
 import logging
-import feedparser
+import asyncio
 import re
 from datetime import datetime
 from TTS.api import TTS
 from pydantic import BaseModel
 from typing import Optional, List
 import json
+from http_client import get_http_client
+from source_health import SourceHealthRegistry, SourceUnavailableError
+from news_matching import rank_by_tiers
+from fast_feed_parser import parse_feed_async
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -35,6 +39,12 @@ app.add_middleware(
 # Global variable to store the TTS model
 tts_model = None
 
+# Pooled HTTP client shared by every outbound fetch
+http_client = get_http_client()
+
+# Per-source fetch statistics; failing feeds are skipped until a probe succeeds
+source_health = SourceHealthRegistry(failure_threshold=3, cooldown=30, max_cooldown=600)
+
 # News sources configuration
 NEWS_SOURCES = {
     'vnexpress': {
@@ -84,6 +94,7 @@ class NewsArticle(BaseModel):
 async def startup_event():
     """Initialize the TTS model on startup"""
     global tts_model
+    await http_client.start()
     try:
         logger.info("Loading TTS model...")
         # Initialize TTS model for CPU only with optimized settings
@@ -98,12 +109,17 @@ async def startup_event():
         logger.error(f"Failed to load TTS model: {str(e)}")
         raise e
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled HTTP connections"""
+    await http_client.close()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
     return {"status": "TTS API with News Search ready"}
 
-def fetch_news_from_rss(source_key: str, query: str = None) -> List[NewsArticle]:
+async def fetch_news_from_rss(source_key: str, query: str = None) -> List[NewsArticle]:
     """Fetch news articles from RSS feed"""
     if source_key not in NEWS_SOURCES:
         return []
@@ -112,13 +128,16 @@ def fetch_news_from_rss(source_key: str, query: str = None) -> List[NewsArticle]
     articles = []
     
     try:
-        feed = feedparser.parse(source['rss_url'])
+        with source_health.track(source_key):
+            response = await http_client.get(source['rss_url'])
+            response.raise_for_status()
+        items = await parse_feed_async(response.body, max_items=10)  # Limit to 10 articles
         
-        for entry in feed.entries[:10]:  # Limit to 10 articles
-            title = entry.get('title', '')
-            description = entry.get('description', '')
-            link = entry.get('link', '')
-            published = entry.get('published', '')
+        for item in items:
+            title = item.title
+            description = item.description
+            link = item.link
+            published = item.published
             
             # Filter by query if provided
             if query:
@@ -135,44 +154,21 @@ def fetch_news_from_rss(source_key: str, query: str = None) -> List[NewsArticle]
             )
             articles.append(article)
             
+    except SourceUnavailableError as e:
+        logger.debug(f"Skipping {source_key}: {e}")
     except Exception as e:
         logger.error(f"Error fetching news from {source_key}: {str(e)}")
     
     return articles
 
-def search_news_by_keywords(query: str, language: str = 'vi') -> str:
+async def search_news_by_keywords(query: str, language: str = 'vi') -> str:
     """Search news by keywords and return formatted text"""
-    query_lower = query.lower()
-    
     # Use Vietnamese sources
     sources = ['vnexpress', 'tuoitre', 'thanhnien', 'dantri', 'vietnamnet']
     
-    all_articles = []
-    
-    # Fetch articles from all relevant sources with query filter
-    for source in sources:
-        articles = fetch_news_from_rss(source, query)
-        all_articles.extend(articles)
-    
-    # If no articles found with query, try broader search
-    if not all_articles:
-        for source in sources:
-            articles = fetch_news_from_rss(source)
-            # Filter articles by keywords in title or description
-            filtered_articles = []
-            for article in articles:
-                if (query_lower in article.title.lower() or 
-                    query_lower in article.description.lower() or
-                    any(keyword in article.title.lower() or keyword in article.description.lower() 
-                        for keyword in query_lower.split())):
-                    filtered_articles.append(article)
-            all_articles.extend(filtered_articles)
-    
-    # If still no articles, get latest news
-    if not all_articles:
-        for source in sources:
-            articles = fetch_news_from_rss(source)
-            all_articles.extend(articles[:2])  # Get 2 latest from each source
+    # Fetch every source once, then rank exact > keyword > latest over the same articles
+    source_articles = await asyncio.gather(*[fetch_news_from_rss(source) for source in sources])
+    all_articles = rank_by_tiers(source_articles, query)
     
     # Remove duplicates and limit to 6 articles
     seen_titles = set()
@@ -214,7 +210,7 @@ def search_news_by_keywords(query: str, language: str = 'vi') -> str:
 async def search_news(request: NewsSearchRequest):
     """Search for news articles based on query"""
     try:
-        news_text = search_news_by_keywords(request.query, request.language)
+        news_text = await search_news_by_keywords(request.query, request.language)
         return {
             "query": request.query,
             "language": request.language,
@@ -296,9 +292,12 @@ async def synthesize_speech(request: Request, text: Optional[str] = Form(None),
 
 @app.get("/news-sources")
 async def get_news_sources():
-    """Get available news sources"""
+    """Get available news sources with their live health and circuit state"""
     return {
-        "sources": NEWS_SOURCES,
+        "sources": {
+            key: {**source, "health": source_health.status(key)}
+            for key, source in NEWS_SOURCES.items()
+        },
         "total": len(NEWS_SOURCES)
     }
 
@@ -0,0 +1,227 @@
+"""Frame-level MP3 concatenation without decoding or re-encoding.
+
+Segments (e.g. cached gTTS renderings) are stripped of ID3 tags and of any
+Xing/Info/VBRI header frame, their raw MPEG Layer III frames are
+concatenated, and a fresh Info/Xing frame is prepended so players report
+the correct duration for the joined stream.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+MPEG_VERSION_1 = 3
+MPEG_VERSION_2 = 2
+MPEG_VERSION_25 = 0
+LAYER_III = 1
+
+BITRATES_V1_L3 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]
+BITRATES_V2_L3 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+
+SAMPLE_RATES = {
+    MPEG_VERSION_1: [44100, 48000, 32000],
+    MPEG_VERSION_2: [22050, 24000, 16000],
+    MPEG_VERSION_25: [11025, 12000, 8000],
+}
+
+CHANNEL_MODE_MONO = 3
+
+XING_FLAG_FRAMES = 0x1
+XING_FLAG_BYTES = 0x2
+
+
+@dataclass
+class FrameHeader:
+    version: int
+    bitrate_index: int
+    sample_rate_index: int
+    padding: int
+    channel_mode: int
+    raw: bytes
+
+    @property
+    def bitrate(self) -> int:
+        table = BITRATES_V1_L3 if self.version == MPEG_VERSION_1 else BITRATES_V2_L3
+        return table[self.bitrate_index]
+
+    @property
+    def sample_rate(self) -> int:
+        return SAMPLE_RATES[self.version][self.sample_rate_index]
+
+    @property
+    def samples_per_frame(self) -> int:
+        return 1152 if self.version == MPEG_VERSION_1 else 576
+
+    @property
+    def frame_length(self) -> int:
+        coefficient = 144 if self.version == MPEG_VERSION_1 else 72
+        return coefficient * self.bitrate * 1000 // self.sample_rate + self.padding
+
+    @property
+    def side_info_length(self) -> int:
+        mono = self.channel_mode == CHANNEL_MODE_MONO
+        if self.version == MPEG_VERSION_1:
+            return 17 if mono else 32
+        return 9 if mono else 17
+
+    def stream_key(self):
+        """Parameters that must match for frames to be concatenated"""
+        return (self.version, self.sample_rate_index, self.channel_mode == CHANNEL_MODE_MONO)
+
+
+def parse_frame_header(data: bytes, offset: int) -> Optional[FrameHeader]:
+    """Parse an MPEG Layer III frame header at offset, or return None"""
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0x3
+    layer = (b1 >> 1) & 0x3
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x3
+    if version == 1 or layer != LAYER_III:
+        return None
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    return FrameHeader(
+        version=version,
+        bitrate_index=bitrate_index,
+        sample_rate_index=sample_rate_index,
+        padding=(b2 >> 1) & 0x1,
+        channel_mode=b3 >> 6,
+        raw=bytes(data[offset:offset + 4]),
+    )
+
+
+def strip_id3(data: bytes) -> bytes:
+    """Remove a leading ID3v2 tag and a trailing ID3v1 tag"""
+    start = 0
+    while data[start:start + 3] == b"ID3" and len(data) >= start + 10:
+        size_bytes = data[start + 6:start + 10]
+        size = (size_bytes[0] << 21) | (size_bytes[1] << 14) | (size_bytes[2] << 7) | size_bytes[3]
+        footer = 10 if data[start + 5] & 0x10 else 0
+        start += 10 + size + footer
+
+    end = len(data)
+    if end - start >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    return data[start:end]
+
+
+def is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """True for Xing/Info/VBRI header frames that carry no audio"""
+    xing_offset = offset + 4 + header.side_info_length
+    if data[xing_offset:xing_offset + 4] in (b"Xing", b"Info"):
+        return True
+    return data[offset + 36:offset + 40] == b"VBRI"
+
+
+def iter_frames(data: bytes) -> Iterator[tuple]:
+    """Yield (data, offset, header) for every audio frame in an MP3 byte string"""
+    data = strip_id3(data)
+    offset = 0
+    first = True
+    while offset + 4 <= len(data):
+        header = parse_frame_header(data, offset)
+        if header is None or offset + header.frame_length > len(data):
+            offset += 1
+            continue
+
+        # Require the next frame to line up so stray 0xFF bytes are not taken as a sync
+        following = offset + header.frame_length
+        if following + 4 <= len(data) and parse_frame_header(data, following) is None:
+            offset += 1
+            continue
+
+        if not (first and is_info_frame(data, offset, header)):
+            yield data, offset, header
+        first = False
+        offset = following
+
+
+def _header_bytes(template: FrameHeader, bitrate_index: int) -> bytes:
+    b1 = 0xE0 | (template.version << 3) | (LAYER_III << 1) | 0x1  # no CRC
+    b2 = (bitrate_index << 4) | (template.sample_rate_index << 2)
+    return bytes([0xFF, b1, b2, template.raw[3]])
+
+
+def _empty_frame(template: FrameHeader, min_length: int = 0) -> bytearray:
+    """A frame with zeroed side info and main data, which decodes to silence"""
+    for bitrate_index in range(1, 15):
+        header = parse_frame_header(_header_bytes(template, bitrate_index), 0)
+        if header.frame_length >= min_length:
+            frame = bytearray(header.frame_length)
+            frame[:4] = header.raw
+            return frame
+    raise ValueError("No bitrate large enough for the requested frame")
+
+
+def build_info_frame(template: FrameHeader, frame_count: int, byte_count: int, vbr: bool) -> bytes:
+    """Build a Xing (VBR) or Info (CBR) frame with frame and byte counts"""
+    offset = 4 + template.side_info_length
+    frame = _empty_frame(template, max(offset + 16, template.frame_length - template.padding))
+    frame[offset:offset + 4] = b"Xing" if vbr else b"Info"
+    struct.pack_into(">III", frame, offset + 4, XING_FLAG_FRAMES | XING_FLAG_BYTES,
+                     frame_count, byte_count + len(frame))
+    return bytes(frame)
+
+
+@dataclass
+class JoinedMp3:
+    data: bytes
+    frame_count: int
+    sample_rate: int
+    duration_seconds: float
+
+
+def join_mp3(segments: List[bytes], pause_ms: float = 0.0) -> JoinedMp3:
+    """Concatenate MP3 segments frame by frame with optional silent pauses"""
+    frames = []
+    template = None
+    bitrates = set()
+    silence = b""
+    silent_count = 0
+
+    for index, segment in enumerate(segments):
+        segment_frames = list(iter_frames(segment))
+        if not segment_frames:
+            continue
+
+        for data, offset, header in segment_frames:
+            if template is None:
+                template = header
+                if pause_ms > 0:
+                    frame_ms = 1000.0 * header.samples_per_frame / header.sample_rate
+                    silent_count = int(round(pause_ms / frame_ms))
+                    # Same bitrate as the audio so a CBR stream stays CBR
+                    silence = bytes(_empty_frame(header, header.frame_length - header.padding)) * silent_count
+            elif header.stream_key() != template.stream_key():
+                raise ValueError(f"Segment {index} has a different sample rate or channel layout")
+            bitrates.add(header.bitrate_index)
+            frames.append(data[offset:offset + header.frame_length])
+
+        if silence and index < len(segments) - 1:
+            frames.append(silence)
+
+    if template is None:
+        raise ValueError("No MPEG Layer III frames found in segments")
+
+    if silence and frames[-1] is silence:
+        frames.pop()
+
+    audio = b"".join(frames)
+    silent_frames = sum(1 for f in frames if f is silence) * silent_count
+    frame_count = sum(1 for f in frames if f is not silence) + silent_frames
+    if silent_frames:
+        bitrates.add(parse_frame_header(silence, 0).bitrate_index)
+
+    info = build_info_frame(template, frame_count, len(audio), vbr=len(bitrates) > 1)
+    return JoinedMp3(
+        data=info + audio,
+        frame_count=frame_count,
+        sample_rate=template.sample_rate,
+        duration_seconds=frame_count * template.samples_per_frame / template.sample_rate,
+    )
@@ -0,0 +1,34 @@
+"""Tiered keyword matching over articles that were already fetched.
+
+A search ranks results in three tiers: articles containing the whole query,
+then articles containing any of its keywords, then the latest few articles
+per source. All tiers are evaluated in one pass over the same in-memory
+articles, so a query that misses costs one fetch per source instead of
+three.
+"""
+
+from typing import Any, Iterable, List
+
+
+def rank_by_tiers(source_articles: Iterable[List[Any]], query: str, latest_per_source: int = 2,
+                  use_keywords: bool = True, min_keyword_length: int = 1) -> List[Any]:
+    """Return the best non-empty tier: exact matches, keyword matches, or latest per source"""
+    query_lower = query.lower()
+    keywords = [kw for kw in query_lower.split() if len(kw) >= min_keyword_length]
+    exact, keyword, latest = [], [], []
+
+    for articles in source_articles:
+        latest.extend(articles[:latest_per_source])
+        for article in articles:
+            title = article.title.lower()
+            description = article.description.lower()
+            if query_lower in title or query_lower in description:
+                exact.append(article)
+            elif use_keywords and any(kw in title or kw in description for kw in keywords):
+                keyword.append(article)
+
+    if exact:
+        return exact
+    if keyword:
+        return keyword
+    return latest
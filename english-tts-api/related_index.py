@@ -0,0 +1,152 @@
+"""In-memory TF-IDF over ingested articles for "more like this" lookups.
+
+Terms (diacritic-folded words and word bigrams) are hashed into a fixed
+feature space, so no vocabulary has to be built or downloaded and new
+articles are added one at a time. Term frequencies of all documents live
+in flat CSR-style NumPy arrays; a query scatters its TF-IDF weights into a
+dense vector and scores every document with one gather and one
+np.add.reduceat, giving cosine similarities for the whole corpus in a few
+milliseconds. Document weights and norms are cached until the corpus
+changes.
+"""
+
+import math
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from search_index import fold_diacritics, tokenize
+
+N_FEATURES = 1 << 18
+
+
+def hashed_terms(title: str, body: str, title_weight: float = 2.0) -> Dict[int, float]:
+    """Feature index -> raw term count for folded unigrams and bigrams, title terms counted extra"""
+    counts: Dict[int, float] = {}
+    for text, weight in ((title, title_weight), (body, 1.0)):
+        words = [fold_diacritics(word) for word in tokenize(text)]
+        terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for term in terms:
+            feature = zlib.crc32(term.encode()) % N_FEATURES
+            counts[feature] = counts.get(feature, 0.0) + weight
+    return counts
+
+
+class RelatedIndex:
+    """Hashed TF-IDF vectors of recent articles with vectorized top-k cosine search"""
+
+    def __init__(self, max_documents: int = 20000):
+        self.max_documents = max_documents
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        # Document i owns _indices/_tf[_offsets[i]:_offsets[i + 1]]
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._tf = np.zeros(0, dtype=np.float32)
+        self._offsets = [0]
+        self._df = np.zeros(N_FEATURES, dtype=np.int32)
+        self._pending_indices: List[np.ndarray] = []
+        self._pending_tf: List[np.ndarray] = []
+        self._cache: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._positions
+
+    def add(self, doc_id: str, title: str, body: str) -> bool:
+        """Index an article; returns False if doc_id is already indexed"""
+        counts = hashed_terms(title, body)
+        if not counts:
+            return False
+        indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        with self._lock:
+            if doc_id in self._positions:
+                return False
+            self._positions[doc_id] = len(self._ids)
+            self._ids.append(doc_id)
+            self._pending_indices.append(indices)
+            self._pending_tf.append(1 + np.log(tf))  # sublinear term frequency
+            self._offsets.append(self._offsets[-1] + len(indices))
+            self._df[indices] += 1
+            self._cache = None
+            if len(self._ids) > self.max_documents:
+                self._evict(len(self._ids) - self.max_documents + self.max_documents // 10)
+            return True
+
+    def _flush(self):
+        if self._pending_indices:
+            self._indices = np.concatenate([self._indices] + self._pending_indices)
+            self._tf = np.concatenate([self._tf] + self._pending_tf)
+            self._pending_indices, self._pending_tf = [], []
+
+    def _evict(self, count: int):
+        """Drop the count oldest documents; they are a prefix of the arrays"""
+        self._flush()
+        cut = self._offsets[count]
+        np.subtract.at(self._df, self._indices[:cut], 1)
+        self._indices = self._indices[cut:].copy()
+        self._tf = self._tf[cut:].copy()
+        self._offsets = [offset - cut for offset in self._offsets[count:]]
+        self._ids = self._ids[count:]
+        self._positions = {doc_id: position for position, doc_id in enumerate(self._ids)}
+
+    def _weights(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(TF-IDF weight per stored entry, document norms, IDF per feature), cached per corpus version"""
+        if self._cache is None:
+            self._flush()
+            n = len(self._ids)
+            idf = (np.log((1 + n) / (1 + self._df.astype(np.float32))) + 1).astype(np.float32)
+            weights = self._tf * idf[self._indices]
+            starts = np.asarray(self._offsets[:-1], dtype=np.int64)
+            norms = np.sqrt(np.add.reduceat(weights * weights, starts)) if n else np.zeros(0, dtype=np.float32)
+            self._cache = (weights, np.maximum(norms, 1e-9), idf)
+        return self._cache
+
+    def _query_vector(self, counts: Dict[int, float], idf: np.ndarray) -> np.ndarray:
+        query = np.zeros(N_FEATURES, dtype=np.float32)
+        for feature, count in counts.items():
+            query[feature] = (1 + math.log(count)) * idf[feature]
+        norm = float(np.linalg.norm(query))
+        return query / norm if norm else query
+
+    def similar(self, doc_id: Optional[str] = None, title: str = "", body: str = "",
+                limit: int = 5, min_score: float = 0.05) -> List[Tuple[str, float]]:
+        """Top (doc_id, cosine) neighbours of an indexed document, or of the given text"""
+        with self._lock:
+            if not self._ids:
+                return []
+            weights, norms, idf = self._weights()
+            position = self._positions.get(doc_id) if doc_id is not None else None
+            if position is not None:
+                start, end = self._offsets[position], self._offsets[position + 1]
+                query = np.zeros(N_FEATURES, dtype=np.float32)
+                query[self._indices[start:end]] = weights[start:end] / norms[position]
+            else:
+                counts = hashed_terms(title, body)
+                if not counts:
+                    return []
+                query = self._query_vector(counts, idf)
+
+            starts = np.asarray(self._offsets[:-1], dtype=np.int64)
+            scores = np.add.reduceat(weights * query[self._indices], starts) / norms
+            if position is not None:
+                scores[position] = -1.0
+
+            k = min(limit, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            ids = self._ids
+            return [(ids[i], round(float(scores[i]), 4)) for i in top if scores[i] >= min_score]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._ids),
+                "entries": self._offsets[-1],
+                "features": N_FEATURES,
+            }
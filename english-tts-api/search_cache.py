@@ -0,0 +1,123 @@
+"""Short-lived cache of search results with request coalescing.
+
+Results are keyed by the normalized query plus whatever else shapes the
+answer (language, limit). Identical searches that arrive while one is
+already running wait on that computation instead of fanning out to every
+source again. Each entry remembers the sources it was built from and is
+dropped as soon as one of them produces new articles.
+"""
+
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_query(query: Optional[str]) -> str:
+    """NFC, lowercase, single-spaced query text"""
+    return WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFC", query or "").lower()).strip()
+
+
+@dataclass
+class CachedSearch:
+    value: Any
+    sources: Tuple[str, ...]
+    expires_at: float
+
+
+class SearchCache:
+    """TTL + LRU cache of search results; used from the event loop only"""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 500):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, CachedSearch]" = OrderedDict()
+        self._keys_by_source: Dict[str, Set[tuple]] = {}
+        self._generations: Dict[str, int] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    def _drop(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for source in entry.sources:
+            keys = self._keys_by_source.get(source)
+            if keys is not None:
+                keys.discard(key)
+
+    def _store(self, key: tuple, value: Any, sources: Tuple[str, ...]):
+        self._drop(key)
+        self._entries[key] = CachedSearch(value, sources, time.monotonic() + self.ttl)
+        for source in sources:
+            self._keys_by_source.setdefault(source, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    async def _compute(self, key: tuple, sources: Tuple[str, ...], compute: Callable[[], Awaitable[Any]],
+                       cacheable: Optional[Callable[[Any], bool]]):
+        generations = [self._generations.get(source, 0) for source in sources]
+        try:
+            value = await compute()
+        finally:
+            self._inflight.pop(key, None)
+        if cacheable is not None and not cacheable(value):
+            return value
+        # Sources that changed mid-search may not be reflected in the result
+        if generations == [self._generations.get(source, 0) for source in sources]:
+            self._store(key, value, sources)
+        return value
+
+    async def get_or_compute(self, key: tuple, sources: Iterable[str],
+                             compute: Callable[[], Awaitable[Any]],
+                             cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Return the cached result for key, or run compute once for all concurrent callers;
+        results rejected by cacheable are shared but not stored"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry.value
+            self._drop(key)
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(self._compute(key, tuple(sources), compute, cacheable))
+            self._inflight[key] = task
+        else:
+            self.stats["coalesced"] += 1
+        # A cancelled caller must not cancel the search other callers are waiting on
+        return await asyncio.shield(task)
+
+    def invalidate_source(self, source_key: str) -> int:
+        """Drop every result built from source_key; returns how many were dropped"""
+        self._generations[source_key] = self._generations.get(source_key, 0) + 1
+        keys = self._keys_by_source.pop(source_key, set())
+        for key in keys:
+            self._drop(key)
+        if keys:
+            self.stats["invalidations"] += len(keys)
+            logger.debug(f"Invalidated {len(keys)} cached searches for {source_key}")
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_source.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "ttl": self.ttl,
+        }
@@ -0,0 +1,163 @@
+"""In-memory inverted index with BM25 ranking for news articles.
+
+Titles and descriptions are tokenized on Unicode word boundaries. Every
+token is indexed twice: as written and with Vietnamese diacritics folded
+away, so "bong da" finds "bóng đá" while an accented query still prefers
+the exactly accented spelling. Documents are added one at a time as feeds
+arrive; a search only touches the posting lists of its query terms.
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Folded terms live in their own namespace so they never collide with exact ones
+FOLDED_PREFIX = "~"
+
+
+def fold_diacritics(text: str) -> str:
+    """Lowercase and strip combining marks; đ folds to d"""
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    stripped = "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
+    return stripped.replace("đ", "d")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased NFC word tokens"""
+    return TOKEN_PATTERN.findall(unicodedata.normalize("NFC", text.lower()))
+
+
+@dataclass
+class IndexedDocument:
+    doc_id: str
+    payload: Any
+    group: Optional[str]
+    length: float
+    folded_text: str
+    terms: Dict[str, float]
+
+
+class SearchIndex:
+    """BM25 over title and description, with title terms weighted higher"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: float = 2.0,
+                 folded_weight: float = 0.5, max_documents: int = 5000):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.folded_weight = folded_weight
+        self.max_documents = max_documents
+        self._documents: "OrderedDict[str, IndexedDocument]" = OrderedDict()
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def _weighted_terms(self, title: str, description: str) -> Dict[str, float]:
+        terms: Dict[str, float] = {}
+        for text, weight in ((title, self.title_weight), (description, 1.0)):
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0.0) + weight
+                folded = FOLDED_PREFIX + fold_diacritics(token)
+                terms[folded] = terms.get(folded, 0.0) + weight
+        return terms
+
+    def add(self, doc_id: str, title: str, description: str, payload: Any = None,
+            group: Optional[str] = None) -> bool:
+        """Index a document; returns False if doc_id is already indexed"""
+        with self._lock:
+            if doc_id in self._documents:
+                return False
+
+            terms = self._weighted_terms(title, description)
+            # Length counts each token once, not its folded twin
+            length = sum(weight for term, weight in terms.items() if not term.startswith(FOLDED_PREFIX))
+            self._documents[doc_id] = IndexedDocument(
+                doc_id=doc_id,
+                payload=payload,
+                group=group,
+                length=length,
+                folded_text=fold_diacritics(f"{title} {description}"),
+                terms=terms,
+            )
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = frequency
+            self._total_length += length
+
+            while len(self._documents) > self.max_documents:
+                self.remove(next(iter(self._documents)))
+            return True
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            document = self._documents.pop(doc_id, None)
+            if document is None:
+                return
+            for term in document.terms:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[term]
+            self._total_length -= document.length
+
+    def _idf(self, document_frequency: int) -> float:
+        n = len(self._documents)
+        return math.log(1 + (n - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _score_term(self, term: str, weight: float, scores: Dict[str, float], average_length: float):
+        postings = self._postings.get(term)
+        if not postings:
+            return
+        idf = self._idf(len(postings))
+        for doc_id, frequency in postings.items():
+            length = self._documents[doc_id].length
+            norm = frequency + self.k1 * (1 - self.b + self.b * length / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * frequency * (self.k1 + 1) / norm
+
+    def search(self, query: str, limit: int = 10,
+               groups: Optional[Iterable[str]] = None) -> List[Tuple[Any, float]]:
+        """Return (payload, score) pairs, whole-phrase matches first, then by BM25"""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        allowed = set(groups) if groups is not None else None
+
+        with self._lock:
+            if not self._documents:
+                return []
+            average_length = max(self._total_length / len(self._documents), 1.0)
+            scores: Dict[str, float] = {}
+            for token in dict.fromkeys(query_tokens):
+                self._score_term(token, 1.0, scores, average_length)
+                self._score_term(FOLDED_PREFIX + fold_diacritics(token), self.folded_weight, scores, average_length)
+
+            phrase = " ".join(fold_diacritics(token) for token in query_tokens)
+            ranked = []
+            for doc_id, score in scores.items():
+                document = self._documents[doc_id]
+                if allowed is not None and document.group not in allowed:
+                    continue
+                ranked.append((phrase in document.folded_text, score, document.payload))
+
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [(payload, score) for _, score, payload in ranked[:limit]]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "terms": len(self._postings),
+                "average_length": round(self._total_length / len(self._documents), 1) if self._documents else 0.0,
+            }
@@ -3,14 +3,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-import feedparser
 import hashlib
 from datetime import datetime
 from typing import List, Dict, Any
-import re
+from http_client import get_http_client
+from fast_feed_parser import parse_feed_async
 
 app = FastAPI()
 
+# Pooled HTTP client shared by every outbound fetch
+http_client = get_http_client()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -19,6 +22,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup():
+    await http_client.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await http_client.close()
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
@@ -46,22 +57,17 @@ async def search_news(request: dict):
     
     for source in sources.get(language, sources["vi"]):
         try:
-            feed = feedparser.parse(source["url"])
+            response = await http_client.get(source["url"])
+            response.raise_for_status()
+            items = await parse_feed_async(response.body, max_items=5)
             
-            for entry in feed.entries[:5]:
-                title = entry.get('title', '').strip()
-                description = entry.get('description', '').strip()
-                link = entry.get('link', '')
+            for item in items:
+                title = item.title.strip()
+                description = item.description.strip()
+                link = item.link
                 
                 # Extract image
-                image_url = ""
-                if hasattr(entry, 'content'):
-                    for content in entry.content:
-                        if content.type == 'text/html':
-                            img_match = re.search(r'<img[^>]+src="([^"]+)"', content.value)
-                            if img_match:
-                                image_url = img_match.group(1)
-                                break
+                image_url = item.image_url or ""
                 
                 if not image_url:
                     image_url = "https://images.unsplash.com/photo-1559757148-5c350d0d3c56?w=400&h=250&fit=crop"
@@ -0,0 +1,95 @@
+"""On-disk snapshots of the last good parse of each news feed.
+
+Every time a feed parses into at least one article, its articles are
+written to output/snapshots/<source>.json (atomically, via a temporary
+file). When a live fetch is slow or failing, the snapshot is served at
+once together with its age while a background refresh brings the source
+up to date, so upstream outages degrade to slightly old real news rather
+than timeouts.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Snapshot:
+    source_key: str
+    url: str
+    articles: List[dict]
+    saved_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.saved_at)
+
+
+class SnapshotStore:
+    """Last good articles per source, kept in memory and mirrored to disk"""
+
+    def __init__(self, directory: str = os.path.join("output", "snapshots")):
+        self.directory = directory
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._loaded = set()
+        self._lock = threading.Lock()
+
+    def _path(self, source_key: str) -> str:
+        return os.path.join(self.directory, f"{source_key}.json")
+
+    def get(self, source_key: str) -> Optional[Snapshot]:
+        """Snapshot for source_key, read from disk on first access"""
+        with self._lock:
+            if source_key in self._loaded:
+                return self._snapshots.get(source_key)
+            self._loaded.add(source_key)
+
+        try:
+            with open(self._path(source_key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            snapshot = Snapshot(source_key, data.get("url", ""), data["articles"], data["saved_at"])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable snapshot for {source_key}: {e}")
+            return None
+
+        with self._lock:
+            # A save that raced the read is newer
+            return self._snapshots.setdefault(source_key, snapshot)
+
+    def save(self, source_key: str, url: str, articles: List[dict]):
+        """Replace the snapshot for source_key; empty parses never overwrite a good one"""
+        if not articles:
+            return
+        snapshot = Snapshot(source_key, url, articles, time.time())
+        with self._lock:
+            self._snapshots[source_key] = snapshot
+            self._loaded.add(source_key)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(source_key)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"url": url, "saved_at": snapshot.saved_at, "articles": articles}, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not persist snapshot for {source_key}: {e}")
+
+    def status(self) -> Dict[str, dict]:
+        with self._lock:
+            snapshots = list(self._snapshots.values())
+        return {
+            snapshot.source_key: {
+                "articles": len(snapshot.articles),
+                "age_seconds": round(snapshot.age_seconds, 1),
+            }
+            for snapshot in snapshots
+        }
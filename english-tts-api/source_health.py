@@ -0,0 +1,164 @@
+"""Per-source health statistics and circuit breaking for news feeds.
+
+Every network fetch of a source is timed and recorded. After
+failure_threshold consecutive failures the source's circuit opens and
+fetches are refused immediately instead of waiting for another timeout.
+Once the cooldown has passed a single probe fetch is let through: success
+closes the circuit, failure reopens it with a doubled cooldown.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class SourceUnavailableError(Exception):
+    """Raised instead of fetching a source whose circuit is open"""
+
+    def __init__(self, source_key: str, retry_in: float):
+        super().__init__(f"{source_key} circuit open, next probe in {retry_in:.0f}s")
+        self.source_key = source_key
+        self.retry_in = retry_in
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+
+@dataclass
+class SourceHealth:
+    source_key: str
+    window: int
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    # Consecutive times the circuit opened without a successful probe
+    open_streak: int = 0
+    retry_at: float = 0.0
+    calls: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_error: Optional[str] = None
+    last_error_at: Optional[float] = None
+    last_success_at: Optional[float] = None
+    outcomes: deque = field(default=None)
+
+    def __post_init__(self):
+        # (succeeded, latency in ms) of the most recent fetches
+        self.outcomes = deque(maxlen=self.window)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(latency for _, latency in self.outcomes)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))], 1)
+
+        successes = sum(1 for succeeded, _ in self.outcomes if succeeded)
+        return {
+            "state": self.state,
+            "success_rate": round(successes / len(self.outcomes), 3) if self.outcomes else None,
+            "latency_ms": {"p50": percentile(0.5), "p90": percentile(0.9), "p99": percentile(0.99)},
+            "calls": self.calls,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": round(max(0.0, self.retry_at - time.monotonic()), 1) if self.state == OPEN else None,
+            "last_error": self.last_error,
+            "last_error_at": _isoformat(self.last_error_at),
+            "last_success_at": _isoformat(self.last_success_at),
+        }
+
+
+class SourceHealthRegistry:
+    """Health and circuit state for every source, created on first use"""
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0,
+                 max_cooldown: float = 600.0, window: int = 50):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.window = window
+        self._sources: Dict[str, SourceHealth] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, source_key: str) -> SourceHealth:
+        if source_key not in self._sources:
+            self._sources[source_key] = SourceHealth(source_key, self.window)
+        return self._sources[source_key]
+
+    def allow(self, source_key: str) -> bool:
+        """Whether a fetch may go out now; admits one probe once an open circuit cools down"""
+        with self._lock:
+            health = self._get(source_key)
+            if health.state == CLOSED:
+                return True
+            if health.state == OPEN and time.monotonic() >= health.retry_at:
+                health.state = HALF_OPEN
+                logger.info(f"Probing {source_key} after circuit cooldown")
+                return True
+            health.skipped += 1
+            return False
+
+    def record_success(self, source_key: str, latency_ms: float):
+        with self._lock:
+            health = self._get(source_key)
+            health.calls += 1
+            health.outcomes.append((True, latency_ms))
+            health.last_success_at = time.time()
+            health.consecutive_failures = 0
+            if health.state != CLOSED:
+                logger.info(f"{source_key} recovered, closing circuit")
+            health.state = CLOSED
+            health.open_streak = 0
+
+    def record_failure(self, source_key: str, latency_ms: float, error: str):
+        with self._lock:
+            health = self._get(source_key)
+            health.calls += 1
+            health.failures += 1
+            health.outcomes.append((False, latency_ms))
+            health.last_error = error
+            health.last_error_at = time.time()
+            health.consecutive_failures += 1
+            if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                cooldown = min(self.max_cooldown, self.cooldown * (2 ** health.open_streak))
+                health.open_streak += 1
+                health.state = OPEN
+                health.retry_at = time.monotonic() + cooldown
+                logger.warning(f"Opening circuit for {source_key} for {cooldown:.0f}s: {error}")
+
+    @contextmanager
+    def track(self, source_key: str):
+        """Time the enclosed fetch and record its outcome; raises SourceUnavailableError if the circuit is open"""
+        if not self.allow(source_key):
+            with self._lock:
+                retry_in = max(0.0, self._get(source_key).retry_at - time.monotonic())
+            raise SourceUnavailableError(source_key, retry_in)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            # Cancellation here is almost always a caller's timeout firing
+            self.record_failure(source_key, (time.perf_counter() - start) * 1000, str(e) or type(e).__name__)
+            raise
+        self.record_success(source_key, (time.perf_counter() - start) * 1000)
+
+    def status(self, source_key: str) -> dict:
+        with self._lock:
+            return self._get(source_key).snapshot()
+
+    def status_all(self) -> Dict[str, dict]:
+        with self._lock:
+            return {key: health.snapshot() for key, health in self._sources.items()}
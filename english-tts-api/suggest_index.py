@@ -0,0 +1,175 @@
+"""Type-ahead suggestions from article titles and past searches.
+
+Candidate phrases are the 1-3 word n-grams of ingested titles plus whole
+past queries. Each phrase keeps an exponentially decayed frequency, so
+phrases that are both common and recent rank first. Lookups go against
+an immutable snapshot: diacritic-folded phrases in a sorted array, found
+by binary search, with the best completions of every 1-3 character
+prefix precomputed so short prefixes with huge match ranges cost the
+same as long ones. Snapshots are rebuilt off the request path.
+"""
+
+import heapq
+import math
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from search_index import fold_diacritics, tokenize
+
+# Words that make poor suggestion boundaries ("của", "the")
+STOPWORDS = {
+    "và", "của", "các", "những", "là", "có", "cho", "với", "trong", "được", "đã", "sẽ", "này", "khi",
+    "từ", "tại", "về", "một", "người", "không", "để", "ra", "vào", "theo", "đến", "sau", "trên",
+    "the", "a", "an", "of", "to", "in", "and", "for", "on", "at", "by", "with", "is", "are", "as", "from",
+}
+
+PRECOMPUTED_PREFIX_LENGTH = 3
+# Past searches count for more than a phrase appearing in one more headline
+QUERY_WEIGHT = 3.0
+TITLE_WEIGHT = 1.0
+
+
+@dataclass
+class Phrase:
+    text: str
+    score: float
+    updated_at: float
+    searched: bool = False
+
+
+@dataclass
+class SuggestSnapshot:
+    keys: List[str]
+    texts: List[str]
+    scores: List[float]
+    top: Dict[str, List[int]]
+
+
+def normalize_phrase(text: str) -> str:
+    return " ".join(tokenize(text))
+
+
+def fold_phrase(text: str) -> str:
+    return fold_diacritics(" ".join(text.lower().split()))
+
+
+def title_phrases(title: str, max_words: int = 3) -> List[str]:
+    """Word n-grams of a title that neither start nor end with a stopword"""
+    words = tokenize(title)
+    phrases = []
+    for start in range(len(words)):
+        for length in range(1, max_words + 1):
+            gram = words[start:start + length]
+            if len(gram) < length:
+                break
+            if gram[0] in STOPWORDS or gram[-1] in STOPWORDS:
+                continue
+            if length == 1 and (len(gram[0]) < 3 or gram[0].isdigit()):
+                continue
+            phrases.append(" ".join(gram))
+    return phrases
+
+
+class SuggestIndex:
+    """Decayed-frequency phrase counts with a rebuildable prefix-search snapshot"""
+
+    def __init__(self, half_life_hours: float = 72.0, max_phrases: int = 50000, top_k: int = 10):
+        self.decay = math.log(2) / (half_life_hours * 3600)
+        self.max_phrases = max_phrases
+        self.top_k = top_k
+        self._phrases: Dict[str, Phrase] = {}
+        self._lock = threading.Lock()
+        self._snapshot = SuggestSnapshot([], [], [], {})
+        self.dirty = False
+        self.built_at: Optional[float] = None
+
+    def _decayed(self, phrase: Phrase, now: float) -> float:
+        return phrase.score * math.exp(-self.decay * max(0.0, now - phrase.updated_at))
+
+    def _add(self, text: str, weight: float, timestamp: float, searched: bool):
+        key = fold_phrase(text)
+        if not key:
+            return
+        phrase = self._phrases.get(key)
+        if phrase is None:
+            self._phrases[key] = Phrase(text, weight, timestamp, searched)
+            return
+        if timestamp >= phrase.updated_at:
+            phrase.score = self._decayed(phrase, timestamp) + weight
+            phrase.updated_at = timestamp
+        else:
+            phrase.score += weight * math.exp(-self.decay * (phrase.updated_at - timestamp))
+        # Show what people typed, accents and all, over a headline fragment
+        if searched and not phrase.searched:
+            phrase.text, phrase.searched = text, True
+
+    def add_title(self, title: str, timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for phrase in title_phrases(title):
+                self._add(phrase, TITLE_WEIGHT, timestamp, False)
+            self.dirty = True
+
+    def add_query(self, query: str, count: int = 1, timestamp: Optional[float] = None):
+        text = normalize_phrase(query)
+        if not text:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._add(text, QUERY_WEIGHT * count, timestamp, True)
+            self.dirty = True
+
+    def rebuild(self):
+        """Build a new lookup snapshot; safe to run in a worker thread"""
+        now = time.time()
+        with self._lock:
+            scored = [(self._decayed(phrase, now), key, phrase) for key, phrase in self._phrases.items()]
+            self.dirty = False
+            if len(scored) > self.max_phrases:
+                scored = heapq.nlargest(self.max_phrases, scored, key=lambda item: item[0])
+                self._phrases = {key: phrase for _, key, phrase in scored}
+
+        scored.sort(key=lambda item: item[1])
+        keys = [key for _, key, _ in scored]
+        texts = [phrase.text for _, _, phrase in scored]
+        scores = [score for score, _, _ in scored]
+
+        # Best completions of every short prefix, so the widest ranges are never scanned per request
+        heaps: Dict[str, List[Tuple[float, int]]] = {}
+        for position, (score, key) in enumerate(zip(scores, keys)):
+            for length in range(1, min(PRECOMPUTED_PREFIX_LENGTH, len(key)) + 1):
+                heap = heaps.setdefault(key[:length], [])
+                if len(heap) < self.top_k:
+                    heapq.heappush(heap, (score, position))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, position))
+        top = {prefix: [position for _, position in sorted(heap, reverse=True)] for prefix, heap in heaps.items()}
+
+        self._snapshot = SuggestSnapshot(keys, texts, scores, top)
+        self.built_at = now
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Tuple[str, float]]:
+        """Up to limit (text, score) completions of prefix, best first"""
+        key = fold_phrase(prefix)
+        if not key:
+            return []
+        snapshot = self._snapshot
+        if len(key) <= PRECOMPUTED_PREFIX_LENGTH:
+            positions = snapshot.top.get(key, [])[:limit]
+        else:
+            start = bisect_left(snapshot.keys, key)
+            end = bisect_left(snapshot.keys, key + "\uffff", lo=start)
+            positions = heapq.nlargest(limit, range(start, end), key=snapshot.scores.__getitem__)
+        return [(snapshot.texts[position], round(snapshot.scores[position], 3)) for position in positions]
+
+    def stats(self) -> dict:
+        return {
+            "phrases": len(self._phrases),
+            "indexed": len(self._snapshot.keys),
+            "prefixes": len(self._snapshot.top),
+            "dirty": self.dirty,
+            "built_at": self.built_at,
+        }
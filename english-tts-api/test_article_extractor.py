@@ -0,0 +1,89 @@
+import asyncio
+
+from article_extractor import MAX_PAGE_BYTES, ArticleExtractor, decode_html, extract_content, is_noise
+from http_client import HttpResponse, ResponseTooLargeError
+
+BODY = ("Mưa lớn kéo dài nhiều ngày khiến nước sông dâng cao, nhiều khu dân cư bị ngập sâu, "
+        "giao thông bị chia cắt.")
+
+PAGE = f"""
+<html><head><title>Fallback title</title><script>var x = "{BODY}";</script></head>
+<body>
+  <nav><p>Trang chủ, Thời sự, Thế giới, Kinh doanh, Giải trí, Thể thao, Pháp luật</p></nav>
+  <h1>Miền Trung   ngập lụt</h1>
+  <div class="sidebar"><p>Tin liên quan: bão số 4 đang tiến vào Biển Đông, hướng về miền Trung</p></div>
+  <article class="detail">
+    <p>{BODY}</p>
+    <p>Chính quyền địa phương đã sơ tán hàng nghìn hộ dân, lực lượng cứu hộ túc trực, hỗ trợ người dân.</p>
+    <div class="share"><p>Chia sẻ bài viết này lên mạng xã hội của bạn để bạn bè cùng biết, cùng đọc</p></div>
+    <p><a href="/x">Một đường link rất dài chiếm gần như toàn bộ đoạn văn này</a> ngắn.</p>
+    <p>Xem thêm: các tin tức khác về tình hình thời tiết trong tuần này trên cả nước</p>
+    <p>{BODY}</p>
+  </article>
+  <footer><p>Bản quyền thuộc về tòa soạn, mọi hình thức sao chép phải ghi rõ nguồn</p></footer>
+</body></html>
+"""
+
+
+def test_extract_content_keeps_article_paragraphs_only():
+    article = extract_content(PAGE)
+    assert article.title == "Miền Trung ngập lụt"
+    assert article.paragraphs == 2
+    assert article.content.split("\n\n") == [
+        BODY,
+        "Chính quyền địa phương đã sơ tán hàng nghìn hộ dân, lực lượng cứu hộ túc trực, hỗ trợ người dân.",
+    ]
+
+
+def test_extract_content_falls_back_to_title_tag():
+    article = extract_content("<html><head><title> Only   title </title></head><body></body></html>")
+    assert article.title == "Only title"
+    assert article.content == ""
+
+
+def test_is_noise():
+    assert is_noise("Quá ngắn")
+    assert is_noise("Đăng ký nhận bản tin mỗi sáng để không bỏ lỡ thông tin quan trọng")
+    assert not is_noise(BODY)
+
+
+def test_decode_html_charset_sources():
+    text = "Tiếng Việt"
+    assert decode_html(text.encode("utf-8")) == text
+    assert decode_html(text.encode("utf-16"), "text/html; charset=utf-16") == text
+    latin = "café".encode("latin-1")
+    assert decode_html(b'<meta charset="iso-8859-1">' + latin).endswith("café")
+    assert decode_html(text.encode("utf-8"), "text/html; charset=bogus") == text
+
+
+class FakeClient:
+    def __init__(self, page):
+        self.page = page
+        self.requests = []
+
+    async def get(self, url, headers=None, timeout=None, max_bytes=None):
+        self.requests.append((url, max_bytes))
+        if len(self.page) > max_bytes:
+            raise ResponseTooLargeError(url, max_bytes)
+        return HttpResponse(url, 200, {"Content-Type": "text/html; charset=utf-8"}, self.page)
+
+
+def test_extractor_fetches_with_a_size_cap():
+    client = FakeClient(PAGE.encode())
+    extractor = ArticleExtractor(client=client)
+    article = asyncio.run(extractor.extract("https://example.com/a"))
+    assert article.paragraphs == 2
+    assert client.requests == [("https://example.com/a", MAX_PAGE_BYTES)]
+
+
+def test_oversized_page_is_an_extraction_failure():
+    client = FakeClient(PAGE.encode())
+    extractor = ArticleExtractor(client=client, max_page_bytes=1024)
+
+    async def main():
+        return await extractor.extract("https://example.com/a"), await extractor.extract("https://example.com/a")
+
+    assert asyncio.run(main()) == (None, None)
+    # Remembered as failed, not fetched again right away
+    assert len(client.requests) == 1
+    assert extractor.stats["failures"] == 1
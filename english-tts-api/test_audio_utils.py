@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from audio_utils import change_speed_and_pitch, read_wav, resample, time_stretch, write_wav
+
+
+def tone(frequency, seconds, sample_rate):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def dominant_frequency(samples, sample_rate):
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return np.argmax(spectrum) * sample_rate / len(samples)
+
+
+def test_wav_round_trip():
+    samples = tone(440, 0.25, 16000)
+    decoded, sample_rate = read_wav(write_wav(samples, 16000))
+    assert sample_rate == 16000
+    assert np.max(np.abs(decoded - samples)) < 1e-3
+
+
+def test_resample_keeps_frequency_and_scales_length():
+    samples = tone(440, 1.0, 44100)
+    resampled = resample(samples, 44100, 22050)
+    assert len(resampled) == 22050
+    assert dominant_frequency(resampled, 22050) == pytest.approx(440, abs=2)
+
+
+@pytest.mark.parametrize("rate", [0.8, 1.25])
+def test_time_stretch_changes_duration_not_pitch(rate):
+    samples = tone(440, 1.0, 16000)
+    stretched = time_stretch(samples, rate)
+    assert len(stretched) == int(round(16000 / rate))
+    assert dominant_frequency(stretched, 16000) == pytest.approx(440, abs=5)
+
+
+def test_change_speed_and_pitch():
+    samples = tone(440, 1.0, 16000)
+    assert change_speed_and_pitch(samples, 16000) is samples
+
+    shifted = change_speed_and_pitch(samples, 16000, speed=1.0, pitch=1.5)
+    assert abs(len(shifted) - 16000) < 50
+    assert dominant_frequency(shifted, 16000) == pytest.approx(660, abs=10)
+    assert np.max(np.abs(shifted)) <= 1.0
@@ -0,0 +1,84 @@
+import numpy as np
+
+from audio_utils import read_wav, write_wav
+from bulletin_assembler import BulletinAssembler, normalize_loudness, trim_silence
+
+
+def tone(seconds, sample_rate, amplitude=0.3, frequency=440.0):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def padded_tone(seconds, sample_rate, silence=0.5):
+    quiet = np.zeros(int(silence * sample_rate), dtype=np.float32)
+    return np.concatenate([quiet, tone(seconds, sample_rate), quiet])
+
+
+def test_trim_silence_keeps_only_the_voiced_part_plus_margin():
+    samples = padded_tone(1.0, 16000)
+    trimmed = trim_silence(samples, 16000, margin_ms=0)
+    assert abs(len(trimmed) - 16000) <= 160
+
+
+def test_trim_silence_of_silence_is_empty():
+    assert len(trim_silence(np.zeros(8000, dtype=np.float32), 16000)) == 0
+
+
+def test_normalize_loudness_hits_target_without_clipping():
+    normalized = normalize_loudness(tone(1.0, 16000, amplitude=0.01), 16000, target_db=-20.0)
+    rms_db = 20 * np.log10(np.sqrt(np.mean(normalized ** 2)))
+    assert abs(rms_db + 20.0) < 0.5
+
+    loud = normalize_loudness(tone(1.0, 16000, amplitude=0.9), 16000, target_db=0.0)
+    assert np.max(np.abs(loud)) <= 0.98 + 1e-6
+
+
+def test_render_resamples_and_inserts_pauses():
+    assembler = BulletinAssembler(sample_rate=22050, pause_ms=500)
+    assembler.add_samples(padded_tone(1.0, 44100), 44100)
+    assembler.add_wav(write_wav(padded_tone(1.0, 16000), 16000))
+    output = assembler.render()
+
+    margin = 2 * int(22050 * 0.03)
+    expected = 2 * (22050 + margin) + int(22050 * 0.5)
+    assert abs(len(output) - expected) < 1000
+
+
+def test_silent_last_segment_adds_no_trailing_pause():
+    with_silence = BulletinAssembler(sample_rate=16000, pause_ms=500)
+    with_silence.add_samples(tone(1.0, 16000), 16000)
+    with_silence.add_samples(np.zeros(16000, dtype=np.float32), 16000)
+
+    alone = BulletinAssembler(sample_rate=16000, pause_ms=500)
+    alone.add_samples(tone(1.0, 16000), 16000)
+
+    assert len(with_silence.render()) == len(alone.render())
+
+
+def test_silent_middle_segment_keeps_a_single_pause():
+    assembler = BulletinAssembler(sample_rate=16000, pause_ms=500)
+    assembler.add_samples(tone(1.0, 16000), 16000, pause_ms=200)
+    assembler.add_samples(np.zeros(16000, dtype=np.float32), 16000)
+    assembler.add_samples(tone(1.0, 16000), 16000)
+    output = assembler.render()
+
+    voiced = len(trim_silence(tone(1.0, 16000), 16000))
+    assert len(output) == 2 * voiced + int(16000 * 0.2)
+
+
+def test_to_wav_round_trips():
+    assembler = BulletinAssembler(sample_rate=22050)
+    assembler.add_samples(tone(0.5, 22050), 22050)
+    samples, sample_rate = read_wav(assembler.to_wav())
+    assert sample_rate == 22050
+    assert len(samples) == len(assembler.render())
+
+
+def test_negative_pause_is_treated_as_no_pause():
+    assembler = BulletinAssembler(sample_rate=16000, pause_ms=-500)
+    assembler.add_samples(tone(1.0, 16000), 16000)
+    assembler.add_samples(tone(1.0, 16000), 16000, pause_ms=-200)
+    assembler.add_samples(tone(1.0, 16000), 16000)
+
+    voiced = len(trim_silence(tone(1.0, 16000), 16000))
+    assert len(assembler.render()) == 3 * voiced
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from dedup import NearDuplicateIndex, cluster_articles, dedupe_articles, estimate_similarity, minhash_signature
+
+
+def article(title, description=""):
+    return SimpleNamespace(title=title, description=description)
+
+
+STORY = "Bão số 3 đổ bộ vào Quảng Ninh gây mưa lớn trên diện rộng ở miền Bắc, nhiều tuyến đường ngập sâu"
+REWRITE = "Bão số 3 đổ bộ Quảng Ninh gây mưa lớn trên diện rộng ở miền Bắc, nhiều tuyến đường bị ngập sâu"
+OTHER = "Giá vàng trong nước hôm nay tăng mạnh theo đà thế giới, vượt mốc 90 triệu đồng mỗi lượng"
+
+
+def test_signatures_estimate_similarity():
+    assert estimate_similarity(minhash_signature(STORY), minhash_signature(STORY)) == 1.0
+    assert estimate_similarity(minhash_signature(STORY), minhash_signature(REWRITE)) > 0.5
+    assert estimate_similarity(minhash_signature(STORY), minhash_signature(OTHER)) < 0.2
+
+
+def test_index_assigns_rewrites_to_the_first_cluster():
+    index = NearDuplicateIndex()
+    assert index.add(STORY) == 0
+    assert index.add(OTHER) == 1
+    assert index.add(REWRITE) == 0
+
+
+def test_diacritics_do_not_split_stories():
+    unaccented = "Bao so 3 do bo vao Quang Ninh gay mua lon tren dien rong o mien Bac, nhieu tuyen duong ngap sau"
+    assert NearDuplicateIndex().add(STORY) == 0
+    index = NearDuplicateIndex()
+    index.add(STORY)
+    assert index.add(unaccented) == 0
+
+
+def test_dedupe_keeps_first_member_and_respects_limit():
+    articles = [article(STORY), article(REWRITE), article(OTHER)]
+    assert dedupe_articles(articles) == [articles[0], articles[2]]
+    assert dedupe_articles(articles, limit=1) == [articles[0]]
+    assert cluster_articles(articles) == [[articles[0], articles[1]], [articles[2]]]
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from engine_router import EngineRouter, TTSEngine
+
+
+class FakeEngine(TTSEngine):
+    def __init__(self, name, quality, cost, latency_ms, voices=(), available=True, max_concurrency=4):
+        self.name = name
+        self.languages = {"vi", "en"}
+        self.voices = {voice: {} for voice in voices}
+        self.quality = quality
+        self.cost = cost
+        self.default_latency_ms = latency_ms
+        self.max_concurrency = max_concurrency
+        self.available = available
+        self.calls = 0
+
+    def is_available(self):
+        return self.available
+
+    def synthesize(self, text, language, voice=None):
+        self.calls += 1
+        return self.name.encode(), "audio/wav"
+
+
+def make_router(**overrides):
+    engines = {
+        "coqui": FakeEngine("coqui", quality=3, cost=5, latency_ms=4000, voices=["coqui_default"]),
+        "azure": FakeEngine("azure", quality=3, cost=3, latency_ms=600, voices=["azure_vi_male"]),
+        "gtts": FakeEngine("gtts", quality=2, cost=2, latency_ms=800, voices=["google_vn_male"]),
+        "espeak": FakeEngine("espeak", quality=1, cost=0, latency_ms=20, voices=["espeak_vi_male"],
+                             max_concurrency=16),
+    }
+    for name, attrs in overrides.items():
+        for key, value in attrs.items():
+            setattr(engines[name], key, value)
+    return EngineRouter(list(engines.values())), engines
+
+
+def test_routes_to_fastest_engine_meeting_quality():
+    router, _ = make_router()
+    decision = router.route("vi")
+    assert decision.engine.name == "azure"
+    assert decision.reason == "fastest"
+
+
+def test_requested_voice_is_honoured():
+    router, _ = make_router()
+    decision = router.route("vi", "google_vn_male")
+    assert decision.engine.name == "gtts"
+    assert decision.reason == "voice"
+
+
+def test_unavailable_voice_falls_back_to_fastest_engine_meeting_quality():
+    router, _ = make_router(azure={"available": False})
+    decision = router.route("vi", "azure_vi_male")
+    # eSpeak is cheaper and faster but below the quality floor
+    assert decision.engine.name == "gtts"
+    assert decision.reason == "degraded-unavailable"
+
+
+def test_unavailable_voice_uses_measured_latency():
+    router, _ = make_router(azure={"available": False})
+    router.stats["coqui"].latencies.extend([300.0] * 10)
+    router.stats["gtts"].latencies.extend([1500.0] * 10)
+    assert router.route("vi", "azure_vi_male").engine.name == "coqui"
+
+
+def test_unavailable_voice_drops_quality_floor_only_when_nothing_meets_it():
+    router, _ = make_router(azure={"available": False}, coqui={"available": False}, gtts={"available": False})
+    decision = router.route("vi", "azure_vi_male")
+    assert decision.engine.name == "espeak"
+
+
+def test_overload_degrades_to_cheapest_engine_with_room():
+    router, _ = make_router()
+    for name in ("azure", "coqui", "gtts"):
+        router.stats[name].in_flight = router.engines[name].max_concurrency
+    decision = router.route("vi")
+    assert decision.engine.name == "espeak"
+    assert decision.reason == "degraded-overload"
+
+
+def test_no_engine_for_language():
+    router, _ = make_router()
+    with pytest.raises(LookupError):
+        router.route("fr")
+
+
+def test_synthesize_falls_through_failing_engine():
+    router, engines = make_router()
+
+    def fail(text, language, voice=None):
+        raise RuntimeError("boom")
+
+    engines["azure"].synthesize = fail
+    audio, media_type, decision = asyncio.run(router.synthesize("xin chào", "vi"))
+    assert audio == b"gtts"
+    assert decision.reason.endswith("-after-failure")
+    assert router.stats["azure"].failures == 1
+    assert router.stats["gtts"].completed == 1
@@ -0,0 +1,69 @@
+import io
+import wave
+
+import pytest
+
+from espeak_engine import ESPEAK_PITCH, ESPEAK_RATE, EE_OK, EspeakEngine
+
+
+class FakeLibrary:
+    def __init__(self, engine):
+        self.engine = engine
+        self.calls = []
+
+    def espeak_SetVoiceByName(self, name):
+        self.calls.append(("voice", name.decode()))
+        return EE_OK if name != b"missing" else 1
+
+    def espeak_SetParameter(self, param, value, relative):
+        self.calls.append(("param", param, value))
+        return EE_OK
+
+    def espeak_Synth(self, data, size, position, position_type, end_position, flags, unique_id, user_data):
+        # Stands in for the synth callback delivering PCM
+        self.engine._buffer.append(b"\x01\x00" * 10)
+        return EE_OK
+
+
+@pytest.fixture
+def engine():
+    engine = EspeakEngine()
+    engine._lib = FakeLibrary(engine)
+    engine._sample_rate = 22050
+    return engine
+
+
+def test_unchanged_voice_and_parameters_are_not_reapplied(engine):
+    engine.synthesize_pcm("một", voice="vi", speed=150, pitch=50)
+    engine.synthesize_pcm("hai", voice="vi", speed=150, pitch=50)
+    assert engine._lib.calls == [("voice", "vi"), ("param", ESPEAK_RATE, 150), ("param", ESPEAK_PITCH, 50)]
+
+
+def test_changed_parameter_is_applied_alone(engine):
+    engine.synthesize_pcm("một", voice="vi", speed=150, pitch=50)
+    engine._lib.calls.clear()
+    engine.synthesize_pcm("hai", voice="vi", speed=175, pitch=50)
+    assert engine._lib.calls == [("param", ESPEAK_RATE, 175)]
+
+
+def test_voice_change_reapplies_parameters(engine):
+    engine.synthesize_pcm("một", voice="vi", speed=150, pitch=50)
+    engine._lib.calls.clear()
+    engine.synthesize_pcm("one", voice="en", speed=150, pitch=50)
+    assert engine._lib.calls == [("voice", "en"), ("param", ESPEAK_RATE, 150), ("param", ESPEAK_PITCH, 50)]
+
+
+def test_unknown_voice_is_not_cached(engine):
+    engine.synthesize_pcm("một", voice="vi")
+    with pytest.raises(RuntimeError):
+        engine.synthesize_pcm("hai", voice="missing")
+    engine._lib.calls.clear()
+    engine.synthesize_pcm("ba", voice="vi")
+    assert engine._lib.calls == []
+
+
+def test_synthesize_wav_wraps_pcm(engine):
+    with wave.open(io.BytesIO(engine.synthesize_wav("một"))) as wav_file:
+        assert wav_file.getframerate() == 22050
+        assert wav_file.getnframes() == 10
+    assert engine._buffer == []
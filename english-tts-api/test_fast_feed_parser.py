@@ -0,0 +1,85 @@
+import asyncio
+
+from fast_feed_parser import parse_feed, parse_feed_async, parse_feed_strict
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">
+<channel>
+<title>Feed</title>
+<item>
+  <title>AT&amp;amp;T mua l\xe1\xba\xa1i c\xe1\xbb\x95 phi\xe1\xba\xbfu</title>
+  <link>https://example.com/a</link>
+  <description><![CDATA[<p>M\xc3\xb4 t\xe1\xba\xa3 <b>ng\xe1\xba\xafn</b> &amp; g\xe1\xbb\x8dn</p><img src="https://img.example.com/a.jpg?w=400&amp;h=300">]]></description>
+  <pubDate>Mon, 19 Oct 2026 08:00:00 +0700</pubDate>
+  <guid>guid-a</guid>
+</item>
+<item>
+  <title>Second</title>
+  <link>https://example.com/b</link>
+  <description>Plain text</description>
+  <media:content url="https://img.example.com/b.jpg" medium="image"/>
+</item>
+<item>
+  <title>Third</title>
+  <link>https://example.com/c</link>
+</item>
+</channel>
+</rss>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<entry>
+  <title>Atom entry</title>
+  <link rel="self" href="https://example.com/self"/>
+  <link rel="alternate" href="https://example.com/entry"/>
+  <id>urn:entry:1</id>
+  <updated>2026-10-19T01:00:00Z</updated>
+  <summary>Summary text</summary>
+</entry>
+</feed>
+"""
+
+
+def test_rss_fields():
+    first, second, third = parse_feed(RSS)
+    assert first.title == "AT&amp;T mua lại cổ phiếu"
+    assert first.link == "https://example.com/a"
+    assert first.text == "Mô tả ngắn & gọn"
+    assert first.guid == "guid-a"
+    assert first.published_parsed.tm_hour == 1
+    assert first.image_url.startswith("https://img.example.com/a.jpg")
+    assert second.image_url == "https://img.example.com/b.jpg"
+    # GUID defaults to the link
+    assert third.guid == "https://example.com/c"
+
+
+def test_titles_are_decoded_once():
+    feed = b"<rss><channel><item><title>Q&amp;A &amp;lt;live&amp;gt;</title></item></channel></rss>"
+    assert parse_feed(feed)[0].title == "Q&A &lt;live&gt;"
+
+
+def test_stops_after_max_items():
+    assert [item.title for item in parse_feed_strict(RSS, 2)] == [
+        "AT&amp;T mua lại cổ phiếu", "Second"
+    ]
+    # Nothing after the last kept item is parsed, so a broken tail goes unnoticed
+    assert len(parse_feed_strict(RSS[:RSS.index(b"<item>\n  <title>Third")] + b"<item><broken", 2)) == 2
+
+
+def test_atom_prefers_alternate_link():
+    (entry,) = parse_feed(ATOM)
+    assert entry.link == "https://example.com/entry"
+    assert entry.guid == "urn:entry:1"
+    assert entry.description == "Summary text"
+    assert entry.published_parsed.tm_hour == 1
+
+
+def test_malformed_feed_falls_back():
+    broken = RSS.replace(b"</channel>", b"")
+    items = parse_feed(broken, max_items=10)
+    assert [item.link for item in items][:2] == ["https://example.com/a", "https://example.com/b"]
+
+
+def test_async_wrapper():
+    assert len(asyncio.run(parse_feed_async(RSS, 1))) == 1
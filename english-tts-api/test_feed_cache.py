@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from feed_cache import FeedCache
+from http_client import HttpResponse, HttpStatusError
+
+URL = "https://example.com/rss"
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    async def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        await asyncio.sleep(0)
+        return self.responses.pop(0)
+
+
+def response(status=200, body=b"<rss/>", headers=None):
+    return HttpResponse(URL, status, headers or {}, body)
+
+
+def test_fresh_entry_is_served_without_a_request():
+    client = FakeClient([response(headers={"ETag": '"v1"'})])
+    cache = FeedCache(client=client)
+
+    async def main():
+        first = await cache.fetch(URL)
+        second = await cache.fetch(URL)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first is second
+    assert len(client.requests) == 1
+    assert cache.is_fresh(URL)
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_expired_entry_revalidates_with_validators():
+    client = FakeClient([
+        response(headers={"ETag": '"v1"', "Last-Modified": "Mon, 19 Oct 2026 08:00:00 GMT"}),
+        response(status=304, body=b""),
+    ])
+    cache = FeedCache(default_ttl=0.0, client=client)
+
+    async def main():
+        first = await cache.fetch(URL)
+        second = await cache.fetch(URL)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert second is first
+    assert second.content == b"<rss/>"
+    assert client.requests[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 19 Oct 2026 08:00:00 GMT"}
+    assert cache.stats["not_modified"] == 1
+
+
+def test_version_changes_only_with_the_body():
+    client = FakeClient([response(), response(), response(body=b"<rss>new</rss>")])
+    cache = FeedCache(default_ttl=0.0, client=client)
+
+    async def main():
+        return [(await cache.fetch(URL)).version for _ in range(3)]
+
+    assert asyncio.run(main()) == [1, 1, 2]
+
+
+def test_concurrent_misses_share_one_request():
+    client = FakeClient([response()])
+    cache = FeedCache(client=client)
+
+    async def main():
+        return await asyncio.gather(*[cache.fetch(URL) for _ in range(5)])
+
+    entries = asyncio.run(main())
+    assert all(entry is entries[0] for entry in entries)
+    assert len(client.requests) == 1
+
+
+def test_http_errors_are_counted_and_raised():
+    cache = FeedCache(client=FakeClient([response(status=503)]))
+    with pytest.raises(HttpStatusError):
+        asyncio.run(cache.fetch(URL))
+    assert cache.stats["errors"] == 1
+    assert cache.get_entry(URL) is None
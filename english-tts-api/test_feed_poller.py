@@ -0,0 +1,65 @@
+import asyncio
+
+from feed_poller import ArticleStore, FeedPoller
+
+SOURCES = {"vnexpress": {"cache_ttl": 120}}
+
+
+def make_poller(batches):
+    """Poller whose loader returns the given batches (or raises them) in order"""
+    store = ArticleStore(max_per_source=5)
+    calls = iter(batches)
+
+    async def load(source_key):
+        batch = next(calls)
+        if isinstance(batch, Exception):
+            raise batch
+        return batch
+
+    return FeedPoller(SOURCES, load, store, key_func=lambda article: article), store
+
+
+def test_store_keeps_newest_first_within_capacity():
+    store = ArticleStore(max_per_source=3)
+    seen = []
+    store.add_listener(lambda key, articles: seen.append((key, list(articles))))
+    store.add("a", ["2", "1"])
+    store.add("a", ["4", "3"])
+    assert store.get("a") == ["4", "3", "2"]
+    assert store.get("a", limit=1) == ["4"]
+    assert store.counts() == {"a": 3}
+    assert store.version == 2
+    assert seen[-1] == ("a", ["4", "3"])
+
+
+def test_only_entries_newer_than_the_last_poll_are_ingested():
+    poller, store = make_poller([["c", "b", "a"], ["e", "d", "c", "b"], ["e", "d", "c"]])
+
+    assert asyncio.run(poller.poll_source("vnexpress")) == 3
+    assert asyncio.run(poller.poll_source("vnexpress")) == 2
+    assert asyncio.run(poller.poll_source("vnexpress")) == 0
+    assert store.get("vnexpress") == ["e", "d", "c", "b", "a"]
+
+
+def test_empty_first_poll_still_warms_the_store():
+    poller, store = make_poller([[]])
+    asyncio.run(poller.poll_source("vnexpress"))
+    assert store.is_warm("vnexpress")
+
+
+def test_interval_adapts_and_failures_back_off():
+    poller, _ = make_poller([["a"], ["b", "a"], ["b", "a"], RuntimeError("down")])
+    schedule = poller.schedules["vnexpress"]
+
+    asyncio.run(poller.poll_source("vnexpress"))
+    assert schedule.interval == 120
+    asyncio.run(poller.poll_source("vnexpress"))
+    assert schedule.interval == 60  # busy feed polled more often
+    asyncio.run(poller.poll_source("vnexpress"))
+    assert schedule.interval == 90  # quiet feed polled less often
+
+    assert asyncio.run(poller.poll_source("vnexpress")) == 0
+    status = poller.status()["vnexpress"]
+    assert status["consecutive_failures"] == 1
+    assert status["last_error"] == "down"
+    assert status["next_poll_in_seconds"] > 170
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from http_client import HttpClient, HttpStatusError, ResponseTooLargeError, RetryBudget
+
+
+async def serve(handlers):
+    server = web.Application()
+    for path, handler in handlers.items():
+        server.router.add_get(path, handler)
+    runner = web.AppRunner(server)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+def run_against(handlers, scenario):
+    async def run():
+        runner, base = await serve(handlers)
+        client = HttpClient(max_retries=2, retry_backoff=0.01)
+        try:
+            return await scenario(client, base)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+async def small(request):
+    return web.Response(body=b"hello")
+
+
+async def chunked(request):
+    # No Content-Length: the limit must be enforced while reading
+    response = web.StreamResponse()
+    await response.prepare(request)
+    for _ in range(10):
+        await response.write(b"x" * 1024)
+    await response.write_eof()
+    return response
+
+
+async def redirect(request):
+    raise web.HTTPFound("/small")
+
+
+def test_get_reads_body():
+    async def scenario(client, base):
+        response = await client.get(f"{base}/small", max_bytes=10)
+        assert (response.status, response.body) == (200, b"hello")
+
+    run_against({"/small": small}, scenario)
+
+
+def test_max_bytes_is_enforced_on_streamed_bodies():
+    async def scenario(client, base):
+        with pytest.raises(ResponseTooLargeError):
+            await client.get(f"{base}/chunked", max_bytes=4096)
+        assert len((await client.get(f"{base}/chunked")).body) == 10240
+
+    run_against({"/chunked": chunked}, scenario)
+
+
+def test_redirects_can_be_left_to_the_caller():
+    async def scenario(client, base):
+        response = await client.get(f"{base}/redirect", allow_redirects=False)
+        assert response.status == 302
+        assert response.headers["Location"] == "/small"
+        assert (await client.get(f"{base}/redirect")).body == b"hello"
+
+    run_against({"/redirect": redirect, "/small": small}, scenario)
+
+
+def test_retries_server_errors_then_returns_last_response():
+    calls = []
+
+    async def flaky(request):
+        calls.append(1)
+        return web.Response(status=503)
+
+    async def scenario(client, base):
+        response = await client.get(f"{base}/flaky")
+        assert response.status == 503
+        with pytest.raises(HttpStatusError):
+            response.raise_for_status()
+
+    run_against({"/flaky": flaky}, scenario)
+    assert len(calls) == 3
+
+
+def test_retry_budget_runs_out():
+    budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=2)
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
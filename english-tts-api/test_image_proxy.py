@@ -0,0 +1,185 @@
+import asyncio
+import io
+import socket
+
+import aiohttp
+import pytest
+from aiohttp import web
+from fastapi import HTTPException
+
+import image_proxy
+from http_client import HttpClient, HttpResponse, ResponseTooLargeError
+from image_proxy import (ImageProxy, ImageProxyError, NonPublicAddressError, PublicAddressResolver,
+                         is_public_address, snap_width, thumbnail_path, validate_image_url)
+
+
+class StaticResolver:
+    """Resolver stand-in answering from a fixed table"""
+
+    def __init__(self, table):
+        self.table = table
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        return [{"hostname": host, "host": address, "port": port, "family": socket.AF_INET,
+                 "proto": 0, "flags": 0} for address in self.table[host]]
+
+    async def close(self):
+        pass
+
+
+class FakeClient:
+    """HttpClient stand-in returning canned responses per URL"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    async def get(self, url, headers=None, timeout=None, allow_redirects=True, max_bytes=None):
+        self.requests.append((url, allow_redirects, max_bytes))
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def close(self):
+        pass
+
+
+def png_bytes(width=800, height=400):
+    from PIL import Image
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(output, "PNG")
+    return output.getvalue()
+
+
+def make_proxy(tmp_path, responses, table=None):
+    client = FakeClient(responses)
+    proxy = ImageProxy(cache_dir=str(tmp_path), client=client)
+    proxy.resolver = PublicAddressResolver(StaticResolver(table or {"img.example.com": ["93.184.216.34"]}))
+    return proxy, client
+
+
+@pytest.mark.parametrize("url", [
+    "ftp://img.example.com/a.jpg",
+    "/relative.jpg",
+    "http://localhost/a.jpg",
+    "http://printer.local/a.jpg",
+    "http://127.0.0.1/a.jpg",
+    "http://10.1.2.3/a.jpg",
+    "http://169.254.169.254/latest/meta-data",
+    "http://[::1]/a.jpg",
+    "http://[::ffff:192.168.0.1]/a.jpg",
+])
+def test_validate_rejects_non_public_urls(url):
+    with pytest.raises(ValueError):
+        validate_image_url(url)
+
+
+def test_validate_accepts_public_urls():
+    assert validate_image_url("https://IMG.example.com/a.jpg?w=1") == "img.example.com"
+    assert validate_image_url("http://93.184.216.34/a.jpg") == "93.184.216.34"
+    assert not is_public_address("::ffff:10.0.0.1")
+
+
+def test_resolver_refuses_hosts_with_any_private_address():
+    resolver = PublicAddressResolver(StaticResolver({
+        "public.example": ["93.184.216.34"],
+        "mixed.example": ["93.184.216.34", "10.0.0.5"],
+    }))
+    assert asyncio.run(resolver.resolve("public.example"))[0]["host"] == "93.184.216.34"
+    with pytest.raises(NonPublicAddressError):
+        asyncio.run(resolver.resolve("mixed.example"))
+
+
+def test_names_resolving_to_private_addresses_are_rejected(tmp_path):
+    proxy, client = make_proxy(tmp_path, {}, {"internal.example.com": ["10.0.0.7"]})
+    with pytest.raises(ValueError):
+        asyncio.run(proxy.get_thumbnail("http://internal.example.com/a.png", 320))
+    assert client.requests == []
+
+
+def test_connections_are_pinned_to_public_addresses():
+    async def run():
+        async def image(request):
+            return web.Response(body=b"x", content_type="image/png")
+
+        server = web.Application()
+        server.router.add_get("/a.png", image)
+        runner = web.AppRunner(server)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        client = HttpClient(max_retries=0, resolver=PublicAddressResolver())
+        try:
+            # Passes the URL checks (a public-looking name) but resolves to loopback
+            with pytest.raises(aiohttp.ClientConnectorError):
+                await client.get(f"http://localhost:{port}/a.png")
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+
+def test_thumbnail_rendered_once_and_cached(tmp_path):
+    url = "http://img.example.com/a.png"
+    proxy, client = make_proxy(tmp_path, {url: HttpResponse(url, 200, {"Content-Type": "image/png"}, png_bytes())})
+
+    path, media_type = asyncio.run(proxy.get_thumbnail(url, 300, "webp"))
+    assert media_type == "image/webp"
+    from PIL import Image
+    with Image.open(path) as image:
+        assert image.width == 320
+    assert client.requests == [(url, False, image_proxy.MAX_ORIGINAL_BYTES)]
+
+    asyncio.run(proxy.get_thumbnail(url, 320, "webp"))
+    assert proxy.stats["hits"] == 1
+    assert len(client.requests) == 1
+
+
+def test_redirects_are_revalidated(tmp_path):
+    url = "http://img.example.com/a.png"
+    proxy, _ = make_proxy(tmp_path, {
+        url: HttpResponse(url, 302, {"Location": "http://169.254.169.254/secret"}, b""),
+    })
+    with pytest.raises(ImageProxyError):
+        asyncio.run(proxy.get_thumbnail(url, 320, "jpeg"))
+
+
+def test_public_redirects_are_followed(tmp_path):
+    url = "http://img.example.com/a.png"
+    target = "http://img.example.com/b.png"
+    proxy, client = make_proxy(tmp_path, {
+        url: HttpResponse(url, 301, {"Location": "/b.png"}, b""),
+        target: HttpResponse(target, 200, {"Content-Type": "image/png"}, png_bytes()),
+    })
+    asyncio.run(proxy.get_thumbnail(url, 160, "jpeg"))
+    assert [request[0] for request in client.requests] == [url, target]
+
+
+def test_oversized_originals_are_refused(tmp_path):
+    url = "http://img.example.com/huge.png"
+    proxy, _ = make_proxy(tmp_path, {url: ResponseTooLargeError(url, image_proxy.MAX_ORIGINAL_BYTES)})
+    with pytest.raises(ImageProxyError):
+        asyncio.run(proxy.get_thumbnail(url, 320, "jpeg"))
+
+
+def test_serve_maps_errors_to_status_codes(tmp_path, monkeypatch):
+    proxy, _ = make_proxy(tmp_path, {})
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(proxy.serve("http://127.0.0.1/a.png"))
+    assert error.value.status_code == 400
+
+    monkeypatch.setattr(image_proxy, "Image", None)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(proxy.serve("http://img.example.com/a.png"))
+    assert error.value.status_code == 503
+
+
+def test_width_snapping_and_paths():
+    assert snap_width(None) == 320
+    assert snap_width(100) == 160
+    assert snap_width(5000) == 960
+    assert thumbnail_path("https://x.com/a b.jpg", 640) == "/image?url=https%3A%2F%2Fx.com%2Fa%20b.jpg&w=640"
+    assert thumbnail_path(None) is None
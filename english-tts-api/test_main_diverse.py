@@ -0,0 +1,24 @@
+import pytest
+
+main_diverse = pytest.importorskip("main_diverse")
+
+
+class FakeEspeak:
+    available = True
+
+    def synthesize_wav(self, text, voice=None, speed=None):
+        return f"wav:{text}".encode()
+
+
+def test_espeak_requests_get_their_own_output_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main_diverse, "get_espeak_engine", FakeEspeak)
+
+    first = main_diverse.synthesize_with_espeak("một", "espeak_vi")
+    second = main_diverse.synthesize_with_espeak("hai", "espeak_vi")
+
+    assert first != second
+    with open(first, "rb") as f:
+        assert f.read() == "wav:một".encode()
+    with open(second, "rb") as f:
+        assert f.read() == b"wav:hai"
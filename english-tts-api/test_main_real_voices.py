@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+main_real_voices = pytest.importorskip("main_real_voices")
+
+
+@pytest.mark.parametrize("pause_ms", [-1, 5001])
+def test_bulletin_pause_is_range_checked(pause_ms):
+    with pytest.raises(ValidationError):
+        main_real_voices.BulletinRequest(segments=[], pause_ms=pause_ms)
+    with pytest.raises(ValidationError):
+        main_real_voices.BulletinSegmentRequest(text="Xin chào", pause_ms=pause_ms)
+
+
+def test_bulletin_pause_bounds_are_accepted():
+    request = main_real_voices.BulletinRequest(
+        segments=[{"text": "Xin chào", "pause_ms": 0}, {"text": "Tạm biệt", "pause_ms": 5000}],
+        pause_ms=5000,
+    )
+    assert [segment.pause_ms for segment in request.segments] == [0, 5000]
+    assert main_real_voices.BulletinSegmentRequest(text="Xin chào").pause_ms is None
+
+
+def test_bulletin_segments_render_through_gtts_in_memory(monkeypatch):
+    written = []
+
+    class FakeTTS:
+        def __init__(self, text, lang, tld, slow):
+            self.lang = lang
+
+        def write_to_fp(self, fp):
+            written.append(self.lang)
+            fp.write(b"mp3")
+
+    def no_espeak():
+        raise AssertionError("bulletin voices are gTTS voices")
+
+    monkeypatch.setattr(main_real_voices, "gTTS", FakeTTS)
+    monkeypatch.setattr(main_real_voices, "get_espeak_engine", no_espeak)
+    monkeypatch.setattr(main_real_voices, "decode_mp3", lambda data: (np.zeros(9000, dtype=np.float32), 24000))
+
+    samples, sample_rate = main_real_voices.render_segment("Hello", "google_en_male")
+    assert written == ["en"]
+    assert sample_rate == 24000
+    # Male voices are slowed to 0.9x, as the /synthesize atempo filter does
+    assert len(samples) == 10000
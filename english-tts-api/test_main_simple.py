@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+main_simple = pytest.importorskip("main_simple")
+
+
+def test_feed_poller_is_wired_to_the_feed_loader():
+    assert main_simple.feed_poller.load_articles is main_simple.poll_feed_articles
+    assert main_simple.feed_poller.store is main_simple.article_store
+    assert set(main_simple.feed_poller.schedules) == set(main_simple.NEWS_SOURCES)
+
+
+def test_concurrent_renders_of_the_same_segment(tmp_path, monkeypatch):
+    barrier = threading.Barrier(4)
+
+    class FakeTTS:
+        def __init__(self, text, lang, slow):
+            self.text = text
+
+        def write_to_fp(self, fp):
+            fp.write(b"mp3:" + self.text.encode())
+
+    real_replace = main_simple.os.replace
+
+    def replace_together(source, destination):
+        # Every render has written its temp file before any of them is moved into place
+        barrier.wait(timeout=5)
+        real_replace(source, destination)
+
+    monkeypatch.setattr(main_simple, "gTTS", FakeTTS)
+    monkeypatch.setattr(main_simple.os, "replace", replace_together)
+    monkeypatch.setattr(main_simple, "SEGMENT_CACHE_DIR", str(tmp_path))
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: main_simple.get_cached_gtts_segment("Xin chào", "vi"), range(4)))
+
+    paths = {path for path, _ in results}
+    assert len(paths) == 1
+    with open(paths.pop(), "rb") as f:
+        assert f.read() == "mp3:Xin chào".encode()
+    assert [name for name in tmp_path.iterdir() if name.suffix == ".tmp"] == []
+
+
+class FakeRequest:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+def trending_snapshot(monkeypatch, count=3):
+    articles = [{"id": str(i), "title": f"Tin số {i}"} for i in range(count)]
+    snapshot = main_simple.TrendingSnapshot(articles)
+    monkeypatch.setitem(main_simple.trending_snapshots, "vi", snapshot)
+    return snapshot
+
+
+def test_trending_limit_is_clamped_before_caching(monkeypatch):
+    snapshot = trending_snapshot(monkeypatch)
+    for limit in (-5, 0, 1, 3, 4, 1000):
+        snapshot.render(limit)
+    assert set(snapshot._bodies) == {1, 3}
+    assert snapshot.render(1000) == snapshot.render(3)
+
+
+def test_trending_answers_304_only_for_a_listed_etag(monkeypatch):
+    trending_snapshot(monkeypatch)
+    first = asyncio.run(main_simple.get_trending_news(FakeRequest(), "vi", 3))
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    for header in (etag, f'"other", {etag}', f"W/{etag}", "*"):
+        response = asyncio.run(main_simple.get_trending_news(FakeRequest({"if-none-match": header}), "vi", 3))
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    # A token that merely contains the tag is a different tag
+    for header in (etag + "x", f"x{etag}", etag[:-1], '"other"'):
+        response = asyncio.run(main_simple.get_trending_news(FakeRequest({"if-none-match": header}), "vi", 3))
+        assert response.status_code == 200
+
+
+@pytest.mark.parametrize("language, label", [("vi", "(bản lưu 5 phút trước)"), ("en", "(saved copy from 5 min ago)")])
+def test_stale_results_are_labelled_in_the_search_language(monkeypatch, language, label):
+    stale = main_simple.NewsArticle(title="A story long enough to keep", description="Details", link="https://example.com",
+                                    published="", source="Example", language=language, snapshot_age=300)
+
+    async def fetch_sources(sources):
+        return [[stale]]
+
+    monkeypatch.setattr(main_simple, "fetch_sources_concurrently", fetch_sources)
+    monkeypatch.setattr(main_simple.search_index, "search", lambda *args, **kwargs: [])
+
+    text = asyncio.run(main_simple.search_news_by_keywords("story", language))
+    assert f"🔹 Example {label}:" in text
@@ -0,0 +1,347 @@
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+main_smart_news = pytest.importorskip("main_smart_news")
+
+
+class FakeEspeak:
+    available = True
+    sample_rate = 22050
+
+    def __init__(self):
+        self.calls = []
+
+    def synthesize_pcm(self, text, voice=None, speed=None):
+        self.calls.append((text, voice))
+        return b"\x00\x10" * 2205
+
+
+class FakeXTTS:
+    class synthesizer:
+        output_sample_rate = 24000
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def tts(self, text, speaker_wav=None, language=None, split_sentences=True):
+        self.calls.append((text, language))
+        if self.fail:
+            raise RuntimeError("synthesis failed")
+        return np.zeros(2400, dtype=np.float32)
+
+    def tts_to_file(self, text, file_path, speaker_wav=None, language=None, split_sentences=True):
+        self.calls.append((text, language))
+        with open(file_path, "wb") as f:
+            f.write(b"RIFF partial")
+            if self.fail:
+                raise RuntimeError("synthesis failed")
+
+
+def make_article(article_id="a1", language="en", description="Details follow.", title="Headline"):
+    return main_smart_news.NewsArticle(
+        id=article_id, title=title, description=description, content="", link="https://example.com",
+        published="", source="Example", language=language, category="general",
+    )
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    espeak = FakeEspeak()
+    monkeypatch.setattr(main_smart_news, "audio_cache_dir", str(tmp_path))
+    monkeypatch.setattr(main_smart_news, "get_espeak_engine", lambda: espeak)
+    monkeypatch.setattr(main_smart_news, "tts_model", FakeXTTS())
+    monkeypatch.setattr(main_smart_news, "prerender_queued_ids", set())
+    monkeypatch.setattr(main_smart_news, "prerender_failed_ids", type(main_smart_news.prerender_failed_ids)())
+    monkeypatch.setattr(main_smart_news, "prerender_stats", {"rendered": 0, "failed": 0, "dropped": 0})
+    return espeak
+
+
+def test_languages_xtts_cannot_speak_go_straight_to_preview(engines):
+    path = main_smart_news.render_article_audio(make_article(language="vi"))
+    assert path == main_smart_news.get_article_audio_path("a1", "preview")
+    assert main_smart_news.tts_model.calls == []
+    assert engines.calls == [("Headline. Details follow.", "vi")]
+
+
+def test_supported_language_renders_full_quality(engines):
+    path = main_smart_news.render_article_audio(make_article(language="en"))
+    assert path == main_smart_news.get_article_audio_path("a1", "full")
+    assert len(main_smart_news.tts_model.calls) == 2
+    assert engines.calls == []
+
+
+def test_failed_full_render_falls_back_without_leaving_a_partial_file(engines, monkeypatch, tmp_path):
+    monkeypatch.setattr(main_smart_news, "tts_model", FakeXTTS(fail=True))
+    path = main_smart_news.render_article_audio(make_article(language="en"))
+    assert path == main_smart_news.get_article_audio_path("a1", "preview")
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+def test_article_audio_survives_a_description_change(engines):
+    main_smart_news.render_article_audio(make_article(description="First version."))
+    edited = make_article(description="Corrected version.")
+    assert main_smart_news.find_article_audio(edited.id) == main_smart_news.get_article_audio_path("a1", "full")
+
+
+def test_worker_keeps_to_its_budget_and_remembers_failures(engines, monkeypatch):
+    rendered, sleeps, stored = [], [], {}
+
+    def render(article):
+        if article.id == "broken":
+            raise RuntimeError("no audio")
+        rendered.append(article.id)
+
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(main_smart_news, "render_article_audio", render)
+    monkeypatch.setattr(main_smart_news, "set_article_audio_url", stored.__setitem__)
+    monkeypatch.setattr(main_smart_news, "PRERENDER_MAX_PER_MINUTE", 1)
+    monkeypatch.setattr(main_smart_news, "PRERENDER_PAUSE_SECONDS", 0)
+    monkeypatch.setattr(main_smart_news.asyncio, "sleep", fake_sleep)
+
+    async def main():
+        monkeypatch.setattr(main_smart_news, "prerender_queue", asyncio.Queue())
+        for article_id in ("first", "broken", "second"):
+            main_smart_news.queue_prerender(make_article(article_id))
+        worker = asyncio.ensure_future(main_smart_news.prerender_worker())
+        await asyncio.wait_for(main_smart_news.prerender_queue.join(), timeout=5)
+        worker.cancel()
+
+    asyncio.run(main())
+    assert rendered == ["first", "second"]
+    assert stored == {"first": "/audio/first", "second": "/audio/second"}
+    # One render per minute: the later articles wait for the budget to free up
+    assert [seconds for seconds in sleeps if seconds > 1]
+    assert main_smart_news.prerender_stats == {"rendered": 2, "failed": 1, "dropped": 0}
+
+    main_smart_news.queue_prerender(make_article("broken"))
+    assert main_smart_news.prerender_queue.qsize() == 0
+
+
+def test_nothing_is_queued_without_an_engine_for_the_language(engines, monkeypatch):
+    engines.available = False
+    monkeypatch.setattr(main_smart_news, "prerender_queue", asyncio.Queue())
+    main_smart_news.queue_prerender(make_article(language="vi"))
+    main_smart_news.queue_prerender(make_article("a2", language="en"))
+    assert main_smart_news.prerender_queued_ids == {"a2"}
+
+
+def synthesize(**fields):
+    request = main_smart_news.TTSRequest(text="Xin chào.", language="en", **fields)
+    return main_smart_news.synthesize_speech(request)
+
+
+def test_preview_tier_renders_with_espeak_then_hits_the_cache(engines):
+    first = asyncio.run(synthesize(quality="preview", render_full_in_background=False))
+    second = asyncio.run(synthesize(quality="preview", render_full_in_background=False))
+    assert first.headers["x-quality-tier"] == "preview"
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("miss", "hit")
+    assert len(engines.calls) == 1
+    assert main_smart_news.tts_model.calls == []
+
+
+def test_preview_schedules_a_full_render_that_later_requests_get(engines):
+    async def main():
+        preview = await synthesize(quality="preview")
+        await asyncio.gather(*main_smart_news.pending_full_renders.values())
+        return preview, await synthesize(quality="preview")
+
+    preview, upgraded = asyncio.run(main())
+    assert preview.headers["x-full-render"] == "scheduled"
+    assert upgraded.headers["x-quality-tier"] == "full"
+    assert upgraded.headers["x-cache"] == "hit"
+
+
+def test_full_tier_without_model_is_unavailable(engines, monkeypatch):
+    monkeypatch.setattr(main_smart_news, "tts_model", None)
+    with pytest.raises(main_smart_news.HTTPException) as excinfo:
+        asyncio.run(synthesize(quality="full"))
+    assert excinfo.value.status_code == 503
+
+
+def test_preview_without_espeak_is_served_at_full_quality(engines):
+    engines.available = False
+    response = asyncio.run(synthesize(quality="preview"))
+    assert response.headers["x-quality-tier"] == "full"
+    assert response.headers["x-cache"] == "miss"
+
+
+def test_unknown_tier_is_rejected(engines):
+    with pytest.raises(main_smart_news.HTTPException) as excinfo:
+        asyncio.run(synthesize(quality="ultra"))
+    assert excinfo.value.status_code == 400
+
+
+def test_failed_full_render_leaves_nothing_in_the_cache(engines, monkeypatch, tmp_path):
+    monkeypatch.setattr(main_smart_news, "tts_model", FakeXTTS(fail=True))
+    output_file = str(tmp_path / "full.wav")
+    with pytest.raises(RuntimeError):
+        main_smart_news.render_full_quality("Xin chào.", "en", output_file)
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(main_smart_news, "db_path", str(tmp_path / "news.db"))
+    monkeypatch.setattr(main_smart_news, "fts_available", False)
+    main_smart_news.init_database()
+    return main_smart_news.db_path
+
+
+def store(article_id, title, description="", language="vi"):
+    article = make_article(article_id, language=language, description=description)
+    article.title = title
+    return main_smart_news.save_article(article)
+
+
+def fts_rows(db_path):
+    with main_smart_news.sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT rowid, title FROM articles_fts ORDER BY rowid").fetchall()
+
+
+def rowid(db_path, article_id):
+    with main_smart_news.sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT rowid FROM articles WHERE id = ?", (article_id,)).fetchone()[0]
+
+
+def search(query, **kwargs):
+    return [article.id for article in main_smart_news.search_local_articles(query, **kwargs)]
+
+
+def test_triggers_keep_the_search_index_in_sync(database):
+    store("a1", "Giá vàng tăng mạnh")
+    store("a2", "Bão số 3 đổ bộ")
+    assert search("vang") == ["a1"]
+
+    with main_smart_news.sqlite3.connect(database) as conn:
+        conn.execute("UPDATE articles SET title = 'Giá xăng giảm' WHERE id = 'a1'")
+    assert search("vang") == []
+    assert search("xang") == ["a1"]
+
+    with main_smart_news.sqlite3.connect(database) as conn:
+        conn.execute("DELETE FROM articles WHERE id = 'a2'")
+    assert search("bao") == []
+    assert [title for _, title in fts_rows(database)] == ["Giá xăng giảm"]
+
+
+def test_upsert_keeps_rowid_and_reindexes(database):
+    assert store("a1", "Giá vàng tăng", "Tin cũ")
+    before = rowid(database, "a1")
+    assert not store("a1", "Giá vàng tăng", "Tin mới cập nhật")
+
+    assert rowid(database, "a1") == before
+    assert len(fts_rows(database)) == 1
+    assert search("cap nhat") == ["a1"]
+    assert search("tin cu") == []
+
+
+def test_search_folds_d_stroke_and_tone_marks(database):
+    store("a1", "Đội tuyển bóng đá thắng lớn")
+    store("a2", "Tin thời tiết")
+    for query in ("doi tuyen", "Đội tuyển", "bong da", "BÓNG ĐÁ", "đa"):
+        assert search(query) == ["a1"], query
+    assert search("!!!") == []
+
+
+def test_since_and_until_bound_the_first_seen_time(database):
+    store("old", "Giá vàng tuần trước")
+    store("new", "Giá vàng hôm nay")
+    with main_smart_news.sqlite3.connect(database) as conn:
+        conn.execute("UPDATE articles SET created_at = '2026-01-01 08:00:00' WHERE id = 'old'")
+        conn.execute("UPDATE articles SET created_at = '2026-03-01 08:00:00' WHERE id = 'new'")
+
+    since = main_smart_news.parse_time_filter("2026-02-01T00:00:00Z", "since")
+    until = main_smart_news.parse_time_filter("2026-02-01T07:00:00+07:00", "until")
+    assert until == "2026-02-01 00:00:00"
+    assert search("gia vang", since=since) == ["new"]
+    assert search("gia vang", until=until) == ["old"]
+    assert sorted(search("gia vang")) == ["new", "old"]
+    with pytest.raises(main_smart_news.HTTPException):
+        main_smart_news.parse_time_filter("yesterday", "since")
+
+
+def test_existing_articles_are_indexed_when_search_is_added(database):
+    with main_smart_news.sqlite3.connect(database) as conn:
+        conn.execute("DROP TABLE articles_fts")
+        conn.execute("DROP TRIGGER articles_fts_insert")
+        conn.execute("INSERT INTO articles (id, title) VALUES ('legacy', 'Đường sắt cao tốc')")
+    main_smart_news.init_database()
+    assert search("duong sat") == ["legacy"]
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """fast answers at once, broken fails, slow answers long after a 100 ms budget"""
+    finished = []
+
+    async def fetch(source_key, query):
+        if source_key == "broken":
+            raise RuntimeError("feed down")
+        await asyncio.sleep(0.01 if source_key == "fast" else 0.4)
+        finished.append(source_key)
+        count = 2 if source_key == "fast" else 1
+        return [make_article(f"{source_key}-{i}", title=f"Headline from {source_key} #{i}") for i in range(count)]
+
+    def distinct_titles(articles, limit=None):
+        return articles[:limit]
+
+    monkeypatch.setattr(main_smart_news, "get_language_sources", lambda language: ["fast", "slow", "broken"])
+    monkeypatch.setattr(main_smart_news, "fetch_from_source", fetch)
+    monkeypatch.setattr(main_smart_news, "dedupe_articles", distinct_titles)
+    return finished
+
+
+def test_budget_returns_what_answered_and_reports_the_rest(sources):
+    async def main():
+        started = asyncio.get_running_loop().time()
+        articles, skipped = await main_smart_news.fetch_real_time_news("tin", "vi", 10, budget_ms=100)
+        elapsed = asyncio.get_running_loop().time() - started
+        still_running = set(main_smart_news.background_fetches)
+        await asyncio.gather(*still_running)
+        return articles, skipped, elapsed, still_running
+
+    articles, skipped, elapsed, still_running = asyncio.run(main())
+    assert skipped == ["slow"]
+    assert [article.id for article in articles] == ["fast-0", "fast-1"]
+    assert elapsed < 0.3
+    # The slow source was left to finish (and store its articles), not cancelled
+    assert len(still_running) == 1
+    assert sources == ["fast", "slow"]
+
+
+def test_without_budget_every_source_is_awaited(sources):
+    articles, skipped = asyncio.run(main_smart_news.fetch_real_time_news("tin", "vi", 10))
+    assert skipped == []
+    assert [article.id for article in articles] == ["fast-0", "fast-1", "slow-0"]
+    assert sources == ["fast", "slow"]
+
+
+def test_ndjson_stream_frames_each_source_then_a_summary(sources, database):
+    request = main_smart_news.SearchRequest(query="tin", max_articles=10, budget_ms=100)
+
+    async def main():
+        lines = [line async for line in main_smart_news.stream_search_results(request, "vi", "ndjson")]
+        await asyncio.gather(*main_smart_news.background_fetches)
+        return lines
+
+    lines = asyncio.run(main())
+    assert all(line.endswith("\n") and line.count("\n") == 1 for line in lines)
+    events = [main_smart_news.json.loads(line) for line in lines]
+    assert [event["type"] for event in events] == ["articles", "done"]
+    assert events[0]["source"] == "fast"
+    assert [article["id"] for article in events[0]["articles"]] == ["fast-0", "fast-1"]
+    assert events[-1]["skipped_sources"] == ["slow"]
+    assert events[-1]["total_found"] == 2
+
+
+def test_sse_framing():
+    event = main_smart_news.format_stream_event("done", {"total_found": 0}, "sse")
+    assert event == 'event: done\ndata: {"type": "done", "total_found": 0}\n\n'
@@ -0,0 +1,49 @@
+import asyncio
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+main_vietnamese = pytest.importorskip("main_vietnamese")
+
+
+@pytest.fixture
+def fake_gtts(monkeypatch):
+    rendered = []
+
+    class FakeTTS:
+        def __init__(self, text, lang, tld, slow):
+            self.text = text
+
+        def write_to_fp(self, fp):
+            rendered.append(self.text)
+            fp.write(b"mp3")
+
+    monkeypatch.setattr(main_vietnamese, "gTTS", FakeTTS)
+    monkeypatch.setattr(main_vietnamese, "base_render_cache", type(main_vietnamese.base_render_cache)())
+    return rendered
+
+
+def test_base_rendering_is_decoded_in_process_and_cached(fake_gtts, monkeypatch):
+    t = np.arange(44100) / 44100
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    monkeypatch.setattr(main_vietnamese, "decode_mp3", lambda data: (tone, 44100))
+
+    samples, cached = main_vietnamese.get_base_rendering("Xin chào", "google_male")
+    assert not cached
+    assert len(samples) == main_vietnamese.BASE_RENDER_SAMPLE_RATE
+
+    again, cached = main_vietnamese.get_base_rendering("Xin chào", "google_male")
+    assert cached and again is samples
+    assert fake_gtts == ["Xin chào"]
+
+
+def test_missing_decoder_is_reported_not_silently_ignored(fake_gtts, monkeypatch):
+    def no_decoder(data):
+        raise RuntimeError("miniaudio is not installed")
+
+    monkeypatch.setattr(main_vietnamese, "decode_mp3", no_decoder)
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(main_vietnamese.synthesize_advanced(text="Xin chào", voice_model="google_male",
+                                                        speed=1.5, pitch=1.0))
+    assert excinfo.value.status_code == 503
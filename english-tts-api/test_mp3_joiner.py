@@ -0,0 +1,81 @@
+import struct
+
+import pytest
+
+from mp3_joiner import (build_info_frame, iter_frames, join_mp3, parse_frame_header, strip_id3)
+
+# MPEG-2 Layer III, 32 kbps, 24000 Hz, mono, no CRC: 96-byte frames of 576 samples
+HEADER_24K = bytes([0xFF, 0xF3, 0x44, 0xC0])
+# Same at 22050 Hz
+HEADER_22K = bytes([0xFF, 0xF3, 0x40, 0xC0])
+
+
+def audio_frame(header_bytes, fill=0x55):
+    header = parse_frame_header(header_bytes, 0)
+    return header_bytes + bytes([fill]) * (header.frame_length - 4)
+
+
+def id3_tag(payload=b"\x00" * 20):
+    size = len(payload)
+    synchsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x04\x00\x00" + synchsafe + payload
+
+
+def segment(frames, header_bytes=HEADER_24K, tagged=True):
+    header = parse_frame_header(header_bytes, 0)
+    body = b"".join(audio_frame(header_bytes, 0x10 + i) for i in range(frames))
+    info = build_info_frame(header, frames, len(body), vbr=False)
+    return (id3_tag() if tagged else b"") + info + body + b"TAG" + b"\x00" * 125
+
+
+def test_parse_frame_header():
+    header = parse_frame_header(HEADER_24K, 0)
+    assert header.sample_rate == 24000
+    assert header.bitrate == 32
+    assert header.samples_per_frame == 576
+    assert header.frame_length == 96
+    assert parse_frame_header(b"\x00\x00\x00\x00", 0) is None
+
+
+def test_strip_id3_removes_both_tags():
+    assert strip_id3(id3_tag() + b"audio" + b"TAG" + b"\x00" * 125) == b"audio"
+
+
+def test_iter_frames_skips_tags_and_info_frame():
+    frames = list(iter_frames(segment(5)))
+    assert len(frames) == 5
+    data, offset, header = frames[0]
+    assert data[offset + 4] == 0x10
+
+
+def test_join_counts_frames_and_duration():
+    joined = join_mp3([segment(5), segment(3, tagged=False)])
+    assert joined.frame_count == 8
+    assert joined.sample_rate == 24000
+    assert joined.duration_seconds == pytest.approx(8 * 576 / 24000)
+
+    # Leading Info frame carries the frame and byte counts
+    header = parse_frame_header(joined.data, 0)
+    xing = 4 + header.side_info_length
+    assert joined.data[xing:xing + 4] == b"Info"
+    flags, frame_count, byte_count = struct.unpack_from(">III", joined.data, xing + 4)
+    assert frame_count == 8
+    assert byte_count == len(joined.data)
+    assert len(list(iter_frames(joined.data))) == 8
+
+
+def test_join_inserts_silent_pauses_between_segments_only():
+    frame_ms = 1000 * 576 / 24000
+    joined = join_mp3([segment(2), segment(2), segment(2)], pause_ms=10 * frame_ms)
+    assert joined.frame_count == 6 + 2 * 10
+    assert len(list(iter_frames(joined.data))) == 26
+
+
+def test_join_rejects_mismatched_sample_rates():
+    with pytest.raises(ValueError):
+        join_mp3([segment(2), segment(2, HEADER_22K)])
+
+
+def test_join_rejects_segments_without_frames():
+    with pytest.raises(ValueError):
+        join_mp3([b"not an mp3", id3_tag()])
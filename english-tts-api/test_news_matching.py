@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+from news_matching import rank_by_tiers
+
+
+def article(title, description=""):
+    return SimpleNamespace(title=title, description=description)
+
+
+SOURCES = [
+    [article("Giá vàng hôm nay tăng mạnh"), article("Bão số 3 đổ bộ miền Bắc"), article("Kết quả bóng đá")],
+    [article("Thị trường chứng khoán", "giá cổ phiếu ngân hàng giảm"), article("Thời tiết Hà Nội")],
+]
+
+
+def test_whole_query_matches_win():
+    assert [a.title for a in rank_by_tiers(SOURCES, "giá vàng")] == ["Giá vàng hôm nay tăng mạnh"]
+
+
+def test_keyword_tier_matches_any_long_enough_word():
+    results = rank_by_tiers(SOURCES, "bão giá xăng", min_keyword_length=3)
+    assert [a.title for a in results] == [
+        "Giá vàng hôm nay tăng mạnh", "Bão số 3 đổ bộ miền Bắc", "Thị trường chứng khoán"
+    ]
+
+
+def test_short_keywords_are_ignored():
+    results = rank_by_tiers(SOURCES, "số xyz", min_keyword_length=3)
+    # Neither "số" (too short) nor "xyz" matches, so the latest articles are returned
+    assert len(results) == 4
+
+
+def test_keywords_can_be_disabled():
+    results = rank_by_tiers(SOURCES, "bão giá xăng", use_keywords=False, latest_per_source=1)
+    assert [a.title for a in results] == ["Giá vàng hôm nay tăng mạnh", "Thị trường chứng khoán"]
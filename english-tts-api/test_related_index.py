@@ -0,0 +1,60 @@
+from related_index import RelatedIndex
+
+ARTICLES = {
+    "storm-1": ("Bão số 3 đổ bộ miền Trung", "Bão mạnh gây mưa lớn và ngập lụt tại các tỉnh miền Trung"),
+    "storm-2": ("Miền Trung ngập lụt sau bão", "Mưa lớn do bão khiến nhiều tỉnh miền Trung ngập sâu"),
+    "gold": ("Giá vàng tăng mạnh", "Giá vàng trong nước tăng theo giá thế giới"),
+    "football": ("Đội tuyển bóng đá thắng lớn", "Đội tuyển Việt Nam thắng trận giao hữu"),
+}
+
+
+def make_index(**kwargs):
+    index = RelatedIndex(**kwargs)
+    for doc_id, (title, body) in ARTICLES.items():
+        index.add(doc_id, title, body)
+    return index
+
+
+def test_similar_story_ranks_first_and_self_is_excluded():
+    results = make_index().similar("storm-1")
+    ids = [doc_id for doc_id, _ in results]
+    assert ids[0] == "storm-2"
+    assert "storm-1" not in ids
+    assert all(score >= 0.05 for _, score in results)
+
+
+def test_text_query_without_diacritics():
+    results = make_index().similar(title="gia vang", body="gia vang the gioi")
+    assert results[0][0] == "gold"
+
+
+def test_duplicate_and_empty_documents_are_rejected():
+    index = make_index()
+    assert not index.add("gold", "Giá vàng", "")
+    assert not index.add("empty", "", "")
+    assert len(index) == len(ARTICLES)
+    assert "gold" in index and "empty" not in index
+
+
+def test_empty_index_and_unknown_text():
+    assert RelatedIndex().similar(title="bão") == []
+    assert make_index().similar(title="", body="") == []
+
+
+def test_eviction_keeps_newest_documents_and_consistent_document_frequencies():
+    documents = {f"filler-{i}": (f"Tin số {i}", f"Nội dung riêng biệt số {i}") for i in range(15)}
+    documents.update(ARTICLES)
+    index = RelatedIndex(max_documents=10)
+    for doc_id, (title, body) in documents.items():
+        index.add(doc_id, title, body)
+
+    assert len(index) <= 10
+    assert "filler-0" not in index
+    assert all(doc_id in index for doc_id in ARTICLES)
+    assert index.similar("storm-1")[0][0] == "storm-2"
+
+    rebuilt = RelatedIndex()
+    for doc_id in index._ids:
+        rebuilt.add(doc_id, *documents[doc_id])
+    assert (index._df == rebuilt._df).all()
+    assert index.similar("storm-1") == rebuilt.similar("storm-1")
@@ -0,0 +1,105 @@
+import asyncio
+
+from search_cache import SearchCache, normalize_query
+
+
+def test_normalize_query():
+    assert normalize_query("  Giá   VÀNG\n") == "giá vàng"
+    assert normalize_query(None) == ""
+
+
+def test_concurrent_identical_searches_compute_once():
+    cache = SearchCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    async def main():
+        return await asyncio.gather(*[cache.get_or_compute(("q",), ["vnexpress"], compute) for _ in range(5)])
+
+    results = asyncio.run(main())
+    assert results == [["result"]] * 5
+    assert len(calls) == 1
+    assert cache.stats["misses"] == 1 and cache.stats["coalesced"] == 4
+
+
+def test_hit_until_a_source_is_invalidated():
+    cache = SearchCache()
+    values = iter(["first", "second"])
+
+    async def compute():
+        return next(values)
+
+    async def main():
+        first = await cache.get_or_compute(("q",), ["vnexpress", "tuoitre"], compute)
+        cached = await cache.get_or_compute(("q",), ["vnexpress", "tuoitre"], compute)
+        dropped = cache.invalidate_source("tuoitre")
+        fresh = await cache.get_or_compute(("q",), ["vnexpress", "tuoitre"], compute)
+        return first, cached, dropped, fresh
+
+    assert asyncio.run(main()) == ("first", "first", 1, "second")
+    assert cache.stats["hits"] == 1
+
+
+def test_result_computed_across_an_invalidation_is_not_stored():
+    cache = SearchCache()
+
+    async def compute():
+        cache.invalidate_source("vnexpress")
+        return "stale"
+
+    async def main():
+        await cache.get_or_compute(("q",), ["vnexpress"], compute)
+
+    asyncio.run(main())
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_uncacheable_results_and_expiry():
+    cache = SearchCache(ttl=0.0)
+
+    async def compute():
+        return []
+
+    async def main():
+        await cache.get_or_compute(("empty",), ["vnexpress"], compute, cacheable=bool)
+        await cache.get_or_compute(("expired",), ["vnexpress"], compute)
+        await cache.get_or_compute(("expired",), ["vnexpress"], compute)
+
+    asyncio.run(main())
+    assert cache.stats["hits"] == 0
+    assert cache.stats["misses"] == 3
+
+
+def test_lru_eviction():
+    cache = SearchCache(max_entries=2)
+
+    async def compute():
+        return "value"
+
+    async def main():
+        for key in ("a", "b", "a", "c"):
+            await cache.get_or_compute((key,), ["vnexpress"], compute)
+
+    asyncio.run(main())
+    assert set(cache._entries) == {("a",), ("c",)}
+
+
+def test_cancelled_caller_does_not_cancel_shared_search():
+    cache = SearchCache()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(cache.get_or_compute(("q",), ["vnexpress"], compute))
+        second = asyncio.ensure_future(cache.get_or_compute(("q",), ["vnexpress"], compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,46 @@
+from search_index import SearchIndex, fold_diacritics, tokenize
+
+
+def make_index(**kwargs):
+    index = SearchIndex(**kwargs)
+    index.add("1", "Bóng đá Việt Nam thắng Thái Lan", "Đội tuyển giành chiến thắng", payload="football", group="vnexpress")
+    index.add("2", "Giá vàng hôm nay", "Giá vàng trong nước tăng mạnh", payload="gold", group="tuoitre")
+    index.add("3", "Bão số 3 gây mưa lớn", "Miền Bắc mưa to, bóng đá bị hoãn", payload="storm", group="vnexpress")
+    return index
+
+
+def test_fold_and_tokenize():
+    assert fold_diacritics("Đường Bóng Đá") == "duong bong da"
+    assert tokenize("Giá vàng, hôm nay!") == ["giá", "vàng", "hôm", "nay"]
+
+
+def test_title_matches_rank_first():
+    assert [payload for payload, _ in make_index().search("bóng đá")] == ["football", "storm"]
+
+
+def test_unaccented_queries_match_accented_text():
+    assert make_index().search("gia vang")[0][0] == "gold"
+
+
+def test_exact_accents_score_higher_than_folded_matches():
+    index = SearchIndex()
+    index.add("a", "bạc", "", payload="silver")
+    index.add("b", "bắc", "", payload="north")
+    results = index.search("bắc")
+    assert results[0][0] == "north"
+    assert results[0][1] > results[1][1]
+
+
+def test_groups_filter_results():
+    assert [payload for payload, _ in make_index().search("bóng đá", groups=["tuoitre"])] == []
+    assert [payload for payload, _ in make_index().search("vàng", groups=["tuoitre"])] == ["gold"]
+
+
+def test_duplicates_removal_and_capacity():
+    index = make_index(max_documents=2)
+    assert len(index) == 2
+    assert "1" not in index
+    assert not index.add("2", "Giá vàng hôm nay", "")
+    index.remove("2")
+    assert index.search("vàng") == []
+    assert index.search("") == []
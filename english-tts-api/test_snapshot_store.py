@@ -0,0 +1,43 @@
+import json
+import os
+
+from snapshot_store import SnapshotStore
+
+ARTICLES = [{"title": "Tin nóng", "link": "https://example.com/a"}]
+
+
+def test_saved_snapshot_is_read_back_by_a_new_store(tmp_path):
+    SnapshotStore(str(tmp_path)).save("vnexpress", "https://example.com/rss", ARTICLES)
+
+    snapshot = SnapshotStore(str(tmp_path)).get("vnexpress")
+    assert snapshot.url == "https://example.com/rss"
+    assert snapshot.articles == ARTICLES
+    assert snapshot.age_seconds < 60
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_empty_parse_does_not_overwrite_a_good_snapshot(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save("vnexpress", "https://example.com/rss", ARTICLES)
+    store.save("vnexpress", "https://example.com/rss", [])
+
+    assert store.get("vnexpress").articles == ARTICLES
+    assert SnapshotStore(str(tmp_path)).get("vnexpress").articles == ARTICLES
+
+
+def test_missing_and_unreadable_snapshots_are_ignored(tmp_path):
+    (tmp_path / "broken.json").write_text("{not json", encoding="utf-8")
+    (tmp_path / "partial.json").write_text(json.dumps({"url": "x"}), encoding="utf-8")
+
+    store = SnapshotStore(str(tmp_path))
+    assert store.get("missing") is None
+    assert store.get("broken") is None
+    assert store.get("partial") is None
+
+
+def test_status_reports_article_counts(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save("vnexpress", "https://example.com/rss", ARTICLES * 3)
+    status = store.status()
+    assert status["vnexpress"]["articles"] == 3
+    assert status["vnexpress"]["age_seconds"] >= 0
@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from source_health import CLOSED, HALF_OPEN, OPEN, SourceHealthRegistry, SourceUnavailableError
+
+
+def fail(registry, source_key, times=1):
+    for _ in range(times):
+        with pytest.raises(RuntimeError):
+            with registry.track(source_key):
+                raise RuntimeError("timeout")
+
+
+def test_circuit_opens_after_consecutive_failures():
+    registry = SourceHealthRegistry(failure_threshold=3, cooldown=60.0)
+    fail(registry, "vnexpress", 2)
+    assert registry.status("vnexpress")["state"] == CLOSED
+
+    fail(registry, "vnexpress")
+    status = registry.status("vnexpress")
+    assert status["state"] == OPEN
+    assert status["last_error"] == "timeout"
+
+    with pytest.raises(SourceUnavailableError) as excinfo:
+        with registry.track("vnexpress"):
+            pass
+    assert excinfo.value.retry_in > 0
+    assert registry.status("vnexpress")["skipped"] == 1
+
+
+def test_success_resets_the_failure_count():
+    registry = SourceHealthRegistry(failure_threshold=2)
+    fail(registry, "vnexpress")
+    with registry.track("vnexpress"):
+        pass
+    fail(registry, "vnexpress")
+    assert registry.status("vnexpress")["state"] == CLOSED
+
+
+def test_probe_after_cooldown_closes_or_reopens_with_doubled_cooldown():
+    registry = SourceHealthRegistry(failure_threshold=1, cooldown=10.0)
+    fail(registry, "vnexpress")
+
+    health = registry._sources["vnexpress"]
+    health.retry_at = time.monotonic()
+    assert registry.allow("vnexpress")
+    assert health.state == HALF_OPEN
+
+    registry.record_failure("vnexpress", 5.0, "timeout")
+    assert health.state == OPEN
+    assert health.retry_at - time.monotonic() > 15.0
+
+    health.retry_at = time.monotonic()
+    with registry.track("vnexpress"):
+        pass
+    assert health.state == CLOSED
+    assert health.open_streak == 0
+
+
+def test_status_reports_success_rate_and_latency():
+    registry = SourceHealthRegistry(window=4)
+    for latency in (10.0, 20.0, 30.0):
+        registry.record_success("tuoitre", latency)
+    registry.record_failure("tuoitre", 40.0, "HTTP 500")
+    registry.record_success("tuoitre", 50.0)
+
+    status = registry.status_all()["tuoitre"]
+    assert status["success_rate"] == 0.75
+    assert status["latency_ms"]["p50"] == 40.0
+    assert status["calls"] == 5
+    assert status["failures"] == 1
@@ -0,0 +1,74 @@
+from suggest_index import SuggestIndex, fold_phrase, title_phrases
+
+
+def test_title_phrases_skip_stopword_boundaries_and_short_words():
+    phrases = title_phrases("Giá vàng của Việt Nam")
+    assert "giá vàng" in phrases
+    assert "việt nam" in phrases
+    assert not any(phrase.startswith("của") or phrase.endswith("của") for phrase in phrases)
+    assert "nam" in phrases
+
+
+def test_fold_phrase_strips_diacritics_and_spacing():
+    assert fold_phrase("  Bóng   Đá ") == "bong da"
+
+
+def test_unaccented_prefix_finds_accented_phrase():
+    index = SuggestIndex()
+    index.add_title("Bóng đá Việt Nam thắng lớn")
+    index.rebuild()
+
+    assert "bóng đá" in [text for text, _ in index.suggest("bong d")]
+    assert "bóng đá" in [text for text, _ in index.suggest("bon")]
+
+
+def test_past_queries_outrank_title_fragments():
+    index = SuggestIndex()
+    for _ in range(2):
+        index.add_title("Giá vàng hôm nay tăng mạnh")
+    index.add_query("giá xăng")
+    index.rebuild()
+
+    assert index.suggest("gia")[0][0] == "giá xăng"
+
+
+def test_searched_text_replaces_headline_text():
+    index = SuggestIndex()
+    index.add_title("GIÁ VÀNG tăng")
+    index.add_query("Giá vàng")
+    index.rebuild()
+
+    assert index.suggest("gia vang")[0][0] == "giá vàng"
+
+
+def test_old_phrases_decay_below_recent_ones():
+    index = SuggestIndex(half_life_hours=1.0)
+    index.add_query("bão số 3", count=4, timestamp=0.0)
+    index.add_query("bão lũ miền trung")
+    index.rebuild()
+
+    assert index.suggest("bao")[0][0] == "bão lũ miền trung"
+
+
+def test_short_and_long_prefixes_agree_and_respect_limit():
+    index = SuggestIndex(top_k=5)
+    for word in ["thời tiết", "thời sự", "thời trang", "thời gian", "thời điểm", "thời đại"]:
+        index.add_query(word)
+    index.rebuild()
+
+    assert len(index.suggest("tho", limit=3)) == 3
+    assert {text for text, _ in index.suggest("thoi", limit=10)} >= {"thời tiết", "thời sự", "thời trang"}
+    assert index.suggest("") == []
+    assert index.suggest("xyz") == []
+
+
+def test_rebuild_caps_phrase_count():
+    index = SuggestIndex(max_phrases=2)
+    index.add_query("alpha", count=3)
+    index.add_query("bravo", count=2)
+    index.add_query("charlie")
+    index.rebuild()
+
+    assert index.stats()["phrases"] == 2
+    assert index.suggest("charlie") == []
+    assert not index.dirty